@@ -1,22 +1,59 @@
 # Built in modules
-from typing import List, Dict, Optional
-from typing import List, Dict
+from typing import List, Dict, Optional, AsyncGenerator, Tuple
 import json
+import asyncio
+from functools import lru_cache
 
-# Base LLM
-from app.core.config import LLM_4o
+# Pydantic
+from pydantic import create_model
+
+# Config
+from app.core.config import CACHE_ENABLED, LONG_TRANSCRIPT_TOKEN_THRESHOLD, LONG_TRANSCRIPT_CHUNK_TOKENS, VALIDATION_RULES_ENABLED, LLM_CALL_TIMEOUT_SECONDS
+
+# Result cache
+from app.ai.cache import result_cache, make_cache_key
+
+# Rate limiting & shared LLM concurrency
+from app.core.limits import model_rate_limiter, llm_concurrency
+
+# Model routing & token budgets
+from app.ai.router import RouteDecision, model_router, get_llm, charge_tokens
 
 # Logger
 from app.logger import logger
 
+# Metrics
+from app.metrics import metrics, span, record_llm_usage, SIZE_BUCKETS
+
 # Errors
-from app.core.errors import LLMInteractionError, TranscriptProcessingError, TranscriptValidationError
+from app.core.errors import LLMInteractionError, TranscriptProcessingError, TranscriptValidationError, TokenBudgetExceededError, ServerOverloadedError
 
 # Utils
-from app.utils import format_transcript, format_analyst_output
+from app.utils import format_transcript, format_analyst_output, count_tokens, split_transcript
 
 # Prompts
-from app.ai.prompts import AnalysisOutput, TRANSCRIPT_PROMPT_TEMPLATE, VALIDATION_PROMPT_TEMPLATE
+from app.ai.prompts import AnalysisOutput
+from app.ai.registry import (
+    RegisteredPrompt,
+    structured_llm,
+    output_tool,
+    parse_partial_output,
+    TRANSCRIPT_PROMPT,
+    FEW_SHOT_TRANSCRIPT_PROMPT,
+    UPDATE_TRANSCRIPT_PROMPT,
+    VALIDATION_PROMPT,
+    REDUCE_PROMPT,
+    SECTION_VALIDATION_PROMPT,
+)
+
+# Deterministic validation rules
+from app.ai.rules import check_output, SECTION_NAMES
+
+# Few-shot examples
+from app.ai.examples import find_examples
+
+# Incremental re-analysis
+from app.ai.incremental import TranscriptDiff
 
 
 # -----------------------------------------------------------------------------
@@ -24,37 +61,242 @@ from app.ai.prompts import AnalysisOutput, TRANSCRIPT_PROMPT_TEMPLATE, VALIDATIO
 # -----------------------------------------------------------------------------
 
 
-def call_llm(messages: str, output_cls: type) -> Dict:
-    """Handles interaction with LLM and returns the parsed content as a dictionary."""
+def count_prompt_tokens(messages: List) -> int:
+    """Counts the prompt tokens of a message list locally."""
+    return sum(count_tokens(str(message.content or "")) for message in messages)
+
+
+def record_call_usage(model: str, prompt_tokens: int, completion: str) -> None:
+    """Records prompt and (locally counted) completion tokens for the model that answered."""
+    completion_tokens = count_tokens(completion)
+    record_llm_usage(model, prompt_tokens, completion_tokens)
+    charge_tokens(completion_tokens, enforce=False)
+
+
+def record_prompt_call(prompt: Optional[RegisteredPrompt]) -> str:
+    """Counts a call per registered prompt version and returns the version for the cache key."""
+    if prompt is None:
+        return ""
+    metrics.inc("app_llm_prompt_calls_total", prompt=prompt.name, version=prompt.version)
+    return prompt.version
+
+
+def route_call(messages: List, prompt: Optional[RegisteredPrompt]) -> RouteDecision:
+    """Counts the prompt tokens, picks the models for this call and reserves the tokens against the budgets."""
+    decision = model_router.route(prompt.phase if prompt is not None else "default", count_prompt_tokens(messages))
+    logger.info(f"Routed {decision.phase} call ({decision.prompt_tokens} prompt tokens) to {decision.models[0]} ({decision.reason})")
+    return decision
+
+
+async def call_llm(messages: str, output_cls: type, use_cache: bool = True, prompt: Optional[RegisteredPrompt] = None) -> Dict:
+    """
+    Handles interaction with LLM and returns the parsed content as a dictionary.
+    The model is chosen by the router; on errors or timeouts the call falls back to the next model.
+    Results are cached by prompt (and its registry version), model and output schema; pass use_cache=False to force regeneration.
+    """
     try:
-        # Turn into structured outputs LLM for validation
-        sllm = LLM_4o.as_structured_llm(output_cls=output_cls)
-        # Call Chat functionality
-        output = sllm.chat(messages=messages)
+        decision = route_call(messages, prompt)
+        prompt_version = record_prompt_call(prompt)
+        cache_key = make_cache_key(messages, decision.models[0], output_cls, prompt_version)
+        if use_cache and CACHE_ENABLED:
+            cached_output = await result_cache.get(cache_key)
+            if cached_output is not None:
+                logger.info(f"LLM cache hit for key {cache_key[:12]}")
+                return cached_output
+
+        # Hold one of the LLM slots shared by all workers for the call and any fallbacks; a rejected call charges no tokens
+        async with llm_concurrency.slot():
+            # Enforce the request and tenant token budgets before calling out
+            charge_tokens(decision.prompt_tokens)
+
+            for attempt, model in enumerate(decision.models):
+                try:
+                    # Respect the per-model request budget before hitting the API
+                    await model_rate_limiter.acquire(model)
+                    # Structured outputs LLM, built once per model and output model
+                    sllm = structured_llm(output_cls, get_llm(model))
+                    # Call async Chat functionality so the event loop stays free
+                    with span("llm_call", model=model):
+                        output = await asyncio.wait_for(sllm.achat(messages=messages), LLM_CALL_TIMEOUT_SECONDS)
+                    break
+                except Exception as e:
+                    if attempt == len(decision.models) - 1:
+                        raise
+                    model_router.record_fallback(decision, model, e)
+        record_call_usage(model, decision.prompt_tokens, output.message.content)
 
         # Parse content into dict
-        return json.loads(output.message.content)
+        parsed_output = json.loads(output.message.content)
+        if CACHE_ENABLED:
+            # A fallback answer is cached under its own model so it never stands in for the primary model
+            if model != decision.models[0]:
+                cache_key = make_cache_key(messages, model, output_cls, prompt_version)
+            await result_cache.set(cache_key, parsed_output)
+        return parsed_output
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
     except Exception as e:
         logger.error(f"Error during LLM interaction: {e}")
         raise LLMInteractionError(f"Failed to interact with LLM: {str(e)}")
 
+
+# Finish reasons of a streamed response whose tool-call arguments are complete
+COMPLETE_FINISH_REASONS = ("stop", "tool_calls")
+
+
+def streamed_tool_call(response) -> Tuple[str, Optional[str]]:
+    """Returns the tool-call arguments accumulated so far in a streamed response and the finish reason, if this chunk has one."""
+    tool_calls = response.message.additional_kwargs.get("tool_calls") or []
+    arguments = (tool_calls[0].function.arguments or "") if tool_calls else ""
+    choices = getattr(response.raw, "choices", None) or []
+    return arguments, choices[0].finish_reason if choices else None
+
+
+async def stream_llm(
+    messages: str, output_cls: type, use_cache: bool = True, prompt: Optional[RegisteredPrompt] = None
+) -> AsyncGenerator[Tuple[bool, Dict], None]:
+    """
+    Streams structured output from the LLM as (is_final, content) pairs.
+    Partial objects arrive token by token; the last pair is parsed from the complete tool-call arguments
+    and only yielded (and cached) once the model reports it finished, so a cut-off stream raises instead.
+    Falls back to the next routed model only if a model fails before its first partial output.
+    """
+    try:
+        decision = route_call(messages, prompt)
+        prompt_version = record_prompt_call(prompt)
+        cache_key = make_cache_key(messages, decision.models[0], output_cls, prompt_version)
+        if use_cache and CACHE_ENABLED:
+            cached_output = await result_cache.get(cache_key)
+            if cached_output is not None:
+                logger.info(f"LLM cache hit for key {cache_key[:12]}")
+                yield True, cached_output
+                return
+
+        tool, partial_cls = output_tool(output_cls)
+
+        # Hold one of the LLM slots shared by all workers while the response streams
+        async with llm_concurrency.slot():
+            charge_tokens(decision.prompt_tokens)
+
+            for attempt, model in enumerate(decision.models):
+                last_partial = None
+                try:
+                    # Respect the per-model request budget before hitting the API
+                    await model_rate_limiter.acquire(model)
+
+                    # Stream the tool-call arguments, yielding each new partial object parsed from them
+                    arguments, finish_reason = "", None
+                    with span("llm_call", model=model):
+                        stream = await asyncio.wait_for(
+                            get_llm(model).astream_chat_with_tools([tool], chat_history=list(messages), tool_choice="required"),
+                            LLM_CALL_TIMEOUT_SECONDS,
+                        )
+                        async for response in stream:
+                            arguments, chunk_finish_reason = streamed_tool_call(response)
+                            finish_reason = chunk_finish_reason or finish_reason
+                            partial_output = parse_partial_output(arguments, partial_cls)
+                            if partial_output is not None and partial_output != last_partial:
+                                last_partial = partial_output
+                                yield False, partial_output
+
+                    # Nothing was yielded yet, so an empty stream falls back to the next model like any other failure
+                    if not arguments:
+                        raise LLMInteractionError("empty streamed response")
+                    if finish_reason not in COMPLETE_FINISH_REASONS:
+                        raise LLMInteractionError(f"streamed response did not complete (finish reason: {finish_reason})")
+                    # Strict parse of the full arguments; partial parsing would close a truncated object
+                    parsed_output = output_cls.model_validate_json(arguments).model_dump()
+                    break
+                except Exception as e:
+                    if last_partial is not None or attempt == len(decision.models) - 1:
+                        raise
+                    model_router.record_fallback(decision, model, e)
+        record_call_usage(model, decision.prompt_tokens, arguments)
+
+        if CACHE_ENABLED:
+            if model != decision.models[0]:
+                cache_key = make_cache_key(messages, model, output_cls, prompt_version)
+            await result_cache.set(cache_key, parsed_output)
+        yield True, parsed_output
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
+    except Exception as e:
+        logger.error(f"Error during LLM streaming: {e}")
+        raise LLMInteractionError(f"Failed to stream from LLM: {str(e)}")
+
 # -----------------------------------------------------------------------------
 # Transcript processing
 # -----------------------------------------------------------------------------
 
 
-def process_transcript(raw_transcript: List[Dict]) -> Dict:
+def is_long_transcript(formatted_transcript: str) -> bool:
+    """Returns True when a formatted transcript should go through the chunked map-reduce path."""
+    # Every token spans at least one character, so short strings can skip tokenization
+    if len(formatted_transcript) <= LONG_TRANSCRIPT_TOKEN_THRESHOLD:
+        return False
+    return count_tokens(formatted_transcript) > LONG_TRANSCRIPT_TOKEN_THRESHOLD
+
+
+async def process_long_transcript(raw_transcript: List[Dict], use_cache: bool = True) -> Dict:
+    """
+    Map-reduce processing for transcripts above the token threshold.
+    Each speaker-turn-aligned chunk is analysed concurrently, then a reduce call merges the partial outputs.
+    """
+    chunks = split_transcript(raw_transcript, LONG_TRANSCRIPT_CHUNK_TOKENS)
+    logger.info(f"Long transcript split into {len(chunks)} chunks")
+
+    # Map: analyse each chunk into the four buckets
+    partial_outputs = await asyncio.gather(*(
+        call_llm(
+            TRANSCRIPT_PROMPT.format_messages(formatted_transcript_str=format_transcript(chunk)),
+            AnalysisOutput,
+            use_cache=use_cache,
+            prompt=TRANSCRIPT_PROMPT,
+        )
+        for chunk in chunks
+    ))
+
+    # Reduce: merge the partial analyses into one output
+    partial_analyses = "\n\n".join(
+        f"Part {index} of {len(partial_outputs)}:\n{format_analyst_output(output)}"
+        for index, output in enumerate(partial_outputs, start=1)
+    )
+    messages = REDUCE_PROMPT.format_messages(partial_analyses_str=partial_analyses)
+    return await call_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=REDUCE_PROMPT)
+
+
+async def build_transcript_messages(formatted_transcript: str, meeting_id: Optional[str] = None) -> Tuple[List, RegisteredPrompt]:
+    """Builds the phase one prompt, adding analyses of similar past meetings when few-shot examples are enabled."""
+    examples = await find_examples(formatted_transcript, exclude_meeting_id=meeting_id)
+    if examples:
+        messages = FEW_SHOT_TRANSCRIPT_PROMPT.format_messages(
+            few_shot_examples_str=examples, formatted_transcript_str=formatted_transcript
+        )
+        return messages, FEW_SHOT_TRANSCRIPT_PROMPT
+    return TRANSCRIPT_PROMPT.format_messages(formatted_transcript_str=formatted_transcript), TRANSCRIPT_PROMPT
+
+
+async def process_transcript(raw_transcript: List[Dict], use_cache: bool = True, meeting_id: Optional[str] = None) -> Dict:
     """Processes a raw transcript and returns the structured LLM output as a dictionary."""
     try:
         # Format messages using the transcript analyst template
-        formatted_transcript = format_transcript(raw_transcript)
-        messages = TRANSCRIPT_PROMPT_TEMPLATE.format_messages(formatted_transcript_str=formatted_transcript)
+        with span("format"):
+            formatted_transcript = format_transcript(raw_transcript)
+        metrics.observe("app_transcript_chars", len(formatted_transcript), buckets=SIZE_BUCKETS)
+        if is_long_transcript(formatted_transcript):
+            processed_transcript = await process_long_transcript(raw_transcript, use_cache=use_cache)
+            logger.info(f"Transcript processing (phase one, map-reduce) completed: {processed_transcript}")
+            return processed_transcript
+
+        messages, prompt = await build_transcript_messages(formatted_transcript, meeting_id)
 
         # Get the initial analyst output
         logger.info("Transcript processing started")
-        processed_transcript = call_llm(messages, AnalysisOutput)
+        processed_transcript = await call_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=prompt)
         logger.info(f"Transcript processing (phase one) completed: {processed_transcript}")
         return processed_transcript
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
     except LLMInteractionError as e:
         logger.error(f"Error in LLM interaction during transcript processing: {e}")
         raise TranscriptProcessingError(f"Error in transcript processing: {str(e)}")
@@ -62,24 +304,165 @@ def process_transcript(raw_transcript: List[Dict]) -> Dict:
         logger.error(f"Unexpected error during transcript processing: {e}")
         raise TranscriptProcessingError(f"Unexpected error: {str(e)}")
 
+
+async def stream_process_transcript(
+    raw_transcript: List[Dict], use_cache: bool = True, meeting_id: Optional[str] = None
+) -> AsyncGenerator[Tuple[bool, Dict], None]:
+    """Processes a raw transcript, streaming partial outputs before the final structured output."""
+    try:
+        # Format messages using the transcript analyst template
+        with span("format"):
+            formatted_transcript = format_transcript(raw_transcript)
+        metrics.observe("app_transcript_chars", len(formatted_transcript), buckets=SIZE_BUCKETS)
+        if is_long_transcript(formatted_transcript):
+            # The reduce step needs every chunk first, so long transcripts only yield the final output
+            processed_transcript = await process_long_transcript(raw_transcript, use_cache=use_cache)
+            logger.info(f"Transcript processing (phase one, map-reduce) completed: {processed_transcript}")
+            yield True, processed_transcript
+            return
+
+        messages, prompt = await build_transcript_messages(formatted_transcript, meeting_id)
+
+        logger.info("Transcript processing (streaming) started")
+        async for is_final, content in stream_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=prompt):
+            if is_final:
+                logger.info(f"Transcript processing (phase one) completed: {content}")
+            yield is_final, content
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
+    except LLMInteractionError as e:
+        logger.error(f"Error in LLM interaction during transcript processing: {e}")
+        raise TranscriptProcessingError(f"Error in transcript processing: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error during transcript processing: {e}")
+        raise TranscriptProcessingError(f"Unexpected error: {str(e)}")
+
+
+def build_update_messages(previous_output: Dict, diff: TranscriptDiff) -> List:
+    """Builds the update prompt from the previous analysis and the segments that changed since."""
+    return UPDATE_TRANSCRIPT_PROMPT.format_messages(
+        previous_analysis_str=format_analyst_output(previous_output),
+        removed_segments_str=format_transcript(diff.removed) or "(none)",
+        changed_segments_str=format_transcript(diff.added) or "(none)",
+    )
+
+
+async def update_transcript(previous_output: Dict, diff: TranscriptDiff, use_cache: bool = True) -> Dict:
+    """Revises the previous analysis of a meeting from the changed segments only, instead of the whole transcript."""
+    try:
+        messages = build_update_messages(previous_output, diff)
+        logger.info(f"Transcript update started ({len(diff.added)} segments added, {len(diff.removed)} removed)")
+        processed_transcript = await call_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=UPDATE_TRANSCRIPT_PROMPT)
+        logger.info(f"Transcript processing (phase one, update) completed: {processed_transcript}")
+        return processed_transcript
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
+    except LLMInteractionError as e:
+        logger.error(f"Error in LLM interaction during transcript update: {e}")
+        raise TranscriptProcessingError(f"Error in transcript update: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error during transcript update: {e}")
+        raise TranscriptProcessingError(f"Unexpected error: {str(e)}")
+
+
+async def stream_update_transcript(
+    previous_output: Dict, diff: TranscriptDiff, use_cache: bool = True
+) -> AsyncGenerator[Tuple[bool, Dict], None]:
+    """Revises the previous analysis like update_transcript, streaming partial outputs before the final one."""
+    try:
+        messages = build_update_messages(previous_output, diff)
+        logger.info(f"Transcript update (streaming) started ({len(diff.added)} segments added, {len(diff.removed)} removed)")
+        async for is_final, content in stream_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=UPDATE_TRANSCRIPT_PROMPT):
+            if is_final:
+                logger.info(f"Transcript processing (phase one, update) completed: {content}")
+            yield is_final, content
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
+    except LLMInteractionError as e:
+        logger.error(f"Error in LLM interaction during transcript update: {e}")
+        raise TranscriptProcessingError(f"Error in transcript update: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error during transcript update: {e}")
+        raise TranscriptProcessingError(f"Unexpected error: {str(e)}")
+
 # -----------------------------------------------------------------------------
 # Validation of analyst output
 # -----------------------------------------------------------------------------
 
 
-def validate_transcript(raw_analyst_output: Dict) -> Dict:
-    """Validates the analyst output using the structured LLM."""
+# Counters for how often the validation LLM call is skipped or narrowed
+validation_counters = {"skipped": 0, "partial": 0, "full": 0}
+
+
+def get_validation_stats() -> Dict:
+    """Returns how often validation was skipped, narrowed to failing sections, or run in full."""
+    total = sum(validation_counters.values())
+    return {
+        **validation_counters,
+        "total": total,
+        "skip_ratio": validation_counters["skipped"] / total if total else 0.0,
+    }
+
+
+@lru_cache(maxsize=None)
+def section_output_model(sections: Tuple[str, ...]) -> type:
+    """Builds (once per section combination) a structured output model holding only the given sections."""
+    fields = {section: (AnalysisOutput.model_fields[section].annotation, ...) for section in sections}
+    return create_model("SectionAnalysisOutput", **fields)
+
+
+async def validate_sections(raw_analyst_output: Dict, failing_sections: Dict[str, List[str]], use_cache: bool = True) -> Dict:
+    """Re-validates only the failing sections with a narrower prompt and merges them into the output."""
+    sections = tuple(failing_sections)
+    formatted_sections = format_analyst_output({section: raw_analyst_output.get(section) or {} for section in sections})
+    violations = "\n".join(
+        f"- {section.replace('_', ' ').title()}: {'; '.join(problems)}"
+        for section, problems in failing_sections.items()
+    )
+    messages = SECTION_VALIDATION_PROMPT.format_messages(
+        violations_str=violations, formatted_sections_str=formatted_sections
+    )
+
+    fixed_sections = await call_llm(messages, section_output_model(sections), use_cache=use_cache, prompt=SECTION_VALIDATION_PROMPT)
+    return {**raw_analyst_output, **fixed_sections}
+
+
+async def validate_transcript(raw_analyst_output: Dict, use_cache: bool = True) -> Dict:
+    """
+    Validates the analyst output using the structured LLM.
+    Sections that already pass the deterministic rules are kept as is; if every section passes,
+    the validation call is skipped entirely.
+    """
     try:
+        if VALIDATION_RULES_ENABLED:
+            failing_sections = check_output(raw_analyst_output)
+
+            if not failing_sections:
+                validation_counters["skipped"] += 1
+                logger.info("Transcript validation (phase two) skipped: output passes all rules")
+                return raw_analyst_output
+
+            if len(failing_sections) < len(SECTION_NAMES):
+                validation_counters["partial"] += 1
+                logger.info(f"Validating failing sections only: {', '.join(failing_sections)}")
+                validated_output = await validate_sections(raw_analyst_output, failing_sections, use_cache=use_cache)
+                logger.info(f"Transcript validation (phase two, partial) completed: {validated_output}")
+                return validated_output
+
+        validation_counters["full"] += 1
+
         # Format messages using the validation template
         formatted_output = format_analyst_output(raw_analyst_output)
-        messages = VALIDATION_PROMPT_TEMPLATE.format_messages(formatted_analyst_str=formatted_output)
+        messages = VALIDATION_PROMPT.format_messages(formatted_analyst_str=formatted_output)
 
         # Get the validation output
         logger.info("Validating transcript")
     
-        validated_output = call_llm(messages, AnalysisOutput)
+        validated_output = await call_llm(messages, AnalysisOutput, use_cache=use_cache, prompt=VALIDATION_PROMPT)
         logger.info(f"Transcript validation (phase two) completed: {validated_output}")
         return validated_output
+    except (TokenBudgetExceededError, ServerOverloadedError):
+        raise
     except LLMInteractionError as e:
         logger.error(f"Error in LLM interaction during validation: {e}")
         raise TranscriptValidationError(f"Error in validation: {str(e)}")
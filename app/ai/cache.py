@@ -0,0 +1,132 @@
+# Built in modules
+import os
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_DISK_ENABLED, CACHE_DIR
+
+# Prompt registry
+from app.ai.registry import schema_json
+
+# Utils
+from app.utils import write_json_file
+
+# -----------------------------------------------------------------------------
+# Cache Keys
+# -----------------------------------------------------------------------------
+
+
+def make_cache_key(messages: List, model: str, output_cls: type, prompt_version: str = "") -> str:
+    """Builds a content-addressed key from the formatted prompt, its registry version, model name and output schema."""
+    hasher = hashlib.sha256()
+    hasher.update(model.encode("utf-8"))
+    hasher.update(prompt_version.encode("utf-8"))
+    hasher.update(schema_json(output_cls).encode("utf-8"))
+    for message in messages:
+        hasher.update(f"\x00{message.role}\x00{message.content}".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Result Cache
+# -----------------------------------------------------------------------------
+
+
+class ResultCache:
+    """Two-tier LLM result cache: an in-memory LRU with TTL and an optional on-disk tier."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _is_expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: Dict) -> None:
+        """Stores an entry in memory, evicting the least recently used entries beyond capacity."""
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict]]:
+        file_path = os.path.join(self.disk_dir, f"{key}.json")
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry["created_at"], entry["value"]
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Returns the cached value for a key, or None on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._is_expired(entry[0]):
+                self._entries.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self.disk_dir:
+            try:
+                entry = await asyncio.to_thread(self._read_disk, key)
+            except Exception as e:
+                logger.warning(f"Failed to read cache entry {key}: {e}")
+                entry = None
+            if entry is not None and not self._is_expired(entry[0]):
+                self._remember(key, *entry)
+                self._counters["disk_hits"] += 1
+                return entry[1]
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict) -> None:
+        """Stores a value in memory and, when enabled, on disk."""
+        created_at = time.time()
+        self._remember(key, created_at, value)
+
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(
+                    write_json_file, self.disk_dir, key, {"created_at": created_at, "value": value}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to write cache entry {key}: {e}")
+
+    def clear(self) -> None:
+        """Drops every in-memory entry (disk entries are left to expire)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and the current in-memory size."""
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "hits": hits,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.disk_dir),
+        }
+
+
+# Initialize the cache globally
+result_cache = ResultCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS,
+    disk_dir=CACHE_DIR if CACHE_DISK_ENABLED else None,
+)
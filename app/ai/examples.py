@@ -0,0 +1,343 @@
+# Built in modules
+import os
+import re
+import json
+import time
+import zlib
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Protocol, Tuple
+
+# fcntl is POSIX only; without it the example index is only safe to write from one worker process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# NumPy
+import numpy as np
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import (
+    FEW_SHOT_EXAMPLES,
+    FEW_SHOT_MIN_SIMILARITY,
+    EXAMPLE_EMBEDDING_BACKEND,
+    EXAMPLE_EMBEDDING_DIM,
+    EXAMPLE_EMBEDDING_MODEL,
+    EXAMPLE_INDEX_DIR,
+)
+
+# Meeting store
+from app.store import MeetingStore, meeting_store
+
+# Utils
+from app.utils import ensure_directory_exists, format_transcript, format_analyst_output
+
+# -----------------------------------------------------------------------------
+# Embedding Backends
+# -----------------------------------------------------------------------------
+
+
+# Embedding inputs are capped so one huge transcript cannot dominate request latency
+EMBEDDING_MAX_CHARS = 20000
+
+
+class EmbeddingBackend(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Returns one L2-normalised float32 row per text."""
+        ...
+
+
+class HashingEmbedding:
+    """
+    Deterministic local embedding: term-frequency feature hashing of words and word pairs.
+    Needs no network or model download, so it is the default and the stand-in for tests.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        words = re.findall(r"[a-z0-9]+", text[:EMBEDDING_MAX_CHARS].lower())
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if features:
+            # crc32 (unlike hash()) is stable across processes, which the persisted index relies on
+            buckets = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32, count=len(features))
+            weights = np.log1p(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+            signs = np.where(buckets & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vector, buckets % self.dim, signs * weights)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([self._embed_one(text) for text in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+
+class OpenAIEmbeddingBackend:
+    """Embeddings from the OpenAI API (blocking calls; run off the event loop)."""
+
+    name = "openai"
+
+    def __init__(self, model: str):
+        from llama_index.embeddings.openai import OpenAIEmbedding
+
+        self.model = OpenAIEmbedding(model=model)
+        self.name = f"openai:{model}"
+        self.dim = len(self.model.get_text_embedding("dimension probe"))
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.model.get_text_embedding_batch([text[:EMBEDDING_MAX_CHARS] for text in texts]), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+def build_embedding_backend(name: str) -> EmbeddingBackend:
+    if name == "openai":
+        return OpenAIEmbeddingBackend(EXAMPLE_EMBEDDING_MODEL)
+    return HashingEmbedding(EXAMPLE_EMBEDDING_DIM)
+
+# -----------------------------------------------------------------------------
+# Example Index
+# -----------------------------------------------------------------------------
+
+
+class ExampleIndex:
+    """
+    Similarity index over analysed meetings, used to pick few-shot examples.
+
+    Embeddings live in an append-only float32 file that is memory-mapped as an (n, dim)
+    matrix, with meeting IDs in a parallel append-only text file. Searching is one
+    matrix-vector product plus argpartition; adding a meeting appends one row.
+
+    Worker processes share the files: writes hold an flock on .index.lock and first re-read
+    the files, so rows land where the files actually end, and a reader re-reads them once
+    ids.txt has changed on disk.
+    """
+
+    def __init__(self, directory: str, backend: EmbeddingBackend):
+        self.directory = directory
+        self.backend = backend
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.ids_path = os.path.join(directory, "ids.txt")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.lock_path = os.path.join(directory, ".index.lock")
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._stale = False
+        self._ids: List[str] = []
+        self._ids_bytes = 0
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, backend.dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._ids)
+
+    def _meta(self) -> Dict:
+        return {"backend": self.backend.name, "dim": self.backend.dim}
+
+    def _ids_version(self) -> Tuple[int, int, int]:
+        try:
+            stat = os.stat(self.ids_path)
+        except FileNotFoundError:
+            return 0, 0, 0
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Holds the index's flock, serialising writes across worker processes."""
+        ensure_directory_exists(self.directory)
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def load(self) -> None:
+        """Memory-maps the on-disk index, re-reading it when another worker has added to or rebuilt it."""
+        with self._lock:
+            if self._version != self._ids_version():
+                self._read_files()
+
+    def _read_files(self) -> None:
+        """Reads the on-disk index (with self._lock held). An index built with another backend is ignored until rebuilt."""
+        self._version = self._ids_version()
+        self._stale = False
+        self._ids, self._ids_bytes, self._rows = [], 0, {}
+        self._matrix = np.zeros((0, self.backend.dim), dtype=np.float32)
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            if json.load(f) != self._meta():
+                logger.warning(f"Example index in {self.directory} was built with another embedding backend; run `python -m app.ai.examples build`")
+                self._stale = True
+                return
+        with open(self.ids_path, "rb") as f:
+            # A line without its newline is an append still in progress (or cut short by a crash)
+            ids = f.read().decode("utf-8").split("\n")[:-1]
+        # A crash between the two appends can leave one side a row longer; trust the shorter one
+        rows = min(len(ids), os.path.getsize(self.vectors_path) // (4 * self.backend.dim))
+        self._ids = ids[:rows]
+        self._ids_bytes = sum(len(meeting_id.encode("utf-8")) + 1 for meeting_id in self._ids)
+        self._rows = {meeting_id: row for row, meeting_id in enumerate(self._ids)}
+        self._remap(rows)
+
+    def _remap(self, rows: int) -> None:
+        if rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.backend.dim))
+
+    def _reset_files(self) -> None:
+        """Starts an empty index. Files are replaced, not truncated: other workers may still have the old ones mapped."""
+        ensure_directory_exists(self.directory)
+        for path in (self.vectors_path, self.ids_path, self.meta_path):
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                if path == self.meta_path:
+                    json.dump(self._meta(), f)
+            os.replace(f"{path}.tmp", path)
+        self._read_files()
+
+    def add(self, meeting_ids: List[str], texts: List[str]) -> None:
+        """Embeds and adds meetings. Meetings already in the index have their row overwritten in place."""
+        vectors = self.backend.embed(texts)
+        with self._lock, self._file_lock():
+            # Other workers may have appended to or rebuilt the index since this one last read it
+            self._read_files()
+            # Rows embedded by another backend are not comparable, so start over rather than mix them
+            if self._stale or not os.path.exists(self.meta_path):
+                self._reset_files()
+            # Cut off anything past the last complete row, so appended vectors stay aligned with their IDs
+            # (only bytes no reader has mapped, since readers trust the same complete rows)
+            row_bytes = 4 * self.backend.dim
+            for path, size in ((self.vectors_path, len(self._ids) * row_bytes), (self.ids_path, self._ids_bytes)):
+                if os.path.getsize(path) > size:
+                    os.truncate(path, size)
+
+            new_ids, new_rows = [], []
+            for meeting_id, vector in zip(meeting_ids, vectors):
+                row = self._rows.get(meeting_id)
+                if row is not None:
+                    updater = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(len(self._ids), self.backend.dim))
+                    updater[row] = vector
+                    updater.flush()
+                elif meeting_id not in new_ids:
+                    new_ids.append(meeting_id)
+                    new_rows.append(vector)
+
+            if new_ids:
+                # Vectors first, then IDs: readers only trust rows present in both files
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.asarray(new_rows, dtype=np.float32).tobytes())
+                with open(self.ids_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{meeting_id}\n" for meeting_id in new_ids))
+            self._read_files()
+
+    def search(self, text: str, k: int, exclude: Optional[str] = None, min_similarity: float = 0.0) -> List[Tuple[str, float]]:
+        """Returns up to k (meeting_id, cosine similarity) pairs, most similar first."""
+        self.load()
+        with self._lock:
+            matrix, ids, rows = self._matrix, self._ids, self._rows
+        if k <= 0 or not len(matrix):
+            return []
+
+        scores = matrix @ self.backend.embed([text])[0]
+        if exclude in rows:
+            scores[rows[exclude]] = -np.inf
+
+        # argpartition finds the top k in linear time; only those k are sorted
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[row], float(scores[row])) for row in top if scores[row] >= min_similarity]
+
+    def rebuild(self, store: MeetingStore, batch_size: int = 200) -> int:
+        """Re-embeds every analysed meeting in the store into a fresh index. Returns the number of meetings."""
+        with self._lock, self._file_lock():
+            self._reset_files()
+
+        batch_ids, batch_texts = [], []
+        for meeting_id, transcript in store.iter_analysed_transcripts(batch_size):
+            batch_ids.append(meeting_id)
+            batch_texts.append(format_transcript(transcript))
+            if len(batch_ids) >= batch_size:
+                self.add(batch_ids, batch_texts)
+                batch_ids, batch_texts = [], []
+        if batch_ids:
+            self.add(batch_ids, batch_texts)
+        return len(self._ids)
+
+
+_example_index: Optional[ExampleIndex] = None
+
+
+def get_example_index() -> ExampleIndex:
+    """Returns the global example index, creating the embedding backend on first use."""
+    global _example_index
+    if _example_index is None:
+        _example_index = ExampleIndex(EXAMPLE_INDEX_DIR, build_embedding_backend(EXAMPLE_EMBEDDING_BACKEND))
+    return _example_index
+
+# -----------------------------------------------------------------------------
+# Few-Shot Helpers
+# -----------------------------------------------------------------------------
+
+
+def select_examples(formatted_transcript: str, exclude_meeting_id: Optional[str] = None) -> str:
+    """Formats the analyses of the most similar past meetings for the few-shot prompt ("" when none qualify)."""
+    matches = get_example_index().search(formatted_transcript, FEW_SHOT_EXAMPLES, exclude_meeting_id, FEW_SHOT_MIN_SIMILARITY)
+    examples = []
+    for meeting_id, _ in matches:
+        output = meeting_store.get_output(meeting_id)
+        if output:
+            examples.append(f"Example {len(examples) + 1}:\n{format_analyst_output(output)}")
+    if examples:
+        logger.info(f"Using {len(examples)} few-shot examples: {', '.join(f'{meeting_id} ({score:.2f})' for meeting_id, score in matches)}")
+    return "\n\n".join(examples)
+
+
+async def find_examples(formatted_transcript: str, exclude_meeting_id: Optional[str] = None) -> str:
+    """Async wrapper around select_examples; embedding and store reads run off the event loop."""
+    if FEW_SHOT_EXAMPLES <= 0:
+        return ""
+    try:
+        return await asyncio.to_thread(select_examples, formatted_transcript, exclude_meeting_id)
+    except Exception as e:
+        logger.warning(f"Few-shot example retrieval failed, continuing without examples: {e}")
+        return ""
+
+
+async def index_meeting(meeting_id: str, transcript: list) -> None:
+    """Adds a freshly analysed meeting to the example index."""
+    if FEW_SHOT_EXAMPLES <= 0:
+        return
+    try:
+        await asyncio.to_thread(get_example_index().add, [meeting_id], [format_transcript(transcript)])
+    except Exception as e:
+        logger.warning(f"Failed to add meeting {meeting_id} to the example index: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the few-shot example index.")
+    parser.add_argument("command", choices=["build"])
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = get_example_index().rebuild(meeting_store)
+    print(f"Indexed {count} meetings into {EXAMPLE_INDEX_DIR} in {time.perf_counter() - started:.1f}s")
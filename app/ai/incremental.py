@@ -0,0 +1,99 @@
+# Built in modules
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+# Config
+from app.core.config import INCREMENTAL_MAX_CHANGE_RATIO, INCREMENTAL_MAX_CHANGED_TOKENS
+
+# Logger
+from app.logger import logger
+
+# Metrics
+from app.metrics import metrics
+
+# Utils
+from app.utils import format_transcript, count_tokens
+
+# -----------------------------------------------------------------------------
+# Transcript Diff
+# -----------------------------------------------------------------------------
+
+
+class TranscriptDiff:
+    """Segments removed from the stored transcript and segments new in the fetched one, both in transcript order."""
+
+    def __init__(self, added: List[Dict], removed: List[Dict], old_total: int, new_total: int):
+        self.added = added
+        self.removed = removed
+        self.old_total = old_total
+        self.new_total = new_total
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.added and not self.removed
+
+    @property
+    def change_ratio(self) -> float:
+        """The larger of the added share of the new transcript and the removed share of the old one."""
+        return max(len(self.added) / max(1, self.new_total), len(self.removed) / max(1, self.old_total))
+
+
+def segment_key(segment: Dict) -> tuple:
+    return segment.get("person", ""), segment.get("said", "")
+
+
+def diff_transcripts(old_transcript: List[Dict], new_transcript: List[Dict]) -> TranscriptDiff:
+    """
+    Aligns two versions of a transcript segment by segment. A corrected segment shows up as
+    removed (old text) and added (new text); an extension is only added segments at the end.
+    """
+    matcher = SequenceMatcher(
+        a=[segment_key(segment) for segment in old_transcript],
+        b=[segment_key(segment) for segment in new_transcript],
+        autojunk=False,
+    )
+    added: List[Dict] = []
+    removed: List[Dict] = []
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag != "equal":
+            removed.extend(old_transcript[old_start:old_end])
+            added.extend(new_transcript[new_start:new_end])
+    return TranscriptDiff(added, removed, len(old_transcript), len(new_transcript))
+
+# -----------------------------------------------------------------------------
+# Update Plan
+# -----------------------------------------------------------------------------
+
+
+class UpdatePlan:
+    """How to re-analyse a meeting: "unchanged" (reuse the output), "update" (revise it from the diff) or "full"."""
+
+    def __init__(self, mode: str, reason: str, diff: Optional[TranscriptDiff] = None, previous_output: Optional[Dict] = None):
+        self.mode = mode
+        self.reason = reason
+        self.diff = diff
+        self.previous_output = previous_output
+
+
+def plan_update(previous_transcript: Optional[List[Dict]], previous_output: Optional[Dict], transcript: List[Dict]) -> UpdatePlan:
+    """Decides between reusing, updating and re-running the analysis of a re-fetched transcript."""
+    if previous_transcript is None or previous_output is None:
+        plan = UpdatePlan("full", "no_previous_analysis")
+    else:
+        diff = diff_transcripts(previous_transcript, transcript)
+        if diff.unchanged:
+            plan = UpdatePlan("unchanged", "same_transcript", diff, previous_output)
+        elif diff.change_ratio > INCREMENTAL_MAX_CHANGE_RATIO:
+            plan = UpdatePlan("full", "change_ratio", diff)
+        elif count_tokens(format_transcript(diff.added + diff.removed)) > INCREMENTAL_MAX_CHANGED_TOKENS:
+            plan = UpdatePlan("full", "changed_tokens", diff)
+        else:
+            plan = UpdatePlan("update", "small_change", diff, previous_output)
+
+    metrics.inc("app_incremental_total", mode=plan.mode, reason=plan.reason)
+    if plan.diff is not None:
+        logger.info(
+            f"Re-analysis plan: {plan.mode} ({plan.reason}); {len(plan.diff.added)} segments added, "
+            f"{len(plan.diff.removed)} removed ({plan.diff.change_ratio:.0%} changed)"
+        )
+    return plan
@@ -1,9 +1,8 @@
 # Built in modules
 from typing import List
 
-# Pydantic and Llma Index
+# Pydantic
 from pydantic import BaseModel, Field
-from llama_index.core import PromptTemplate
 
 # -----------------------------------------------------------------------------
 # TRANSCRIPT PROMPT & MODELS
@@ -33,7 +32,7 @@ class AnalysisOutput(BaseModel):
     ExampleCompany: ExampleCompany
 
 
-TRANSCRIPT_PROMPT_RAW = (
+TRANSCRIPT_SYSTEM_PROMPT = (
     "You are an analyst at ExampleCompany who is an expert at extracting information from a client transcript into the following bucket names:\n\n"
     "1. Business Strategies: Identify the current broad business strategy where compliance fits in. Avoid aspirational language and keep the focus on the present. Essentially, what is their overarching business strategy, and where does compliance fit into the picture? This should be top down but stay broad, starting with the first bullet. Avoid measurable statements here. Use the client’s language without using quotes.\n\n"
     "2. Compliance Initiatives: Focus on compliance strategies currently being implemented, using measurable statements. Highlight specific issues like headcount, costs, and time burdens, and emphasize areas where improvements are needed. Describe the existing situation, not future initiatives. Each statement should be a short and concise fact in the present. Use the client’s language without using quotes.\n\n"
@@ -46,17 +45,38 @@ TRANSCRIPT_PROMPT_RAW = (
     "4. Ensure all bullet points focus on the problem or current state, rather than the solution or outcome. Maximum of 3 or 4 bullet points. Only use 4 if used for something measurable and needed, always favor 3.\n"
     "5. Be concise and to the point—each bullet should focus on key facts, avoiding future-oriented statements. Limit each to 12-15 words.\n"
     "6. Without using quotes from the client, each bullet should use the client language. Do not use your own and avoid very general business terms and phrases. If you're using them, then you're not specific enough.\n\n"
+)
+
+TRANSCRIPT_USER_PROMPT = (
+    "Here is the transcript:\n"
+    "{formatted_transcript_str}\n"
+)
+
+# Same instructions, with analyses of similar past meetings as examples
+FEW_SHOT_TRANSCRIPT_USER_PROMPT = (
+    "Here are analyses of similar past meetings that followed these instructions. Match their style and level of specificity, but only use facts from the new transcript:\n\n"
+    "{few_shot_examples_str}\n\n"
     "Here is the transcript:\n"
     "{formatted_transcript_str}\n"
 )
 
-TRANSCRIPT_PROMPT_TEMPLATE = PromptTemplate(TRANSCRIPT_PROMPT_RAW)
+# Same instructions, revising a previous analysis after the transcript was corrected or extended
+UPDATE_TRANSCRIPT_USER_PROMPT = (
+    "This meeting was analysed before, and its transcript has since been corrected or extended. Here is the previous analysis:\n"
+    "{previous_analysis_str}\n\n"
+    "These transcript segments were removed or replaced:\n"
+    "{removed_segments_str}\n\n"
+    "These transcript segments are new or corrected:\n"
+    "{changed_segments_str}\n\n"
+    "Update the previous analysis. Keep bullets that still hold, revise or drop bullets that relied on removed segments, "
+    "and add facts from the new segments where they belong. Follow every instruction above for the updated analysis.\n"
+)
 
 # -----------------------------------------------------------------------------
 # VALIDATION PROMPT
 # -----------------------------------------------------------------------------
 
-VALIDATION_PROMPT_RAW = (
+VALIDATION_SYSTEM_PROMPT = (
     "You are an analyst at ExampleCompany who is an expert at validating the extracted information from a client transcript into the following bucket names:\n\n"
     "1. Business Strategies: Review the current broad business strategy and ensure compliance fits in properly. Confirm focus on the present, avoid aspirational language. The first bullet should be broad, using the client’s language without using quotes. Ensure no measurable statements are included.\n\n"
     "2. Compliance Initiatives: Ensure that compliance strategies currently being implemented are described using measurable statements. Highlight issues such as headcount, costs, and time burdens. Ensure it focuses on the present situation, and avoid future initiatives. Each statement should be concise and factual, using the client’s language without quotes.\n\n"
@@ -69,11 +89,48 @@ VALIDATION_PROMPT_RAW = (
     "4. Ensure all bullet points focus on the problem or current state. Use a maximum of 3 or 4 bullets, favoring 3 unless 4 is necessary for measurable statements.\n"
     "5. Keep each bullet concise, limiting them to 12-15 words.\n"
     "6. Avoid using direct quotes from the client. Ensure the client’s language is used without generic business terms.\n\n"
+)
+
+VALIDATION_USER_PROMPT = (
     "Here is the analyst output:\n"
     "{formatted_analyst_str}\n"
 )
 
-VALIDATION_PROMPT_TEMPLATE = PromptTemplate(VALIDATION_PROMPT_RAW)
+SECTION_VALIDATION_SYSTEM_PROMPT = (
+    "You are an analyst at ExampleCompany who is an expert at validating the extracted information from a client transcript. "
+    "Only the sections below failed an automated review. Rewrite just these sections so they follow every rule, keeping the client's facts and language.\n\n"
+    "Rules:\n\n"
+    "1. When referring to ExampleCompany, ensure it is ONLY done in the ExampleCompany section, and do not start bullets with it.\n"
+    "2. Use a maximum of 3 or 4 bullets, favoring 3 unless 4 is necessary for measurable statements.\n"
+    "3. Keep each bullet concise, limiting them to 12-15 words.\n"
+    "4. Avoid using direct quotes from the client. Ensure the client’s language is used without generic business terms.\n\n"
+)
+
+SECTION_VALIDATION_USER_PROMPT = (
+    "Problems found:\n"
+    "{violations_str}\n\n"
+    "Here are the sections to fix:\n"
+    "{formatted_sections_str}\n"
+)
+
+# -----------------------------------------------------------------------------
+# REDUCE PROMPT (long transcripts)
+# -----------------------------------------------------------------------------
+
+REDUCE_SYSTEM_PROMPT = (
+    "You are an analyst at ExampleCompany. A long client transcript was split into consecutive parts, and each part was analysed separately into the following bucket names: Business Strategies, Compliance Initiatives, Risk & Critical Capabilities, and ExampleCompany.\n\n"
+    "Merge the partial analyses below into one analysis of the whole meeting:\n\n"
+    "1. Combine bullets that describe the same fact and drop duplicates. Keep the most specific and measurable wording.\n"
+    "2. Prefer points that recur across parts or carry numbers such as headcount, cost, time, or deadlines.\n"
+    "3. When referring to ExampleCompany, this should ONLY be done in the ExampleCompany section.\n"
+    "4. Ensure all bullet points focus on the problem or current state. Maximum of 3 or 4 bullet points per bucket, always favor 3.\n"
+    "5. Keep each bullet concise, limiting them to 12-15 words, using the client's language without quotes.\n\n"
+)
+
+REDUCE_USER_PROMPT = (
+    "Here are the partial analyses:\n"
+    "{partial_analyses_str}\n"
+)
 
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
@@ -0,0 +1,162 @@
+# Built in modules
+import json
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# Pydantic
+from pydantic import create_model
+
+# Config
+from app.core.config import DEFAULT_LLM_MODEL
+
+# Model Router
+from app.ai.router import model_router, get_llm, llama_index_types
+
+# Prompts
+from app.ai.prompts import (
+    AnalysisOutput,
+    TRANSCRIPT_SYSTEM_PROMPT,
+    TRANSCRIPT_USER_PROMPT,
+    FEW_SHOT_TRANSCRIPT_USER_PROMPT,
+    UPDATE_TRANSCRIPT_USER_PROMPT,
+    VALIDATION_SYSTEM_PROMPT,
+    VALIDATION_USER_PROMPT,
+    SECTION_VALIDATION_SYSTEM_PROMPT,
+    SECTION_VALIDATION_USER_PROMPT,
+    REDUCE_SYSTEM_PROMPT,
+    REDUCE_USER_PROMPT,
+)
+
+# llama_index is imported on first use (see llama_index_types); it is the slowest import in the app
+if TYPE_CHECKING:
+    from llama_index.core.llms import ChatMessage, LLM
+    from llama_index.core.tools import FunctionTool
+
+# -----------------------------------------------------------------------------
+# Schemas & Structured LLMs
+# -----------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=None)
+def schema_json(output_cls: type) -> str:
+    """Returns the output model's JSON schema, serialized once per class."""
+    return json.dumps(output_cls.model_json_schema(), sort_keys=True)
+
+
+_structured_llms: Dict[Tuple[str, type], "LLM"] = {}
+
+
+def structured_llm(output_cls: type, llm: Optional["LLM"] = None) -> "LLM":
+    """Returns the structured-output wrapper for an LLM (the default model if omitted) and output model, building it on first use."""
+    llm = llm or get_llm(DEFAULT_LLM_MODEL)
+    key = (llm.model, output_cls)
+    if key not in _structured_llms:
+        _structured_llms[key] = llm.as_structured_llm(output_cls=output_cls)
+    return _structured_llms[key]
+
+
+@lru_cache(maxsize=None)
+def output_tool(output_cls: type) -> Tuple["FunctionTool", type]:
+    """
+    Returns the function tool whose arguments carry an output model when streaming, and the
+    all-optional model that partial arguments parse into, built once per output model.
+    """
+    from llama_index.core.tools import FunctionTool
+
+    schema = output_cls.model_json_schema()
+    tool = FunctionTool.from_defaults(
+        fn=lambda **kwargs: output_cls(**kwargs),
+        name=schema["title"],
+        description=schema.get("description"),
+        fn_schema=output_cls,
+    )
+    partial_cls = create_model(
+        f"Partial{output_cls.__name__}",
+        **{name: (Optional[field.annotation], None) for name, field in output_cls.model_fields.items()},
+    )
+    return tool, partial_cls
+
+
+def parse_partial_output(arguments: str, partial_cls: type) -> Optional[Dict]:
+    """Parses the tool-call arguments streamed so far into a partial output, or None if nothing parses yet."""
+    from llama_index.core.llms.utils import parse_partial_json
+
+    try:
+        return partial_cls.model_validate(parse_partial_json(arguments)).model_dump()
+    except ValueError:
+        return None
+
+# -----------------------------------------------------------------------------
+# Prompt Registry
+# -----------------------------------------------------------------------------
+
+
+class RegisteredPrompt:
+    """
+    A precompiled prompt: the instructions are a fixed system message, and only the
+    user message is formatted per call. Keeping the long instructions as an identical
+    leading message lets the provider's automatic prompt caching reuse them.
+    """
+
+    def __init__(self, name: str, phase: str, system_prompt: str, user_prompt: str, output_cls: type):
+        self.name = name
+        self.phase = phase
+        self.system_prompt = system_prompt.strip()
+        self.user_prompt = user_prompt
+        self.output_cls = output_cls
+        # Covers everything that shapes the model's answer: both messages and the output schema
+        self.version = hashlib.sha256(
+            "\x00".join((self.system_prompt, self.user_prompt, schema_json(output_cls))).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def format_messages(self, **kwargs) -> List["ChatMessage"]:
+        _, ChatMessage, MessageRole = llama_index_types()
+        return [
+            ChatMessage(role=MessageRole.SYSTEM, content=self.system_prompt),
+            ChatMessage(role=MessageRole.USER, content=self.user_prompt.format(**kwargs)),
+        ]
+
+
+class PromptRegistry:
+    """Holds every prompt the pipeline sends. Prompts are built at import time, their LLM wrappers by warm_up() or on first use."""
+
+    def __init__(self):
+        self._prompts: Dict[str, RegisteredPrompt] = {}
+
+    def register(self, name: str, phase: str, system_prompt: str, user_prompt: str, output_cls: type) -> RegisteredPrompt:
+        """Registers a prompt under a pipeline phase (transcript, reduce, validation), which model routing keys on."""
+        prompt = RegisteredPrompt(name, phase, system_prompt, user_prompt, output_cls)
+        self._prompts[name] = prompt
+        return prompt
+
+    def get(self, name: str) -> RegisteredPrompt:
+        return self._prompts[name]
+
+    def warm_up(self) -> int:
+        """
+        Builds the LLM client and structured wrapper for every prompt and every model its phase
+        can be routed to, so requests never pay for them. Returns the number of wrappers built.
+        """
+        built = 0
+        for prompt in self._prompts.values():
+            for model in model_router.phase_models(prompt.phase):
+                structured_llm(prompt.output_cls, get_llm(model))
+                built += 1
+        return built
+
+    def versions(self) -> Dict[str, str]:
+        """Returns the version hash of every registered prompt, for audits and /metrics."""
+        return {name: prompt.version for name, prompt in self._prompts.items()}
+
+
+# Initialize the registry globally
+prompt_registry = PromptRegistry()
+
+TRANSCRIPT_PROMPT = prompt_registry.register("transcript", "transcript", TRANSCRIPT_SYSTEM_PROMPT, TRANSCRIPT_USER_PROMPT, AnalysisOutput)
+FEW_SHOT_TRANSCRIPT_PROMPT = prompt_registry.register("transcript_few_shot", "transcript", TRANSCRIPT_SYSTEM_PROMPT, FEW_SHOT_TRANSCRIPT_USER_PROMPT, AnalysisOutput)
+UPDATE_TRANSCRIPT_PROMPT = prompt_registry.register("transcript_update", "transcript", TRANSCRIPT_SYSTEM_PROMPT, UPDATE_TRANSCRIPT_USER_PROMPT, AnalysisOutput)
+VALIDATION_PROMPT = prompt_registry.register("validation", "validation", VALIDATION_SYSTEM_PROMPT, VALIDATION_USER_PROMPT, AnalysisOutput)
+# Section validation answers with a per-call subset of AnalysisOutput; the version tracks the full schema
+SECTION_VALIDATION_PROMPT = prompt_registry.register("section_validation", "validation", SECTION_VALIDATION_SYSTEM_PROMPT, SECTION_VALIDATION_USER_PROMPT, AnalysisOutput)
+REDUCE_PROMPT = prompt_registry.register("reduce", "reduce", REDUCE_SYSTEM_PROMPT, REDUCE_USER_PROMPT, AnalysisOutput)
@@ -0,0 +1,186 @@
+# Built in modules
+import time
+import threading
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# HTTP client
+import httpx
+
+# Logger
+from app.logger import logger
+
+# Fixture recording
+from app.recorder import recording_transport
+
+# Config
+from app.core.config import (
+    DEFAULT_LLM_MODEL,
+    MODEL_ROUTING_POLICY,
+    REQUEST_TOKEN_BUDGET,
+    TENANT_TOKEN_BUDGET,
+    TENANT_BUDGET_WINDOW_SECONDS,
+)
+
+# Errors
+from app.core.errors import TokenBudgetExceededError
+
+# Metrics
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from llama_index.llms.openai import OpenAI
+
+# -----------------------------------------------------------------------------
+# Models
+# -----------------------------------------------------------------------------
+
+
+# llama_index is imported on first use (it dominates startup). The import is serialised because
+# the startup warm-up thread and a request importing it concurrently can deadlock on its module locks
+_llama_index_lock = threading.Lock()
+_llama_index_types: Optional[Tuple[type, type, type]] = None
+
+
+def llama_index_types() -> Tuple[type, type, type]:
+    """Returns llama_index's (OpenAI, ChatMessage, MessageRole), importing them once."""
+    global _llama_index_types
+    if _llama_index_types is None:
+        with _llama_index_lock:
+            if _llama_index_types is None:
+                from llama_index.llms.openai import OpenAI
+                from llama_index.core.llms import ChatMessage, MessageRole
+
+                _llama_index_types = (OpenAI, ChatMessage, MessageRole)
+    return _llama_index_types
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str) -> "OpenAI":
+    """Returns the shared LLM instance for a model name."""
+    OpenAI, _, _ = llama_index_types()
+    # With HTTP_RECORD_DIR set, the client records its exchanges as replay fixtures
+    transport = recording_transport()
+    return OpenAI(model=model, async_http_client=httpx.AsyncClient(transport=transport) if transport is not None else None)
+
+# -----------------------------------------------------------------------------
+# Routing
+# -----------------------------------------------------------------------------
+
+
+class RouteDecision:
+    """The models to try for one call, in order, and why the first one was picked."""
+
+    def __init__(self, phase: str, models: List[str], reason: str, prompt_tokens: int):
+        self.phase = phase
+        self.models = models
+        self.reason = reason
+        self.prompt_tokens = prompt_tokens
+
+
+class ModelRouter:
+    """
+    Picks a model per call from a per-phase policy, e.g.
+    {"validation": {"model": "gpt-4o-mini"}, "transcript": {"model": "gpt-4o", "short_model": "gpt-4o-mini", "short_max_tokens": 8000}}.
+    Phases without an entry use "default".
+    """
+
+    def __init__(self, policy: Dict[str, Dict]):
+        self.policy = policy
+
+    def _phase_policy(self, phase: str) -> Dict:
+        return {**self.policy.get("default", {}), **self.policy.get(phase, {})}
+
+    def route(self, phase: str, prompt_tokens: int) -> RouteDecision:
+        policy = self._phase_policy(phase)
+        primary, reason = policy.get("model", DEFAULT_LLM_MODEL), "policy"
+        if policy.get("short_model") and prompt_tokens <= int(policy.get("short_max_tokens", 0)):
+            primary, reason = policy["short_model"], "short_prompt"
+
+        models = [primary] + [model for model in policy.get("fallbacks", []) if model != primary]
+        metrics.inc("app_llm_route_total", phase=phase, model=primary, reason=reason)
+        return RouteDecision(phase, models, reason, prompt_tokens)
+
+    def phase_models(self, phase: str) -> List[str]:
+        """Every model the policy can send a phase to, for warming their clients up front."""
+        policy = self._phase_policy(phase)
+        models = [policy.get("model", DEFAULT_LLM_MODEL), policy.get("short_model")] + list(policy.get("fallbacks", []))
+        return list(dict.fromkeys(model for model in models if model))
+
+    @staticmethod
+    def record_fallback(decision: RouteDecision, failed_model: str, error: Exception) -> None:
+        metrics.inc("app_llm_fallback_total", phase=decision.phase, model=failed_model, error=type(error).__name__)
+        logger.warning(f"LLM call on {failed_model} failed for phase {decision.phase} ({type(error).__name__}: {error}); falling back")
+
+
+# Initialize the router globally
+model_router = ModelRouter(MODEL_ROUTING_POLICY)
+
+# -----------------------------------------------------------------------------
+# Token Budgets
+# -----------------------------------------------------------------------------
+
+
+# Tenant of the request being handled (X-Tenant-ID), and the token budget of the current pipeline run
+tenant_var: ContextVar[str] = ContextVar("tenant", default="default")
+_request_budget: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_budget", default=None)
+
+
+def set_tenant(tenant: str) -> None:
+    tenant_var.set(tenant)
+
+
+class TenantBudgets:
+    """Fixed-window token budgets per tenant, kept in process memory."""
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._usage: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def charge(self, tenant: str, tokens: int, enforce: bool) -> None:
+        if self.limit <= 0:
+            return
+        with self._lock:
+            window_start, used = self._usage.get(tenant, (time.time(), 0))
+            if time.time() - window_start >= self.window_seconds:
+                window_start, used = time.time(), 0
+            if enforce and used + tokens > self.limit:
+                raise TokenBudgetExceededError(
+                    f"Tenant {tenant} has used {used} of {self.limit} tokens in the current window; this call needs {tokens}."
+                )
+            self._usage[tenant] = (window_start, used + tokens)
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {tenant: used for tenant, (_, used) in self._usage.items()}
+
+
+# Initialize the tenant budgets globally
+tenant_budgets = TenantBudgets(TENANT_TOKEN_BUDGET, TENANT_BUDGET_WINDOW_SECONDS)
+
+
+def start_request_budget(limit: int = REQUEST_TOKEN_BUDGET) -> Dict[str, int]:
+    """Starts a token budget for the pipeline run in the current task."""
+    budget = {"limit": limit, "used": 0}
+    _request_budget.set(budget)
+    return budget
+
+
+def charge_tokens(tokens: int, enforce: bool = True) -> None:
+    """
+    Charges tokens to the current request and tenant. With enforce=True (prompt tokens, before
+    a call) a call that would exceed either budget raises TokenBudgetExceededError; completion
+    tokens are charged afterwards with enforce=False.
+    """
+    budget = _request_budget.get()
+    if budget is not None and budget["limit"] > 0:
+        if enforce and budget["used"] + tokens > budget["limit"]:
+            raise TokenBudgetExceededError(
+                f"Request has used {budget['used']} of {budget['limit']} tokens; this call needs {tokens}."
+            )
+    tenant_budgets.charge(tenant_var.get(), tokens, enforce)
+    if budget is not None:
+        budget["used"] += tokens
@@ -0,0 +1,58 @@
+# Built in modules
+import re
+from typing import Dict, List
+
+# Config
+from app.core.config import RULE_MAX_BULLETS, RULE_MIN_WORDS, RULE_MAX_WORDS
+
+# Prompts
+from app.ai.prompts import AnalysisOutput
+
+# -----------------------------------------------------------------------------
+# Deterministic Output Rules
+#
+# Mirrors the mechanical rules in the transcript and validation prompts so
+# outputs that already comply can skip the validation LLM call.
+# -----------------------------------------------------------------------------
+
+
+SECTION_NAMES = list(AnalysisOutput.model_fields)
+BRAND_SECTION = "ExampleCompany"
+BRAND_PATTERN = re.compile(r"\bExampleCompany\b", re.IGNORECASE)
+QUOTE_PATTERN = re.compile(r"[\"“”]")
+
+
+def check_section(section: str, bullets: List[str]) -> List[str]:
+    """Returns the rule violations for one section's bullet points."""
+    violations = []
+
+    if not bullets:
+        violations.append("has no bullet points")
+    elif len(bullets) > RULE_MAX_BULLETS:
+        violations.append(f"has {len(bullets)} bullet points (maximum {RULE_MAX_BULLETS})")
+
+    for index, bullet in enumerate(bullets, start=1):
+        word_count = len(bullet.split())
+        if not RULE_MIN_WORDS <= word_count <= RULE_MAX_WORDS:
+            violations.append(f"bullet {index} has {word_count} words (expected {RULE_MIN_WORDS}-{RULE_MAX_WORDS})")
+
+        if QUOTE_PATTERN.search(bullet):
+            violations.append(f"bullet {index} uses quotes")
+
+        if section != BRAND_SECTION and BRAND_PATTERN.search(bullet):
+            violations.append(f"bullet {index} mentions ExampleCompany outside its own section")
+        elif section == BRAND_SECTION and BRAND_PATTERN.match(bullet.lstrip()):
+            violations.append(f"bullet {index} starts with ExampleCompany")
+
+    return violations
+
+
+def check_output(output: Dict[str, Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """Checks every section of an analysis output and returns only the sections that fail, with their violations."""
+    failing_sections = {}
+    for section in SECTION_NAMES:
+        bullets = (output.get(section) or {}).get("bullet_points") or []
+        violations = check_section(section, bullets)
+        if violations:
+            failing_sections[section] = violations
+    return failing_sections
@@ -1,20 +1,52 @@
+# Built in modules
+import json
+import time
+import asyncio
+from uuid import uuid4
+
 # FastAPI and Dependencies
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, PlainTextResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
 
 # API Models
-from app.core.models import LinkRequest
+from app.core.models import LinkRequest, BatchLinkRequest, BatchResponse
 
 # Exception Handler Decorator
-from app.core.errors import exception_handler
+from app.core.errors import exception_handler, handle_exceptions, JobNotReadyError
+
+# AI Result Cache & Validation Stats
+from app.ai.cache import result_cache
+from app.ai.ai import get_validation_stats
+from app.ai.registry import prompt_registry
+from app.ai.router import set_tenant, tenant_budgets
+
+# Logging correlation
+from app.logger import set_request_id
+
+# Metrics
+from app.core.config import TIMING_HEADER_ENABLED, SHUTDOWN_GRACE_SECONDS
+from app.metrics import metrics, span, start_request_timings, format_server_timing
+
+# Pipeline
+from app.pipeline import run_pipeline, run_batch, stream_pipeline
+
+# Background Jobs
+from app.jobs import job_manager, JOB_DONE, JOB_FAILED
+
+# Shared LLM concurrency
+from app.core.limits import llm_concurrency
+
+# Analysis Exports
+from app.core.config import EXPORT_FORMAT
+from app.export import analysis_exporter
 
-# AI Processing
-from app.ai.ai import process_transcript, validate_transcript
+# Startup Warm-Up
+from app.warmup import warm_up_state, start_warm_up
 
 # Utilities
-from app.utils import fetch_transcript, save_output_to_file, save_transcript_to_file, clean_up_logger, format_analyst_output
+from app.utils import clean_up_logger, format_analyst_output, close_http_client
 
 # Jinja2 Templates Setup
 templates = Jinja2Templates(directory="templates")
@@ -22,11 +54,72 @@ templates = Jinja2Templates(directory="templates")
 # FastAPI App with lifespan for cleanup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # LLM clients and the tokenizer are warmed in the background; /ready reports when they are
+    warm_up_task = start_warm_up()
+    await job_manager.start()
     yield
+    if warm_up_task is not None and not warm_up_task.done():
+        await warm_up_task
+    # Running jobs get the same grace period as in-flight requests before they are cancelled
+    await job_manager.stop(SHUTDOWN_GRACE_SECONDS)
+    await close_http_client()
     clean_up_logger()
 
 app = FastAPI(lifespan=lifespan)
 
+
+# Per-request ID and timing: latency histogram plus an optional Server-Timing header with the span breakdown
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    # Correlate log lines of this request, reusing the caller's ID when one is sent
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
+    set_request_id(request_id)
+    set_tenant(request.headers.get("X-Tenant-ID") or "default")
+
+    timings = start_request_timings()
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+
+    route = request.scope.get("route")
+    metrics.observe(
+        "app_http_request_seconds",
+        elapsed,
+        method=request.method,
+        route=route.path if route is not None else "unmatched",
+        status=response.status_code,
+    )
+    response.headers["X-Request-ID"] = request_id
+    if TIMING_HEADER_ENABLED:
+        response.headers["Server-Timing"] = format_server_timing(timings, elapsed)
+    return response
+
+
+# Expose cache and validation counters at scrape time
+metrics.add_collector(lambda: [
+    ("app_llm_cache_lookups_total", "counter", {"result": "memory_hit"}, result_cache.stats()["memory_hits"]),
+    ("app_llm_cache_lookups_total", "counter", {"result": "disk_hit"}, result_cache.stats()["disk_hits"]),
+    ("app_llm_cache_lookups_total", "counter", {"result": "miss"}, result_cache.stats()["misses"]),
+    ("app_llm_cache_entries", "gauge", {}, result_cache.stats()["size"]),
+])
+metrics.add_collector(lambda: [
+    ("app_validation_total", "counter", {"outcome": outcome}, get_validation_stats()[outcome])
+    for outcome in ("skipped", "partial", "full")
+])
+metrics.add_collector(lambda: [
+    ("app_prompt_info", "gauge", {"prompt": name, "version": version}, 1)
+    for name, version in prompt_registry.versions().items()
+])
+metrics.add_collector(lambda: [
+    ("app_tenant_tokens_used", "gauge", {"tenant": tenant}, used)
+    for tenant, used in tenant_budgets.usage().items()
+])
+
+metrics.add_collector(lambda: [("app_ready", "gauge", {}, int(warm_up_state.ready))] + [
+    ("app_warm_up_seconds", "gauge", {"step": step}, seconds)
+    for step, seconds in warm_up_state.steps.items()
+])
+
 # Root route to show the form
 @app.get("/", response_class=HTMLResponse)
 def read_root(request: Request):
@@ -35,30 +128,161 @@ def read_root(request: Request):
 # POST Endpoint to Process and Validate Transcript
 @app.post("/process-transcript/", response_class=HTMLResponse)
 @exception_handler
-async def process_transcripts_endpoint(request: Request, link: str = Form(...)):
+async def process_transcripts_endpoint(request: Request, link: str = Form(...), refresh: bool = Form(False)):
     """
     POST request to process and validate meeting transcripts into bulleted value pyramid for NBM.
+    Set refresh to bypass the LLM result cache and the incremental update, forcing a full regeneration.
     """
-    # Fetch transcripts
-    meeting_id, transcript = fetch_transcript(link)
+    # Fetch, process and validate the transcript
+    meeting_id, validated_transcript = await run_pipeline(link, use_cache=not refresh)
+
+    with span("render"):
+        return templates.TemplateResponse(
+            "result.html",
+            {
+                "request": request,
+                "message": "Meeting transcript processed successfully.",
+                "meeting_id": meeting_id,
+                "transcripts": format_analyst_output(validated_transcript)
+            }
+        )
 
-    # Save transcripts to a JSON file
-    save_transcript_to_file(transcript, meeting_id)
 
-    # Process the transcript
-    processed_transcript = process_transcript(transcript)
+# Page that renders results as they stream in
+@app.get("/stream", response_class=HTMLResponse)
+def stream_page(request: Request, link: str, refresh: bool = False):
+    return templates.TemplateResponse("stream.html", {"request": request, "link": link, "refresh": refresh})
 
-    # Validate the processed transcript
-    validated_transcript = validate_transcript(processed_transcript)
 
-    save_output_to_file(validated_transcript, meeting_id)
+# GET Endpoint to Process and Validate Transcript as Server-Sent Events
+@app.get("/process-transcript/stream")
+@exception_handler
+async def process_transcript_stream_endpoint(link: str, refresh: bool = False):
+    """
+    GET request streaming progress events (fetched, phase_one_partial, phase_one, validated) as SSE.
+    Errors are sent as an error event since the response has already started, except for a full
+    server, which is answered with a 503 up front.
+    """
+    llm_concurrency.check_capacity()
+
+    async def event_stream():
+        try:
+            async for event, payload in stream_pipeline(link, use_cache=not refresh):
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        except Exception as e:
+            http_exception = handle_exceptions(e)
+            yield f"event: error\ndata: {json.dumps({'status_code': http_exception.status_code, 'detail': http_exception.detail})}\n\n"
+        yield "event: done\ndata: {}\n\n"
 
-    return templates.TemplateResponse(
-        "result.html",
-        {
-            "request": request,
-            "message": "Meeting transcript processed successfully.",
-            "meeting_id": meeting_id,
-            "transcripts": format_analyst_output(validated_transcript)
-        }
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+
+
+# POST Endpoint to Process and Validate many Transcripts
+@app.post("/process-transcripts/batch", response_model=BatchResponse)
+@exception_handler
+async def process_transcripts_batch_endpoint(batch: BatchLinkRequest):
+    """
+    POST request to process and validate many meeting links concurrently.
+    Returns a result per link; failed links carry an error instead of aborting the batch.
+    """
+    return await run_batch(batch.links, use_cache=not batch.refresh)
+
+
+# POST Endpoint to submit a background Job
+@app.post("/jobs", status_code=202, response_class=JSONResponse)
+@exception_handler
+async def submit_job_endpoint(link: str = Form(...), refresh: bool = Form(False)):
+    """
+    POST request to queue a transcript for background processing. Returns the job ID immediately.
+    Submissions for a meeting that already has a queued or running job share that job.
+    """
+    job = await job_manager.submit(link, use_cache=not refresh)
+    return {"job_id": job["id"], "meeting_id": job["meeting_id"], "status": job["status"]}
+
+
+# GET Endpoint for Job status
+@app.get("/jobs/{job_id}", response_class=JSONResponse)
+@exception_handler
+async def job_status_endpoint(job_id: str):
+    """
+    GET request returning the job status, plus its output or error once finished.
+    """
+    job = await job_manager.get(job_id)
+    return {key: job[key] for key in ("id", "meeting_id", "link", "status", "result", "error", "created_at", "updated_at")}
+
+
+# GET Endpoint rendering a finished Job
+@app.get("/jobs/{job_id}/result", response_class=HTMLResponse)
+@exception_handler
+async def job_result_endpoint(request: Request, job_id: str):
+    """
+    GET request rendering the result page for a finished job.
+    """
+    job = await job_manager.get(job_id)
+    if job["status"] == JOB_FAILED:
+        raise JobNotReadyError(f"Job {job_id} failed: {job['error']}")
+    if job["status"] != JOB_DONE:
+        raise JobNotReadyError(f"Job {job_id} is still {job['status']}.")
+
+    with span("render"):
+        return templates.TemplateResponse(
+            "result.html",
+            {
+                "request": request,
+                "message": "Meeting transcript processed successfully.",
+                "meeting_id": job["result"]["meeting_id"],
+                "transcripts": format_analyst_output(job["result"]["output"])
+            }
+        )
+
+
+# POST Endpoint to export stored analyses
+@app.post("/exports", response_class=JSONResponse)
+@exception_handler
+async def create_export_endpoint(format: str = Form(EXPORT_FORMAT), full: bool = Form(False)):
+    """
+    POST request writing the meetings analysed since the last export (or all of them with full)
+    to a Parquet, Arrow IPC or CSV file. Returns a summary whose file is null when there was nothing new.
+    """
+    return await asyncio.to_thread(analysis_exporter.export, format, not full)
+
+
+# GET Endpoint listing exports
+@app.get("/exports", response_class=JSONResponse)
+async def list_exports_endpoint():
+    return (await asyncio.to_thread(analysis_exporter.read_state))["exports"]
+
+
+# GET Endpoint to download an export file
+@app.get("/exports/{name}")
+@exception_handler
+async def download_export_endpoint(name: str):
+    return FileResponse(analysis_exporter.path_for(name), filename=name)
+
+
+# Cache statistics
+@app.get("/cache/stats", response_class=JSONResponse)
+def cache_stats():
+    return result_cache.stats()
+
+
+# Validation statistics
+@app.get("/validation/stats", response_class=JSONResponse)
+def validation_stats():
+    return get_validation_stats()
+
+
+# Prometheus metrics
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# Readiness: 503 until the startup warm-up has finished, so traffic is only routed to warm instances
+@app.get("/ready", response_class=JSONResponse)
+def readiness():
+    return JSONResponse(warm_up_state.report(), status_code=200 if warm_up_state.ready else 503)
@@ -1,20 +1,146 @@
 # Env Variable modules
 from dotenv import load_dotenv
+import json
 import os
 
-# Default LLM
-from llama_index.llms.openai import OpenAI
-
 # Load Env variables
 load_dotenv()
 
 # OpenAI API key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Set LLM
-LLM_4o = OpenAI(model="gpt-4o")
+# Default LLM model. The client itself is built on first use (see __getattr__ below),
+# since importing llama_index dominates the API's cold start
+DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o")
 
 # Transcript Handling Variables
-BASE_URL_TEMPLATE = "https://app.circleback.ai/api/meeting/view/{meeting_id}/transcript"
+BASE_URL_TEMPLATE = os.getenv("CIRCLEBACK_URL_TEMPLATE", "https://app.circleback.ai/api/meeting/view/{meeting_id}/transcript")
 TRANSCRIPT_FILE_PATH = "meetings"
 
+# HTTP Client Variables
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Record every CircleBack and OpenAI exchange as replayable fixtures under this directory (empty disables)
+HTTP_RECORD_DIR = os.getenv("HTTP_RECORD_DIR", "")
+
+# Transcript Fetcher Variables
+FETCH_MAX_RETRIES = int(os.getenv("FETCH_MAX_RETRIES", "3"))
+FETCH_BACKOFF_BASE_SECONDS = float(os.getenv("FETCH_BACKOFF_BASE_SECONDS", "0.5"))
+FETCH_BACKOFF_MAX_SECONDS = float(os.getenv("FETCH_BACKOFF_MAX_SECONDS", "8"))
+FETCH_PAGE_CONCURRENCY = int(os.getenv("FETCH_PAGE_CONCURRENCY", "4"))
+
+
+# Result Cache Variables
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_DISK_ENABLED = os.getenv("CACHE_DISK_ENABLED", "false").lower() == "true"
+CACHE_DIR = os.path.join(TRANSCRIPT_FILE_PATH, "_cache")
+
+# Batch & Rate Limit Variables
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_LINKS = int(os.getenv("BATCH_MAX_LINKS", "500"))
+HOST_RATE_LIMIT_PER_SECOND = float(os.getenv("HOST_RATE_LIMIT_PER_SECOND", "5"))
+HOST_RATE_LIMIT_BURST = int(os.getenv("HOST_RATE_LIMIT_BURST", "5"))
+MODEL_RATE_LIMIT_PER_MINUTE = float(os.getenv("MODEL_RATE_LIMIT_PER_MINUTE", "300"))
+MODEL_RATE_LIMIT_BURST = int(os.getenv("MODEL_RATE_LIMIT_BURST", "10"))
+
+# Background Job Variables
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(TRANSCRIPT_FILE_PATH, "jobs.db"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))
+
+# Meeting store (transcripts and outputs)
+MEETING_DB_PATH = os.getenv("MEETING_DB_PATH", os.path.join(TRANSCRIPT_FILE_PATH, "meetings.db"))
+
+# Export Variables (columnar exports of stored analyses; parquet and arrow need pyarrow, csv is written as csv.gz)
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(TRANSCRIPT_FILE_PATH, "_exports"))
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "parquet").lower()
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# Single-Flight Variables (coalesce concurrent runs for the same meeting, across worker processes via lock files)
+SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+SINGLEFLIGHT_LOCK_DIR = os.getenv("SINGLEFLIGHT_LOCK_DIR", os.path.join(TRANSCRIPT_FILE_PATH, "_locks"))
+SINGLEFLIGHT_LOCK_SLOTS = int(os.getenv("SINGLEFLIGHT_LOCK_SLOTS", "1024"))
+SINGLEFLIGHT_WAIT_SECONDS = float(os.getenv("SINGLEFLIGHT_WAIT_SECONDS", "600"))
+SINGLEFLIGHT_POLL_SECONDS = float(os.getenv("SINGLEFLIGHT_POLL_SECONDS", "0.05"))
+
+# Few-Shot Example Variables (0 examples disables retrieval and index maintenance)
+FEW_SHOT_EXAMPLES = int(os.getenv("FEW_SHOT_EXAMPLES", "0"))
+FEW_SHOT_MIN_SIMILARITY = float(os.getenv("FEW_SHOT_MIN_SIMILARITY", "0.2"))
+EXAMPLE_EMBEDDING_BACKEND = os.getenv("EXAMPLE_EMBEDDING_BACKEND", "hashing").lower()
+EXAMPLE_EMBEDDING_DIM = int(os.getenv("EXAMPLE_EMBEDDING_DIM", "512"))
+EXAMPLE_EMBEDDING_MODEL = os.getenv("EXAMPLE_EMBEDDING_MODEL", "text-embedding-3-small")
+EXAMPLE_INDEX_DIR = os.getenv("EXAMPLE_INDEX_DIR", os.path.join(TRANSCRIPT_FILE_PATH, "_examples"))
+
+# Long Transcript Variables
+LONG_TRANSCRIPT_TOKEN_THRESHOLD = int(os.getenv("LONG_TRANSCRIPT_TOKEN_THRESHOLD", "60000"))
+LONG_TRANSCRIPT_CHUNK_TOKENS = int(os.getenv("LONG_TRANSCRIPT_CHUNK_TOKENS", "15000"))
+TOKENIZER_MODEL = os.getenv("TOKENIZER_MODEL", "gpt-4o")
+TRANSCRIPT_COMPACT_FORMAT = os.getenv("TRANSCRIPT_COMPACT_FORMAT", "false").lower() == "true"
+
+# Incremental Re-Analysis Variables: a re-run whose transcript changed by at most this fraction of
+# segments (and this many tokens) updates the stored analysis instead of reprocessing everything
+INCREMENTAL_ENABLED = os.getenv("INCREMENTAL_ENABLED", "true").lower() == "true"
+INCREMENTAL_MAX_CHANGE_RATIO = float(os.getenv("INCREMENTAL_MAX_CHANGE_RATIO", "0.25"))
+INCREMENTAL_MAX_CHANGED_TOKENS = int(os.getenv("INCREMENTAL_MAX_CHANGED_TOKENS", "8000"))
+
+# Validation Rule Variables
+VALIDATION_RULES_ENABLED = os.getenv("VALIDATION_RULES_ENABLED", "true").lower() == "true"
+RULE_MAX_BULLETS = int(os.getenv("RULE_MAX_BULLETS", "4"))
+RULE_MIN_WORDS = int(os.getenv("RULE_MIN_WORDS", "12"))
+RULE_MAX_WORDS = int(os.getenv("RULE_MAX_WORDS", "15"))
+
+# Metrics Variables
+TIMING_HEADER_ENABLED = os.getenv("TIMING_HEADER_ENABLED", "false").lower() == "true"
+MODEL_PRICES_PER_MILLION_TOKENS = {
+    model: tuple(prices)
+    for model, prices in json.loads(os.getenv(
+        "MODEL_PRICES_PER_MILLION_TOKENS",
+        '{"gpt-4o": [2.5, 10.0], "gpt-4o-mini": [0.15, 0.6]}',
+    )).items()
+}
+
+# Model Routing Variables
+# Per phase (transcript, reduce, validation): primary model, an optional cheaper model for
+# prompts up to short_max_tokens, and fallbacks tried in order on errors or timeouts
+MODEL_ROUTING_POLICY = json.loads(os.getenv(
+    "MODEL_ROUTING_POLICY",
+    json.dumps({"default": {"model": DEFAULT_LLM_MODEL, "fallbacks": ["gpt-4o-mini"]}}),
+))
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "120"))
+
+# Token Budget Variables (0 disables the budget)
+REQUEST_TOKEN_BUDGET = int(os.getenv("REQUEST_TOKEN_BUDGET", "0"))
+TENANT_TOKEN_BUDGET = int(os.getenv("TENANT_TOKEN_BUDGET", "0"))
+TENANT_BUDGET_WINDOW_SECONDS = float(os.getenv("TENANT_BUDGET_WINDOW_SECONDS", str(24 * 3600)))
+
+# Startup Variables (warm the LLM clients, tokenizer and stores in the background at startup)
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "true").lower() == "true"
+
+# Serving Variables (python -m app.serve). WEB_CONCURRENCY is also what uvicorn reads for --workers
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+SERVE_HOST = os.getenv("SERVE_HOST", "0.0.0.0")
+SERVE_PORT = int(os.getenv("SERVE_PORT", "80"))
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+
+# Shared LLM Concurrency Variables (in-flight LLM calls across all worker processes; 0 disables the limit).
+# Up to LLM_MAX_WAITING further pipeline runs are admitted to wait for a slot; beyond that requests get a 503
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "0"))
+LLM_MAX_WAITING = int(os.getenv("LLM_MAX_WAITING", "32"))
+LLM_QUEUE_WAIT_SECONDS = float(os.getenv("LLM_QUEUE_WAIT_SECONDS", "30"))
+LLM_QUEUE_POLL_SECONDS = float(os.getenv("LLM_QUEUE_POLL_SECONDS", "0.05"))
+LLM_SLOT_DIR = os.getenv("LLM_SLOT_DIR", os.path.join(TRANSCRIPT_FILE_PATH, "_slots"))
+OVERLOAD_RETRY_AFTER_SECONDS = float(os.getenv("OVERLOAD_RETRY_AFTER_SECONDS", "5"))
+
+
+def __getattr__(name: str):
+    """Builds the default LLM (LLM_4o) lazily on first access."""
+    if name == "LLM_4o":
+        from app.ai.router import get_llm
+        return get_llm(DEFAULT_LLM_MODEL)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,5 @@
 # Built in modules
+import math
 from typing import Union
 from functools import wraps
 
@@ -35,6 +36,44 @@ class LLMInteractionError(Exception):
     pass
 
 
+class InvalidBatchError(Exception):
+    """Custom exception raised when a batch request is rejected."""
+    pass
+
+
+class JobNotFoundError(Exception):
+    """Custom exception raised when a job ID is unknown."""
+    pass
+
+
+class JobNotReadyError(Exception):
+    """Custom exception raised when a job result is requested before the job has finished."""
+    pass
+
+
+class TokenBudgetExceededError(Exception):
+    """Custom exception raised when an LLM call would exceed the request or tenant token budget."""
+    pass
+
+
+class InvalidExportError(Exception):
+    """Custom exception raised when an export is requested in an unknown format."""
+    pass
+
+
+class ExportNotFoundError(Exception):
+    """Custom exception raised when an export file is unknown."""
+    pass
+
+
+class ServerOverloadedError(Exception):
+    """Custom exception raised when the shared LLM capacity is exhausted; clients should retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 # Utility to map exceptions to HTTP responses
 def handle_exceptions(exc: Exception) -> Union[HTTPException, None]:
     """Maps exceptions to appropriate HTTP responses."""
@@ -42,6 +81,33 @@ def handle_exceptions(exc: Exception) -> Union[HTTPException, None]:
         logger.error(f"Invalid link: {str(exc)}")
         return HTTPException(status_code=400, detail=str(exc))
 
+    elif isinstance(exc, InvalidBatchError):
+        logger.error(f"Invalid batch: {str(exc)}")
+        return HTTPException(status_code=400, detail=str(exc))
+
+    elif isinstance(exc, JobNotFoundError):
+        logger.error(f"Job not found: {str(exc)}")
+        return HTTPException(status_code=404, detail=str(exc))
+
+    elif isinstance(exc, InvalidExportError):
+        logger.error(f"Invalid export: {str(exc)}")
+        return HTTPException(status_code=400, detail=str(exc))
+
+    elif isinstance(exc, ExportNotFoundError):
+        logger.error(f"Export not found: {str(exc)}")
+        return HTTPException(status_code=404, detail=str(exc))
+
+    elif isinstance(exc, JobNotReadyError):
+        return HTTPException(status_code=409, detail=str(exc))
+
+    elif isinstance(exc, TokenBudgetExceededError):
+        logger.warning(f"Token budget exceeded: {str(exc)}")
+        return HTTPException(status_code=429, detail=str(exc))
+
+    elif isinstance(exc, ServerOverloadedError):
+        logger.warning(f"Server overloaded: {str(exc)}")
+        return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": str(math.ceil(exc.retry_after))})
+
     elif isinstance(exc, TranscriptFetchError):
         logger.error(f"Error fetching transcript: {str(exc)}")
         return HTTPException(status_code=502, detail=str(exc))
@@ -0,0 +1,198 @@
+# Built in modules
+import os
+import time
+import random
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+# fcntl is POSIX only; without it the shared LLM concurrency limit is off
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Config
+from app.core.config import (
+    HOST_RATE_LIMIT_PER_SECOND,
+    HOST_RATE_LIMIT_BURST,
+    MODEL_RATE_LIMIT_PER_MINUTE,
+    MODEL_RATE_LIMIT_BURST,
+    WEB_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_WAITING,
+    LLM_QUEUE_WAIT_SECONDS,
+    LLM_QUEUE_POLL_SECONDS,
+    LLM_SLOT_DIR,
+    OVERLOAD_RETRY_AFTER_SECONDS,
+)
+
+# Errors
+from app.core.errors import ServerOverloadedError
+
+# Metrics
+from app.metrics import metrics
+
+# -----------------------------------------------------------------------------
+# Rate Limiters
+# -----------------------------------------------------------------------------
+
+
+class AsyncRateLimiter:
+    """Token-bucket rate limiter for coroutines. A rate of zero disables limiting."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it."""
+        if self.rate_per_second <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+
+class KeyedRateLimiter:
+    """Keeps one token bucket per key (e.g. per host or per model), created on first use."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._limiters: Dict[str, AsyncRateLimiter] = {}
+
+    async def acquire(self, key: str) -> None:
+        """Waits for a token from the bucket belonging to the given key."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = AsyncRateLimiter(self.rate_per_second, self.burst)
+        await limiter.acquire()
+
+
+# Initialize the limiters globally. Buckets live in each worker process, so the configured rates are split between them
+host_rate_limiter = KeyedRateLimiter(HOST_RATE_LIMIT_PER_SECOND / WEB_CONCURRENCY, HOST_RATE_LIMIT_BURST)
+model_rate_limiter = KeyedRateLimiter(MODEL_RATE_LIMIT_PER_MINUTE / 60 / WEB_CONCURRENCY, MODEL_RATE_LIMIT_BURST)
+
+# -----------------------------------------------------------------------------
+# Shared Concurrency Limit
+# -----------------------------------------------------------------------------
+
+
+class FileSlots:
+    """
+    A fixed set of slot files; holding an flock() on one is holding that slot. Every worker process
+    on the host sees the same slots, and the kernel frees a slot when its holder dies.
+    """
+
+    def __init__(self, directory: str, name: str, count: int):
+        self.paths = [os.path.join(directory, f"{name}-{index:04d}.lock") for index in range(count)]
+        self.directory = directory
+
+    def try_acquire(self) -> Optional[int]:
+        """Locks a free slot and returns its file descriptor, or None when every slot is held."""
+        os.makedirs(self.directory, exist_ok=True)
+        # Start at a random slot so concurrent callers do not all probe the same files first
+        start = random.randrange(len(self.paths)) if self.paths else 0
+        for path in self.paths[start:] + self.paths[:start]:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    @staticmethod
+    def release(fd: int) -> None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class SharedConcurrencyLimiter:
+    """
+    Caps in-flight LLM calls across all worker processes. Pipeline runs are admitted up to
+    `limit + max_waiting` at a time and turned away with ServerOverloadedError beyond that, before
+    any work is done; admitted runs wait for an LLM slot, for at most wait_seconds. Clients are
+    told when to retry instead of timing out. A limit of zero disables limiting.
+    """
+
+    def __init__(self, directory: str, limit: int, max_waiting: int, wait_seconds: float, poll_seconds: float, retry_after: float):
+        self.enabled = limit > 0 and fcntl is not None
+        self.running = FileSlots(directory, "running", max(0, limit))
+        self.admitted = FileSlots(directory, "admitted", max(0, limit) + max(0, max_waiting))
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self.retry_after = retry_after
+
+    def check_capacity(self) -> None:
+        """Raises ServerOverloadedError when no further run would be admitted right now, without reserving anything."""
+        if not self.enabled:
+            return
+        fd = self.admitted.try_acquire()
+        if fd is None:
+            metrics.inc("app_llm_overload_total", reason="admission")
+            raise ServerOverloadedError("The server is at capacity; retry later.", self.retry_after)
+        self.admitted.release(fd)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Holds an admission for a pipeline run, raising ServerOverloadedError right away when none is free."""
+        if not self.enabled:
+            yield
+            return
+
+        fd = self.admitted.try_acquire()
+        if fd is None:
+            metrics.inc("app_llm_overload_total", reason="admission")
+            raise ServerOverloadedError("The server is at capacity; retry later.", self.retry_after)
+        try:
+            yield
+        finally:
+            self.admitted.release(fd)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Holds one LLM slot for the duration of the block, polling for a free one for up to wait_seconds."""
+        if not self.enabled:
+            yield
+            return
+
+        fd = self.running.try_acquire()
+        if fd is None:
+            fd = await self._wait_for_slot()
+        try:
+            yield
+        finally:
+            self.running.release(fd)
+
+    async def _wait_for_slot(self) -> int:
+        started = time.monotonic()
+        while time.monotonic() - started < self.wait_seconds:
+            await asyncio.sleep(self.poll_seconds)
+            fd = self.running.try_acquire()
+            if fd is not None:
+                metrics.observe("app_llm_queue_wait_seconds", time.monotonic() - started)
+                return fd
+        metrics.inc("app_llm_overload_total", reason="queue_timeout")
+        raise ServerOverloadedError(f"No LLM capacity freed up within {self.wait_seconds:.0f}s; retry later.", self.retry_after)
+
+
+# Initialize the shared LLM concurrency limiter globally
+llm_concurrency = SharedConcurrencyLimiter(
+    LLM_SLOT_DIR, LLM_MAX_CONCURRENCY, LLM_MAX_WAITING, LLM_QUEUE_WAIT_SECONDS, LLM_QUEUE_POLL_SECONDS, OVERLOAD_RETRY_AFTER_SECONDS
+)
@@ -1,4 +1,21 @@
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 
 class LinkRequest(BaseModel):
     link: str
+
+class BatchLinkRequest(BaseModel):
+    links: List[str] = Field(..., min_length=1)
+    refresh: bool = False
+
+class LinkResult(LinkRequest):
+    status: str
+    meeting_id: Optional[str] = None
+    output: Optional[Dict[str, Dict[str, List[str]]]] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[LinkResult]
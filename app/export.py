@@ -0,0 +1,282 @@
+# Built in modules
+import os
+import csv
+import sys
+import gzip
+import json
+import time
+import argparse
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# pyarrow is in requirements.txt; an install without it still exports CSV
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# fcntl is POSIX only; without it exports are only serialised within a process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import EXPORT_DIR, EXPORT_FORMAT, EXPORT_BATCH_SIZE, MEETING_DB_PATH
+
+# Errors
+from app.core.errors import InvalidExportError, ExportNotFoundError
+
+# Meeting store
+from app.store import MeetingStore, meeting_store
+
+# -----------------------------------------------------------------------------
+# Rows
+# -----------------------------------------------------------------------------
+
+
+# One row per bullet point, with the meeting's metadata repeated (cheap once compressed)
+EXPORT_COLUMNS = (
+    "meeting_id",
+    "created_at",
+    "analysed_at",
+    "transcript_hash",
+    "segment_count",
+    "section",
+    "position",
+    "bullet",
+)
+
+EXPORT_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv.gz"}
+
+
+def to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+
+
+def output_rows(metadata: Dict, output: Dict) -> Iterator[Dict]:
+    """Flattens one meeting's analysis into bullet rows."""
+    meeting = {
+        "meeting_id": metadata["meeting_id"],
+        "created_at": to_datetime(metadata["created_at"]),
+        "analysed_at": to_datetime(metadata["analysed_at"]),
+        "transcript_hash": metadata["transcript_hash"],
+        "segment_count": metadata["segment_count"],
+    }
+    for section, content in output.items():
+        for position, bullet in enumerate((content or {}).get("bullet_points") or []):
+            yield {**meeting, "section": section, "position": position, "bullet": bullet}
+
+# -----------------------------------------------------------------------------
+# Writers
+# -----------------------------------------------------------------------------
+
+
+class CsvExportWriter:
+    """Gzip-compressed CSV, written row batch by row batch."""
+
+    def __init__(self, path: str):
+        self._file = gzip.open(path, "wt", compresslevel=6, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows: List[Dict]) -> None:
+        # Timestamps repeat on every bullet of a meeting, so each is formatted once per batch
+        stamps: Dict[datetime, str] = {}
+
+        def stamp(value: Optional[datetime]) -> Optional[str]:
+            if value is None:
+                return None
+            if value not in stamps:
+                stamps[value] = value.isoformat()
+            return stamps[value]
+
+        self._writer.writerows(
+            (
+                row["meeting_id"], stamp(row["created_at"]), stamp(row["analysed_at"]), row["transcript_hash"],
+                row["segment_count"], row["section"], row["position"], row["bullet"],
+            )
+            for row in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ArrowExportWriter:
+    """Zstd-compressed Parquet or Arrow IPC file, written as one row group (record batch) per chunk."""
+
+    def __init__(self, path: str, file_format: str):
+        self.schema = pa.schema([
+            ("meeting_id", pa.string()),
+            ("created_at", pa.timestamp("ms", tz="UTC")),
+            ("analysed_at", pa.timestamp("ms", tz="UTC")),
+            ("transcript_hash", pa.string()),
+            ("segment_count", pa.int32()),
+            ("section", pa.string()),
+            ("position", pa.int16()),
+            ("bullet", pa.string()),
+        ])
+        if file_format == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._writer = pa_ipc.new_file(path, self.schema, options=pa_ipc.IpcWriteOptions(compression="zstd"))
+
+    def write(self, rows: List[Dict]) -> None:
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def resolve_format(file_format: str) -> str:
+    """Returns the format to write, falling back to CSV when pyarrow is not installed."""
+    if file_format not in EXPORT_EXTENSIONS:
+        raise InvalidExportError(f"Unknown export format {file_format!r}; expected one of {', '.join(EXPORT_EXTENSIONS)}")
+    if file_format != "csv" and pa is None:
+        logger.warning(f"pyarrow is not installed; exporting CSV instead of {file_format}")
+        return "csv"
+    return file_format
+
+# -----------------------------------------------------------------------------
+# Export
+# -----------------------------------------------------------------------------
+
+
+class AnalysisExporter:
+    """
+    Streams stored analyses into one export file per run under `directory`, in chunks of
+    batch_size meetings so memory stays flat however large the store is. Incremental runs only
+    export meetings analysed since the previous run (re-analysed meetings are exported again, so
+    readers keep the row with the latest analysed_at per meeting). The position reached is kept
+    in _state.json and only advanced once the file is complete.
+    """
+
+    def __init__(self, store: MeetingStore, directory: str, batch_size: int = EXPORT_BATCH_SIZE):
+        self.store = store
+        self.directory = directory
+        self.batch_size = max(1, batch_size)
+        self.state_path = os.path.join(directory, "_state.json")
+        self._thread_lock = threading.Lock()
+
+    def path_for(self, name: str) -> str:
+        """Returns the path of a finished export file, raising ExportNotFoundError for anything else."""
+        path = os.path.join(self.directory, os.path.basename(name))
+        if os.path.basename(name) != name or name.startswith(("_", ".")) or name.endswith(".tmp") or not os.path.isfile(path):
+            raise ExportNotFoundError(f"No export found with name {name}.")
+        return path
+
+    def read_state(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {"cursor": [0.0, ""], "exports": []}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self, state: Dict) -> None:
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def _lock(self) -> Optional[int]:
+        """Serialises exports across worker processes, since they share the state file."""
+        if fcntl is None:
+            return None
+        fd = os.open(os.path.join(self.directory, ".export.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _chunks(self, cursor: Tuple[float, str]) -> Iterator[Tuple[List[Dict], int, Tuple[float, str]]]:
+        """Yields (rows, meetings, cursor after them) per batch of meetings."""
+        rows: List[Dict] = []
+        meetings = 0
+        for metadata, output in self.store.iter_analysed_since(cursor, self.batch_size):
+            rows.extend(output_rows(metadata, output))
+            meetings += 1
+            cursor = (metadata["analysed_at"], metadata["meeting_id"])
+            if meetings == self.batch_size:
+                yield rows, meetings, cursor
+                rows, meetings = [], 0
+        if meetings:
+            yield rows, meetings, cursor
+
+    def export(self, file_format: str = EXPORT_FORMAT, incremental: bool = True) -> Dict:
+        """Writes the next export file and returns a summary; `file` is None when there was nothing new."""
+        file_format = resolve_format(file_format)
+        os.makedirs(self.directory, exist_ok=True)
+        with self._thread_lock:
+            lock_fd = self._lock()
+            try:
+                return self._export(file_format, incremental)
+            finally:
+                if lock_fd is not None:
+                    os.close(lock_fd)
+
+    def _export(self, file_format: str, incremental: bool) -> Dict:
+        started = time.perf_counter()
+        state = self.read_state()
+        cursor = tuple(state["cursor"]) if incremental else (0.0, "")
+        name = f"analyses_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}{'' if incremental else '_full'}.{EXPORT_EXTENSIONS[file_format]}"
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.tmp"
+
+        writer = None
+        meetings = rows = 0
+        try:
+            for chunk, chunk_meetings, cursor in self._chunks(cursor):
+                if writer is None:
+                    writer = CsvExportWriter(temp_path) if file_format == "csv" else ArrowExportWriter(temp_path, file_format)
+                if chunk:
+                    writer.write(chunk)
+                meetings += chunk_meetings
+                rows += len(chunk)
+            if writer is not None:
+                writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                os.remove(temp_path)
+            raise
+
+        if writer is None:
+            logger.info("Export skipped: no meetings analysed since the last export")
+            return {"file": None, "format": file_format, "meetings": 0, "rows": 0, "seconds": time.perf_counter() - started}
+
+        # Publish the file before recording the new position, so a failed run is simply redone
+        os.replace(temp_path, path)
+        state["cursor"] = list(cursor)
+        state["exports"].append({"file": name, "format": file_format, "meetings": meetings, "rows": rows, "incremental": incremental, "exported_at": time.time()})
+        self._write_state(state)
+
+        summary = {"file": name, "format": file_format, "meetings": meetings, "rows": rows, "seconds": time.perf_counter() - started}
+        logger.info(f"Exported {meetings} meetings ({rows} rows) to {path} in {summary['seconds']:.2f}s")
+        return summary
+
+
+# Initialize the exporter for the meeting store globally
+analysis_exporter = AnalysisExporter(meeting_store, EXPORT_DIR)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored analyses to Parquet, Arrow IPC or CSV.")
+    parser.add_argument("--format", choices=list(EXPORT_EXTENSIONS), default=EXPORT_FORMAT)
+    parser.add_argument("--full", action="store_true", help="Export every meeting, not only those analysed since the last export.")
+    parser.add_argument("--db", default=MEETING_DB_PATH)
+    parser.add_argument("--dir", default=EXPORT_DIR)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"Meeting store {args.db} does not exist.")
+
+    summary = AnalysisExporter(MeetingStore(args.db), args.dir, args.batch_size).export(args.format, incremental=not args.full)
+    if summary["file"] is None:
+        print("Nothing to export: no meetings analysed since the last export.")
+    else:
+        print(f"Exported {summary['meetings']} meetings ({summary['rows']} rows) to {os.path.join(args.dir, summary['file'])} in {summary['seconds']:.1f}s")
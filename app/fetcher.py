@@ -0,0 +1,191 @@
+# Built in modules
+import json
+import random
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from uuid import uuid4
+from json import JSONDecodeError
+
+# Async HTTP client
+import httpx
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import (
+    BASE_URL_TEMPLATE,
+    FETCH_MAX_RETRIES,
+    FETCH_BACKOFF_BASE_SECONDS,
+    FETCH_BACKOFF_MAX_SECONDS,
+    FETCH_PAGE_CONCURRENCY,
+)
+
+# Errors
+from app.core.errors import TranscriptFetchError, TranscriptProcessingError
+
+# Rate limiting
+from app.core.limits import host_rate_limiter
+
+# Metrics
+from app.metrics import metrics, span
+
+# Utils
+from app.utils import extract_id, get_http_client
+
+# -----------------------------------------------------------------------------
+# Segment Parsing
+# -----------------------------------------------------------------------------
+
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def normalize_segment(segment: Dict) -> Dict:
+    """Turns one CircleBack segment into a transcript entry, keeping its ID for de-duplication."""
+    words = segment.get("words") or []
+    return {
+        "id": segment.get("id"),
+        "person": segment.get("speaker", "Unknown"),
+        "said": " ".join(
+            word["text"] if isinstance(word, dict) and isinstance(word.get("text"), str) else ""
+            for word in words
+        ),
+    }
+
+
+def parse_transcript_page(content: bytes) -> Dict:
+    """
+    Decodes one CircleBack transcript page and normalizes its segments right away,
+    so a page's raw word objects are dropped before the next page is parsed.
+    """
+    page = json.loads(content)
+    page["segments"] = [normalize_segment(segment) for segment in page.get("segments") or []]
+    return page
+
+# -----------------------------------------------------------------------------
+# Transcript Fetcher
+# -----------------------------------------------------------------------------
+
+
+class TranscriptFetcher:
+    """
+    Fetches CircleBack transcripts over the shared keep-alive client.
+    Retries 429/5xx responses and transport errors with exponential backoff,
+    and fetches the remaining pages of paginated transcripts concurrently.
+    """
+
+    def __init__(self, url_template: str, max_retries: int, backoff_base: float, backoff_max: float, page_concurrency: int):
+        self.url_template = url_template
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.page_concurrency = max(1, page_concurrency)
+
+    def _backoff_seconds(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Honours Retry-After when the server sends one, otherwise uses full-jitter exponential backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _get(self, url: str, params: Optional[Dict] = None) -> httpx.Response:
+        """GETs a URL, retrying retryable failures up to max_retries times."""
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            response = None
+            await host_rate_limiter.acquire(host)
+            try:
+                response = await get_http_client().get(url, params=params)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+            except (httpx.TimeoutException, httpx.TransportError):
+                if attempt == self.max_retries:
+                    raise
+
+            metrics.inc("app_fetch_retries_total", reason=str(response.status_code) if response is not None else "transport")
+            delay = self._backoff_seconds(attempt, response)
+            logger.warning(f"Retrying transcript fetch ({attempt + 1}/{self.max_retries}) in {delay:.2f}s: {url}")
+            await asyncio.sleep(delay)
+
+    async def _get_page(self, url: str, page: Optional[int] = None) -> Dict:
+        response = await self._get(url, params={"page": page} if page is not None else None)
+        return parse_transcript_page(response.content)
+
+    async def _get_pages(self, url: str) -> Tuple[Dict, List[Dict]]:
+        """Fetches the first page, then any remaining pages concurrently. Returns the first page and all pages."""
+        first_page = await self._get_page(url)
+        pages = [first_page]
+
+        # Pages after the first are independent, so fetch them concurrently
+        total_pages = int(first_page.get("totalPages") or 1)
+        if total_pages > 1:
+            semaphore = asyncio.Semaphore(self.page_concurrency)
+
+            async def get_page(page: int) -> Dict:
+                async with semaphore:
+                    return await self._get_page(url, page)
+
+            pages += await asyncio.gather(*(get_page(page) for page in range(2, total_pages + 1)))
+
+        return first_page, pages
+
+    async def fetch(self, link: str) -> Tuple[str, List]:
+        """
+        Fetches and concatenates transcripts by unique segment ID across paginated API responses.
+        Returns the meeting ID and transcripts as a list.
+        """
+        with span("extract_id"):
+            meeting_id = extract_id(link)
+        url = self.url_template.format(meeting_id=meeting_id)
+
+        try:
+            with span("fetch"):
+                first_page, pages = await self._get_pages(url)
+        except httpx.TimeoutException:
+            raise TranscriptFetchError("The request timed out. Please try again later.")
+        except httpx.HTTPStatusError as e:
+            raise TranscriptFetchError(f"HTTP error occurred: {e}")
+        except JSONDecodeError:
+            raise TranscriptProcessingError("Failed to parse the JSON response from the API.")
+        except Exception as e:
+            raise TranscriptFetchError(f"An error occurred while fetching transcripts: {e}")
+
+        meeting_id = first_page.get("meetingId", str(uuid4()))
+
+        # Concatenate pages in order, keeping the first occurrence of each segment ID
+        transcripts, seen_ids = [], set()
+        for page in pages:
+            for segment in page.get("segments") or []:
+                segment_id = segment.pop("id", None)
+                if segment_id is not None:
+                    if segment_id in seen_ids:
+                        continue
+                    seen_ids.add(segment_id)
+                transcripts.append(segment)
+
+        if not transcripts:
+            raise TranscriptProcessingError("No segments found in the transcript data.")
+
+        logger.info(f"Fetched {len(transcripts)} segments across {len(pages)} page(s) for meeting {meeting_id}")
+        return str(meeting_id), transcripts
+
+
+# Initialize the fetcher globally
+transcript_fetcher = TranscriptFetcher(
+    url_template=BASE_URL_TEMPLATE,
+    max_retries=FETCH_MAX_RETRIES,
+    backoff_base=FETCH_BACKOFF_BASE_SECONDS,
+    backoff_max=FETCH_BACKOFF_MAX_SECONDS,
+    page_concurrency=FETCH_PAGE_CONCURRENCY,
+)
+
+
+async def fetch_transcript(link: str) -> Tuple[str, List]:
+    """Fetches a meeting transcript with the global fetcher. Returns the meeting ID and transcripts."""
+    return await transcript_fetcher.fetch(link)
@@ -0,0 +1,317 @@
+# Built in modules
+import os
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+from uuid import uuid4
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Logger
+from app.logger import logger, set_request_id
+
+# Tenant of the submitting request
+from app.ai.router import tenant_var, set_tenant
+
+# Config
+from app.core.config import JOB_DB_PATH, JOB_WORKERS, JOB_POLL_SECONDS, JOB_HEARTBEAT_SECONDS, JOB_STALE_SECONDS
+
+# Errors
+from app.core.errors import JobNotFoundError, ServerOverloadedError
+
+# Pipeline
+from app.pipeline import run_pipeline
+
+# Utils
+from app.utils import extract_id, ensure_directory_exists
+
+# -----------------------------------------------------------------------------
+# Job Store
+# -----------------------------------------------------------------------------
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobStore:
+    """
+    SQLite-backed job state so queued and finished jobs survive restarts. Methods are blocking.
+
+    Every server process takes work from the same table: a queued job is claimed for one owner
+    (a process) at a time, and owners heartbeat their running jobs so the jobs of a process that
+    died can be found and queued again by any other.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def initialize(self) -> None:
+        """Creates the database file and schema if they do not exist yet."""
+        ensure_directory_exists(os.path.dirname(self.db_path) or ".")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    meeting_id TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    use_cache INTEGER NOT NULL,
+                    tenant TEXT NOT NULL DEFAULT 'default',
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    heartbeat_at REAL,
+                    available_at REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_meeting_status ON jobs (meeting_id, status)")
+
+            # Databases created before jobs carried a tenant, or were claimed by owners
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "tenant" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN tenant TEXT NOT NULL DEFAULT 'default'")
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+                conn.execute("ALTER TABLE jobs ADD COLUMN available_at REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs (status, available_at, created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yields a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["use_cache"] = bool(job["use_cache"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create_or_get_active(self, meeting_id: str, link: str, use_cache: bool, tenant: str = "default") -> Tuple[Dict, bool]:
+        """
+        Returns the active job for a meeting, or creates a new queued job in the same transaction.
+        The boolean is True when a new job was created.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE meeting_id = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (meeting_id, *ACTIVE_JOB_STATUSES),
+            ).fetchone()
+            if row is not None:
+                return self._to_dict(row), False
+
+            now = time.time()
+            job_id = uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, meeting_id, link, use_cache, tenant, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, meeting_id, link, int(use_cache), tenant, JOB_QUEUED, now, now),
+            )
+            return self._to_dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()), True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def claim(self, owner: str) -> Optional[Dict]:
+        """Marks the oldest job that is due as running for `owner` and returns it, or None when there is none."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND available_at <= ? ORDER BY created_at LIMIT 1", (JOB_QUEUED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                (JOB_RUNNING, owner, now, now, row["id"]),
+            )
+            return self._to_dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def finish(self, job_id: str, owner: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> bool:
+        """Records the outcome of a claimed job. Returns False if the claim was lost (the job was recovered by another owner)."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, owner, JOB_RUNNING),
+            )
+        return cursor.rowcount > 0
+
+    def defer(self, job_id: str, owner: str, delay: float) -> None:
+        """Puts a claimed job back in the queue, due again after `delay` seconds."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, available_at = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (JOB_QUEUED, now + delay, now, job_id, owner, JOB_RUNNING),
+            )
+
+    def heartbeat(self, owner: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?", (time.time(), owner, JOB_RUNNING))
+
+    def release(self, owner: str) -> int:
+        """Queues the jobs still claimed by `owner` again (on shutdown) and returns how many there were."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE owner = ? AND status = ?",
+                (JOB_QUEUED, time.time(), owner, JOB_RUNNING),
+            )
+        return cursor.rowcount
+
+    def requeue_stale(self, stale_seconds: float) -> int:
+        """Queues running jobs whose owner has not sent a heartbeat for `stale_seconds` (its process is gone)."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (JOB_QUEUED, now, JOB_RUNNING, now - stale_seconds),
+            )
+        return cursor.rowcount
+
+# -----------------------------------------------------------------------------
+# Job Manager
+# -----------------------------------------------------------------------------
+
+
+class JobManager:
+    """
+    Runs submitted jobs on a pool of asyncio workers, deduplicating by meeting ID. Workers claim
+    jobs from the job store, so every server process sharing it takes a fair share, and jobs left
+    running by a process that died are queued again once its heartbeat is JOB_STALE_SECONDS old.
+    """
+
+    def __init__(self, store: JobStore, workers: int):
+        self.store = store
+        self.workers = max(1, workers)
+        self.owner = ""
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy: Set[asyncio.Task] = set()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Starts the worker pool, which also picks up jobs left over from a previous run."""
+        # A new owner per start: a restarted process never mistakes a previous claim for its own
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._wake = asyncio.Event()
+        self._stopping = False
+        await asyncio.to_thread(self.store.initialize)
+        recovered = await asyncio.to_thread(self.store.requeue_stale, JOB_STALE_SECONDS)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        logger.info(f"Job manager started with {self.workers} workers as {self.owner} ({recovered} stale jobs recovered)")
+
+    async def stop(self, grace_seconds: float = 0) -> None:
+        """
+        Stops taking jobs and gives the running ones up to grace_seconds to finish. Jobs still running
+        after that are cancelled and queued again, for this or another server process to pick up.
+        """
+        self._stopping = True
+        for task in self._tasks:
+            if task not in self._busy:
+                task.cancel()
+        if self._busy and grace_seconds > 0:
+            logger.info(f"Waiting up to {grace_seconds:.0f}s for {len(self._busy)} running jobs")
+            await asyncio.wait(self._tasks, timeout=grace_seconds)
+        for task in self._tasks + [self._heartbeat_task]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*self._tasks, *([self._heartbeat_task] if self._heartbeat_task else []), return_exceptions=True)
+        self._tasks, self._heartbeat_task = [], None
+        released = await asyncio.to_thread(self.store.release, self.owner)
+        if released:
+            logger.info(f"Re-queued {released} interrupted jobs")
+
+    async def submit(self, link: str, use_cache: bool = True) -> Dict:
+        """Queues a job for the link, or returns the job already active for the same meeting."""
+        meeting_id = extract_id(link)
+        job, created = await asyncio.to_thread(self.store.create_or_get_active, meeting_id, link, use_cache, tenant_var.get())
+        if created:
+            # Wake this process's idle workers; other processes find the job on their next poll
+            self._wake.set()
+        else:
+            logger.info(f"Meeting {meeting_id} already has active job {job['id']}; sharing it")
+        return job
+
+    async def get(self, job_id: str) -> Dict:
+        """Returns the job, raising JobNotFoundError for unknown IDs."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            raise JobNotFoundError(f"No job found with ID {job_id}.")
+        return job
+
+    async def _worker(self, worker_id: int) -> None:
+        task = asyncio.current_task()
+        while not self._stopping:
+            job = await asyncio.to_thread(self.store.claim, self.owner)
+            if job is None:
+                # Nothing due: wait for a local submission, or poll for jobs from other processes and deferred ones
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._busy.add(task)
+            try:
+                await self._run(job)
+            finally:
+                self._busy.discard(task)
+
+    async def _heartbeat(self) -> None:
+        """Keeps this process's claims alive and recovers the jobs of processes that stopped sending theirs."""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, self.owner)
+                recovered = await asyncio.to_thread(self.store.requeue_stale, JOB_STALE_SECONDS)
+                if recovered:
+                    logger.warning(f"Re-queued {recovered} jobs whose server process stopped responding")
+                    self._wake.set()
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    async def _run(self, job: Dict) -> None:
+        job_id = job["id"]
+        set_request_id(job_id)
+        set_tenant(job["tenant"])
+        logger.info(f"Job {job_id} started for meeting {job['meeting_id']}")
+        try:
+            meeting_id, output = await run_pipeline(job["link"], use_cache=job["use_cache"])
+            if await asyncio.to_thread(self.store.finish, job_id, self.owner, JOB_DONE, {"meeting_id": meeting_id, "output": output}):
+                logger.info(f"Job {job_id} completed for meeting {meeting_id}")
+            else:
+                logger.warning(f"Job {job_id} completed after it was recovered by another server process")
+        except ServerOverloadedError as e:
+            # Background jobs wait for capacity instead of failing
+            logger.warning(f"Job {job_id} deferred for {e.retry_after:.0f}s: {e}")
+            await asyncio.to_thread(self.store.defer, job_id, self.owner, e.retry_after)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.finish, job_id, self.owner, JOB_FAILED, None, f"{type(e).__name__}: {e}")
+
+
+# Initialize the job manager globally
+job_manager = JobManager(JobStore(JOB_DB_PATH), JOB_WORKERS)
@@ -1,17 +1,151 @@
+import gzip
+import json
+import queue
+import random
+import shutil
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+from contextvars import ContextVar
+from datetime import datetime, timezone
 
-# Ensure the logs directory exists
+# Logging settings (read directly from the environment so the logger has no app imports)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size").lower()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "10"))
+LOG_COMPRESS = os.getenv("LOG_COMPRESS", "true").lower() == "true"
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+LOG_FULL_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_FULL_PAYLOAD_SAMPLE_RATE", "0"))
+
+# The logs directory and file are created when the first record is written, not at import
 log_dir = "logs"
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
 
-log_file = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
+log_extension = "jsonl" if LOG_FORMAT == "json" else "log"
+# Worker processes started together would share a timestamp, so each writes (and rotates) its own file
+log_suffix = f"_{os.getpid()}" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else ""
+log_file = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}{log_suffix}.{log_extension}")
+
+# Request ID of the request (or job) currently being handled, attached to every record
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def set_request_id(request_id: str) -> None:
+    """Sets the request ID that log records in the current context are correlated with."""
+    request_id_var.set(request_id)
+
+# -----------------------------------------------------------------------------
+# Filters & Formatters
+# -----------------------------------------------------------------------------
+
+
+class RequestContextFilter(logging.Filter):
+    """Attaches the current request ID to each record. Runs in the caller's context, before queueing."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class PayloadTruncationFilter(logging.Filter):
+    """Truncates oversized messages (e.g. full LLM outputs), keeping a sampled fraction in full."""
+
+    def __init__(self, max_chars: int, full_sample_rate: float):
+        super().__init__()
+        self.max_chars = max_chars
+        self.full_sample_rate = full_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if self.max_chars > 0 and len(message) > self.max_chars and random.random() >= self.full_sample_rate:
+            record.msg = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars]"
+            record.args = None
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+# -----------------------------------------------------------------------------
+# Handlers
+# -----------------------------------------------------------------------------
+
+
+class InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a queue consumed in the same process. The stock prepare() copies and
+    pre-formats every record in the caller; here the record is handed over as is and all
+    formatting happens on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compresses a rotated log file. Runs on the listener thread, never on the event loop."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class LazyDirectoryMixin:
+    """Creates the log directory when the (delayed) file handler first opens its file."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LazyRotatingFileHandler(LazyDirectoryMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class LazyTimedRotatingFileHandler(LazyDirectoryMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+
+def build_file_handler(path: str) -> logging.Handler:
+    """Builds the rotating file handler (size- or time-based) with the configured format. The file is opened on first write."""
+    if LOG_ROTATION == "time":
+        handler = LazyTimedRotatingFileHandler(path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    else:
+        handler = LazyRotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+
+    if LOG_COMPRESS:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+
+    handler.setLevel(logging.INFO)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'))
+    return handler
+
 
 class LoggerSingleton:
     _instance = None
     _log_file_initialized = False
+    _listener = None
+    _queue = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -21,20 +155,44 @@ class LoggerSingleton:
         return cls._instance
 
     def _initialize_log_file(self):
-        """Initialize the log file lazily when the first log is written."""
+        """
+        Initialize the log file lazily when the first log is written.
+        Callers only enqueue records; a background listener thread formats, writes and rotates.
+        """
         if not self._log_file_initialized:
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-            self._log_file_initialized = True
+            LoggerSingleton._queue = queue.Queue(-1)
+            queue_handler = InProcessQueueHandler(self._queue)
+            queue_handler.setLevel(logging.INFO)
+            queue_handler.addFilter(RequestContextFilter())
+            queue_handler.addFilter(PayloadTruncationFilter(LOG_MAX_MESSAGE_CHARS, LOG_FULL_PAYLOAD_SAMPLE_RATE))
+            self.logger.addHandler(queue_handler)
+
+            LoggerSingleton._listener = logging.handlers.QueueListener(self._queue, build_file_handler(log_file))
+            self._listener.start()
+            LoggerSingleton._log_file_initialized = True
 
     def get_logger(self):
         """Public method to get the logger instance."""
         self._initialize_log_file()
         return self.logger
 
+    @classmethod
+    def flush(cls):
+        """Blocks until every queued record has been written."""
+        if cls._listener is not None:
+            cls._queue.join()
+            for handler in cls._listener.handlers:
+                handler.flush()
+
+    @classmethod
+    def shutdown(cls):
+        """Drains the queue, stops the background listener thread and closes the file."""
+        if cls._listener is not None:
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+            cls._listener = None
+
     @staticmethod
     def get_log_file_path():
         """Get the log file path for deletion check."""
@@ -0,0 +1,194 @@
+# Built in modules
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Config
+from app.core.config import MODEL_PRICES_PER_MILLION_TOKENS
+
+# -----------------------------------------------------------------------------
+# Metrics Registry (Prometheus text exposition format)
+# -----------------------------------------------------------------------------
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+TOKEN_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+COST_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Tuple[Tuple[float, ...], Dict[LabelKey, List[float]]]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, Dict[str, object], float]]]] = []
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increments a counter."""
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels) -> None:
+        """Records an observation in a histogram. Bucket bounds are fixed by the first observation."""
+        bounds, series = self._histograms.setdefault(name, (buckets, {}))
+        # Layout: one count per bucket, then +Inf count, then sum
+        values = series.setdefault(_label_key(labels), [0] * (len(bounds) + 1) + [0.0])
+        values[bisect_left(bounds, value)] += 1
+        values[-1] += value
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, Dict[str, object], float]]]) -> None:
+        """Registers a callback returning (name, type, labels, value) samples read at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+
+        for name, series in sorted(self._counters.items()):
+            lines += self._header(name, "counter")
+            lines += [f"{name}{_format_labels(key)} {value}" for key, value in series.items()]
+
+        for name, (bounds, series) in sorted(self._histograms.items()):
+            lines += self._header(name, "histogram")
+            for key, values in series.items():
+                cumulative = 0
+                for bound, count in zip(list(bounds) + ["+Inf"], values[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {values[-1]}")
+                lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+
+        seen = set()
+        for collector in self._collectors:
+            for name, metric_type, labels, value in collector():
+                if name not in seen:
+                    lines += self._header(name, metric_type)
+                    seen.add(name)
+                lines.append(f"{name}{_format_labels(_label_key(labels))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name: str, metric_type: str) -> List[str]:
+        header = [f"# TYPE {name} {metric_type}"]
+        if name in self._help:
+            header.insert(0, f"# HELP {name} {self._help[name]}")
+        return header
+
+
+# Initialize the registry globally
+metrics = MetricsRegistry()
+metrics.describe("app_span_seconds", "Duration of pipeline spans (extract_id, fetch, format, llm_call, persist, render).")
+metrics.describe("app_http_request_seconds", "HTTP request latency by route and status.")
+metrics.describe("app_llm_tokens_total", "Prompt and completion tokens sent to / received from each model (counted locally).")
+metrics.describe("app_llm_cost_usd_total", "Estimated LLM spend per model.")
+metrics.describe("app_meeting_cost_usd", "Estimated LLM spend per processed meeting.")
+metrics.describe("app_meeting_tokens", "Total LLM tokens per processed meeting.")
+metrics.describe("app_transcript_segments", "Number of segments per fetched transcript.")
+metrics.describe("app_transcript_chars", "Formatted transcript size in characters.")
+metrics.describe("app_fetch_retries_total", "Transcript fetch retries by reason.")
+metrics.describe("app_llm_prompt_calls_total", "LLM calls per registered prompt and prompt version.")
+metrics.describe("app_llm_route_total", "Model routing decisions by phase, chosen model and reason.")
+metrics.describe("app_llm_fallback_total", "LLM calls that failed over to the next model, by phase, failed model and error.")
+metrics.describe("app_singleflight_total", "Pipeline runs by single-flight outcome: leader, joined (in-process), reused (another worker's result), lock_timeout.")
+metrics.describe("app_incremental_total", "Re-analysis plans by mode (unchanged, update, full) and reason.")
+metrics.describe("app_llm_overload_total", "LLM calls and requests rejected for lack of shared LLM capacity, by reason (admission, queue_timeout).")
+metrics.describe("app_llm_queue_wait_seconds", "Time LLM calls waited for a shared concurrency slot.")
+
+# -----------------------------------------------------------------------------
+# Spans & Per-Request Timings
+# -----------------------------------------------------------------------------
+
+
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+_meeting_usage: ContextVar[Optional[Dict[str, float]]] = ContextVar("meeting_usage", default=None)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    """Starts collecting span timings for the current request and returns the (shared, mutable) list."""
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def format_server_timing(timings: List[Tuple[str, float]], total_seconds: float) -> str:
+    """Formats collected spans as a Server-Timing header value (durations in milliseconds)."""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings]
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def span(name: str, **labels) -> Iterator[None]:
+    """Times a block, recording it in app_span_seconds and in the current request's timings."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe("app_span_seconds", elapsed, span=name, **labels)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+# -----------------------------------------------------------------------------
+# LLM Usage & Cost
+# -----------------------------------------------------------------------------
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimates the USD cost of a call from the configured per-million-token prices."""
+    input_price, output_price = MODEL_PRICES_PER_MILLION_TOKENS.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def record_llm_usage(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Records token counts and estimated cost for one LLM call, globally and for the current meeting."""
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    metrics.inc("app_llm_tokens_total", prompt_tokens, model=model, kind="prompt")
+    metrics.inc("app_llm_tokens_total", completion_tokens, model=model, kind="completion")
+    metrics.inc("app_llm_cost_usd_total", cost, model=model)
+
+    usage = _meeting_usage.get()
+    if usage is not None:
+        usage["prompt_tokens"] += prompt_tokens
+        usage["completion_tokens"] += completion_tokens
+        usage["cost_usd"] += cost
+
+
+def start_meeting_usage() -> Dict[str, float]:
+    """Starts accumulating LLM usage for the meeting processed in the current task."""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+    _meeting_usage.set(usage)
+    return usage
+
+
+def record_meeting_usage(usage: Dict[str, float]) -> None:
+    """Records the accumulated usage of one processed meeting."""
+    metrics.observe("app_meeting_tokens", usage["prompt_tokens"] + usage["completion_tokens"], buckets=TOKEN_BUCKETS)
+    metrics.observe("app_meeting_cost_usd", usage["cost_usd"], buckets=COST_BUCKETS)
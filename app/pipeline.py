@@ -0,0 +1,233 @@
+# Built in modules
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import BATCH_CONCURRENCY, BATCH_MAX_LINKS, SINGLEFLIGHT_ENABLED, INCREMENTAL_ENABLED
+
+# Errors
+from app.core.errors import InvalidBatchError
+
+# API Models
+from app.core.models import LinkResult, BatchResponse
+
+# AI Processing
+from app.ai.ai import (
+    process_transcript,
+    validate_transcript,
+    stream_process_transcript,
+    update_transcript,
+    stream_update_transcript,
+)
+
+# Incremental re-analysis
+from app.ai.incremental import UpdatePlan, plan_update
+
+# Token budgets
+from app.ai.router import start_request_budget
+
+# Few-shot example index
+from app.ai.examples import index_meeting
+
+# Fetcher
+from app.fetcher import fetch_transcript
+
+# Metrics
+from app.metrics import metrics, span, start_meeting_usage, record_meeting_usage, SIZE_BUCKETS
+
+# Meeting store
+from app.store import meeting_store, save_link, save_transcript, save_output
+
+# Request coalescing
+from app.singleflight import meeting_flights
+
+# Shared LLM concurrency
+from app.core.limits import llm_concurrency
+
+# Utils
+from app.utils import extract_id
+
+# -----------------------------------------------------------------------------
+# Single Meeting Pipeline
+# -----------------------------------------------------------------------------
+
+
+async def plan_reanalysis(meeting_id: str, transcript: list, use_cache: bool) -> Optional[UpdatePlan]:
+    """
+    Compares a fetched transcript with the stored one to decide whether the previous analysis can be
+    reused or updated. Returns None for a full run; a refresh (use_cache=False) always runs in full.
+    """
+    if not INCREMENTAL_ENABLED or not use_cache:
+        return None
+    try:
+        previous_transcript, previous_output = await asyncio.to_thread(meeting_store.get_analysis, meeting_id)
+    except Exception as e:
+        logger.warning(f"Failed to load the previous analysis of meeting {meeting_id}: {e}")
+        return None
+    return plan_update(previous_transcript, previous_output, transcript)
+
+
+async def run_pipeline(link: str, use_cache: bool = True) -> Tuple[str, Dict]:
+    """
+    Runs fetch -> process -> validate for one meeting link and returns the meeting ID and validated output.
+    Concurrent runs for the same meeting, in this process or in other workers, share one pipeline run.
+    """
+    if not SINGLEFLIGHT_ENABLED:
+        return await _run_pipeline(link, use_cache)
+
+    # Flights are keyed on the link's ID; the output is read back through the meeting ID recorded for it
+    link_id = extract_id(link)
+    if not use_cache:
+        # A refresh must regenerate: it only shares a run with concurrent refreshes and never reuses a stored result
+        return await meeting_flights.run(refresh_flight_key(link_id), lambda: _run_pipeline(link, use_cache))
+
+    async def stored_result(since: float) -> Optional[Tuple[str, Dict]]:
+        return await asyncio.to_thread(meeting_store.get_linked_output_since, link_id, since)
+
+    return await meeting_flights.run(link_id, lambda: _run_pipeline(link, use_cache), reuse=stored_result)
+
+
+def refresh_flight_key(link_id: str) -> str:
+    """Single-flight key of forced regenerations, kept apart from cached runs of the same link."""
+    return f"{link_id}:refresh"
+
+
+async def _run_pipeline(link: str, use_cache: bool) -> Tuple[str, Dict]:
+    # Turn the run away before fetching anything when the shared LLM capacity is exhausted
+    async with llm_concurrency.admit():
+        return await _run_admitted_pipeline(link, use_cache)
+
+
+async def _run_admitted_pipeline(link: str, use_cache: bool) -> Tuple[str, Dict]:
+    usage = start_meeting_usage()
+    start_request_budget()
+
+    # Fetch transcripts
+    meeting_id, transcript = await fetch_transcript(link)
+    metrics.observe("app_transcript_segments", len(transcript), buckets=SIZE_BUCKETS)
+    await save_link(extract_id(link), meeting_id)
+
+    # An unchanged transcript keeps its analysis; a slightly changed one only sends the changes
+    plan = await plan_reanalysis(meeting_id, transcript, use_cache)
+    if plan is not None and plan.mode == "unchanged":
+        record_meeting_usage(usage)
+        return meeting_id, plan.previous_output
+
+    # Save transcripts to the meeting store
+    with span("persist"):
+        await save_transcript(transcript, meeting_id)
+
+    # Process the transcript
+    if plan is not None and plan.mode == "update":
+        processed_transcript = await update_transcript(plan.previous_output, plan.diff, use_cache=use_cache)
+    else:
+        processed_transcript = await process_transcript(transcript, use_cache=use_cache, meeting_id=meeting_id)
+
+    # Validate the processed transcript
+    validated_transcript = await validate_transcript(processed_transcript, use_cache=use_cache)
+
+    with span("persist"):
+        await save_output(validated_transcript, meeting_id)
+        await index_meeting(meeting_id, transcript)
+
+    record_meeting_usage(usage)
+    return meeting_id, validated_transcript
+
+
+async def stream_pipeline(link: str, use_cache: bool = True) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+    """
+    Runs the same pipeline as run_pipeline but yields (event, payload) progress events:
+    fetched, phase_one_partial (token-level), phase_one, and validated. When a run for the
+    meeting (a refresh, if this is one) is already in flight in this process, or the transcript
+    has not changed since its last analysis, only validated is sent.
+    """
+    if SINGLEFLIGHT_ENABLED:
+        link_id = extract_id(link)
+        in_flight = meeting_flights.in_flight(link_id if use_cache else refresh_flight_key(link_id))
+        if in_flight is not None:
+            meeting_id, validated_transcript = await asyncio.shield(in_flight)
+            yield "validated", {"meeting_id": meeting_id, "output": validated_transcript}
+            return
+
+    async with llm_concurrency.admit():
+        async for event, payload in _stream_admitted_pipeline(link, use_cache):
+            yield event, payload
+
+
+async def _stream_admitted_pipeline(link: str, use_cache: bool) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+    usage = start_meeting_usage()
+    start_request_budget()
+
+    meeting_id, transcript = await fetch_transcript(link)
+    metrics.observe("app_transcript_segments", len(transcript), buckets=SIZE_BUCKETS)
+    await save_link(extract_id(link), meeting_id)
+    yield "fetched", {"meeting_id": meeting_id, "segments": len(transcript)}
+
+    plan = await plan_reanalysis(meeting_id, transcript, use_cache)
+    if plan is not None and plan.mode == "unchanged":
+        record_meeting_usage(usage)
+        yield "validated", {"meeting_id": meeting_id, "output": plan.previous_output}
+        return
+
+    with span("persist"):
+        await save_transcript(transcript, meeting_id)
+
+    if plan is not None and plan.mode == "update":
+        phase_one = stream_update_transcript(plan.previous_output, plan.diff, use_cache=use_cache)
+    else:
+        phase_one = stream_process_transcript(transcript, use_cache=use_cache, meeting_id=meeting_id)
+
+    processed_transcript = None
+    async for is_final, content in phase_one:
+        if is_final:
+            processed_transcript = content
+        else:
+            yield "phase_one_partial", {"output": content}
+    yield "phase_one", {"output": processed_transcript}
+
+    validated_transcript = await validate_transcript(processed_transcript, use_cache=use_cache)
+    with span("persist"):
+        await save_output(validated_transcript, meeting_id)
+        await index_meeting(meeting_id, transcript)
+
+    record_meeting_usage(usage)
+    yield "validated", {"meeting_id": meeting_id, "output": validated_transcript}
+
+# -----------------------------------------------------------------------------
+# Batch Pipeline
+# -----------------------------------------------------------------------------
+
+
+async def run_batch(links: List[str], use_cache: bool = True, concurrency: int = BATCH_CONCURRENCY) -> BatchResponse:
+    """
+    Runs the pipeline for many links with bounded parallelism.
+    Each link gets its own result; one failure never aborts the rest of the batch.
+    """
+    if len(links) > BATCH_MAX_LINKS:
+        raise InvalidBatchError(f"Batch contains {len(links)} links; the maximum is {BATCH_MAX_LINKS}.")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(link: str) -> LinkResult:
+        async with semaphore:
+            try:
+                meeting_id, output = await run_pipeline(link, use_cache=use_cache)
+                return LinkResult(link=link, status="ok", meeting_id=meeting_id, output=output)
+            except Exception as e:
+                logger.error(f"Batch item failed for {link}: {e}")
+                return LinkResult(link=link, status="error", error=f"{type(e).__name__}: {e}")
+
+    logger.info(f"Batch processing started for {len(links)} links (concurrency {concurrency})")
+    results = await asyncio.gather(*(run_one(link) for link in links))
+    succeeded = sum(1 for result in results if result.status == "ok")
+    logger.info(f"Batch processing completed: {succeeded}/{len(results)} succeeded")
+
+    return BatchResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
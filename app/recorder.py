@@ -0,0 +1,174 @@
+# Built in modules
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# HTTP client
+import httpx
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import HTTP_RECORD_DIR
+
+# -----------------------------------------------------------------------------
+# Exchange Keys
+# -----------------------------------------------------------------------------
+
+
+# Response headers worth replaying; the rest (dates, cookies, lengths, encodings) are regenerated
+RECORDED_HEADERS = ("content-type", "retry-after")
+
+
+def canonical_body(body: bytes) -> bytes:
+    """JSON bodies are re-serialized with sorted keys so equivalent requests hash the same."""
+    if not body:
+        return b""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        return body
+
+
+def body_shape(body: bytes) -> str:
+    """
+    The parts of an LLM request that decide how its response is parsed (streaming or not and
+    the structured-output tool), without the prompt text. Used to replay a recorded response
+    when the prompt has changed between versions.
+    """
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        return ""
+    if not isinstance(payload, dict):
+        return ""
+    tools = sorted(tool.get("function", {}).get("name", "") for tool in payload.get("tools") or [])
+    return json.dumps({"stream": bool(payload.get("stream")), "tools": tools}, sort_keys=True)
+
+
+def exchange_keys(method: str, path: str, query: str, body: bytes) -> Tuple[str, str]:
+    """Returns the exact key (method, path, query and body) and the loose key (method, path and body shape)."""
+    exact = hashlib.sha256(b"\x00".join((method.encode(), path.encode(), query.encode(), canonical_body(body)))).hexdigest()
+    loose = hashlib.sha256(b"\x00".join((method.encode(), path.encode(), body_shape(body).encode()))).hexdigest()
+    return exact, loose
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+
+
+class FixtureRecorder:
+    """
+    Appends recorded exchanges as JSON lines, one file per upstream host. Fixtures hold real
+    meeting transcripts and LLM outputs, so keep them out of version control.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def record(self, request: httpx.Request, request_body: bytes, response: httpx.Response, body: bytes, elapsed: float) -> None:
+        exact, loose = exchange_keys(request.method, request.url.path, request.url.query.decode("ascii"), request_body)
+        exchange = {
+            "host": request.url.host,
+            "method": request.method,
+            "path": request.url.path,
+            "query": request.url.query.decode("ascii"),
+            "key": exact,
+            "loose_key": loose,
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": body.decode("utf-8", errors="replace"),
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(exchange, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, f"{request.url.host or 'local'}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def iter_fixtures(directory: str) -> Iterator[Dict]:
+    """Yields every recorded exchange under a fixtures directory."""
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".jsonl"):
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class FixtureIndex:
+    """Recorded exchanges by exact and loose key. Repeated requests cycle through their recordings."""
+
+    def __init__(self, exchanges: List[Dict]):
+        self.exact: Dict[str, List[Dict]] = {}
+        self.loose: Dict[str, List[Dict]] = {}
+        for exchange in exchanges:
+            self.exact.setdefault(exchange["key"], []).append(exchange)
+            self.loose.setdefault(exchange["loose_key"], []).append(exchange)
+        self._turns: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(exchanges) for exchanges in self.exact.values())
+
+    def match(self, method: str, path: str, query: str, body: bytes) -> Tuple[Optional[Dict], str]:
+        """Returns the exchange to replay and how it matched ("exact", "loose" or "miss")."""
+        exact, loose = exchange_keys(method, path, query, body)
+        for kind, key, table in (("exact", exact, self.exact), ("loose", loose, self.loose)):
+            candidates = table.get(key)
+            if candidates:
+                turn = self._turns.get(key, 0)
+                self._turns[key] = turn + 1
+                return candidates[turn % len(candidates)], kind
+        return None, "miss"
+
+# -----------------------------------------------------------------------------
+# Recording Transport
+# -----------------------------------------------------------------------------
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to the real transport and records each exchange. Responses are buffered, so streams arrive in one piece."""
+
+    def __init__(self, recorder: FixtureRecorder, inner: Optional[httpx.AsyncBaseTransport] = None, **transport_kwargs):
+        self.recorder = recorder
+        self.inner = inner or httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request_body = await request.aread()
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            raw = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - started
+
+        # Decode any content-encoding once, and hand the client the decoded body
+        body = httpx.Response(response.status_code, headers=response.headers, content=raw).content
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        try:
+            self.recorder.record(request, request_body, response, body, elapsed)
+        except Exception as e:
+            logger.warning(f"Failed to record {request.method} {request.url}: {e}")
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request, extensions={"http_version": response.extensions.get("http_version", b"HTTP/1.1")})
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+# Initialize the recorder globally when HTTP_RECORD_DIR is set
+recorder: Optional[FixtureRecorder] = FixtureRecorder(HTTP_RECORD_DIR) if HTTP_RECORD_DIR else None
+
+
+def recording_transport(**transport_kwargs) -> Optional[RecordingTransport]:
+    """A recording transport for a new client, or None when recording is off."""
+    if recorder is None:
+        return None
+    return RecordingTransport(recorder, **transport_kwargs)
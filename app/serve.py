@@ -0,0 +1,43 @@
+# Built in modules
+import os
+import argparse
+
+# ASGI server
+import uvicorn
+
+# Config
+from app.core.config import WEB_CONCURRENCY, SERVE_HOST, SERVE_PORT, SHUTDOWN_GRACE_SECONDS
+
+# -----------------------------------------------------------------------------
+# Production Serving
+#
+# Runs the API in WEB_CONCURRENCY uvicorn worker processes:
+#   WEB_CONCURRENCY=4 LLM_MAX_CONCURRENCY=16 python -m app.serve
+#
+# Workers share the LLM concurrency slots (LLM_MAX_CONCURRENCY), single-flight
+# locks and SQLite stores under meetings/. On SIGTERM each worker stops
+# accepting connections, gives in-flight requests and running jobs up to
+# SHUTDOWN_GRACE_SECONDS to finish, then closes its clients and its log file.
+# -----------------------------------------------------------------------------
+
+
+def serve(workers: int, host: str, port: int) -> None:
+    # Worker processes read the count too: it names their log files and splits the rate limits
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "app.api.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=int(SHUTDOWN_GRACE_SECONDS),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API with several worker processes.")
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--host", default=SERVE_HOST)
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    args = parser.parse_args()
+
+    serve(max(1, args.workers), args.host, args.port)
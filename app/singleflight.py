@@ -0,0 +1,152 @@
+# Built in modules
+import os
+import time
+import zlib
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+# fcntl is POSIX only; without it coalescing stays within one process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import (
+    SINGLEFLIGHT_LOCK_DIR,
+    SINGLEFLIGHT_LOCK_SLOTS,
+    SINGLEFLIGHT_WAIT_SECONDS,
+    SINGLEFLIGHT_POLL_SECONDS,
+)
+
+# Metrics
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+# -----------------------------------------------------------------------------
+# Cross-Process Locks
+# -----------------------------------------------------------------------------
+
+
+class StripedFileLocks:
+    """
+    Advisory flock()s shared by every worker process on the host. Keys hash onto a fixed
+    number of lock files, so the directory never grows; two keys on the same slot simply
+    wait for each other. The kernel releases a lock when its process dies.
+    """
+
+    def __init__(self, directory: str, slots: int, poll_seconds: float):
+        self.directory = directory
+        self.slots = max(1, slots)
+        self.poll_seconds = poll_seconds
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{zlib.crc32(key.encode('utf-8')) % self.slots:04d}.lock")
+
+    async def acquire(self, key: str, timeout: float) -> Tuple[Optional[int], bool]:
+        """
+        Waits for the key's lock without blocking the event loop. Returns the locked file
+        descriptor (None if the timeout expired) and whether another holder had to be waited for.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(self.path_for(key), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        contended = False
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd, contended
+            except BlockingIOError:
+                contended = True
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    return None, contended
+                await asyncio.sleep(self.poll_seconds)
+
+    @staticmethod
+    def release(fd: int) -> None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+# -----------------------------------------------------------------------------
+# Single-Flight
+# -----------------------------------------------------------------------------
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent runs for the same key. Within a process every caller awaits one shared
+    task. Across worker processes the task first takes the key's file lock; if it had to wait for
+    another worker, `reuse(since)` is asked for the result that worker stored meanwhile before
+    anything is run again.
+    """
+
+    def __init__(self, locks: Optional[StripedFileLocks], wait_seconds: float):
+        self.locks = locks
+        self.wait_seconds = wait_seconds
+        self._flights: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> Optional[asyncio.Task]:
+        task = self._flights.get(key)
+        return task if task is not None and not task.done() else None
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        reuse: Optional[Callable[[float], Awaitable[Optional[T]]]] = None,
+    ) -> T:
+        task = self.in_flight(key)
+        if task is None:
+            # The task runs in a copy of the first caller's context (request ID, tenant, budgets)
+            task = asyncio.create_task(self._lead(key, fn, reuse))
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            metrics.inc("app_singleflight_total", outcome="joined")
+            logger.info(f"Joined in-flight run for {key}")
+        # Shielded: one caller disconnecting must not cancel the run the others are waiting on
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved when every caller has gone away
+            task.exception()
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[T]], reuse: Optional[Callable[[float], Awaitable[Optional[T]]]]) -> T:
+        if self.locks is None:
+            metrics.inc("app_singleflight_total", outcome="leader")
+            return await fn()
+
+        waiting_since = time.time()
+        fd, contended = await self.locks.acquire(key, self.wait_seconds)
+        try:
+            if fd is None:
+                metrics.inc("app_singleflight_total", outcome="lock_timeout")
+                logger.warning(f"Gave up waiting {self.wait_seconds:.0f}s for the lock on {key}; running anyway")
+            elif contended and reuse is not None:
+                result = await reuse(waiting_since)
+                if result is not None:
+                    metrics.inc("app_singleflight_total", outcome="reused")
+                    logger.info(f"Reused the result another worker produced for {key}")
+                    return result
+            metrics.inc("app_singleflight_total", outcome="leader")
+            return await fn()
+        finally:
+            if fd is not None:
+                self.locks.release(fd)
+
+
+# Initialize the single-flight group for meetings globally
+meeting_flights = SingleFlight(
+    StripedFileLocks(SINGLEFLIGHT_LOCK_DIR, SINGLEFLIGHT_LOCK_SLOTS, SINGLEFLIGHT_POLL_SECONDS) if fcntl is not None else None,
+    SINGLEFLIGHT_WAIT_SECONDS,
+)
@@ -0,0 +1,407 @@
+# Built in modules
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import asyncio
+import hashlib
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import MEETING_DB_PATH, TRANSCRIPT_FILE_PATH
+
+# Utils
+from app.utils import ensure_directory_exists
+
+# -----------------------------------------------------------------------------
+# Encoding
+# -----------------------------------------------------------------------------
+
+
+def serialize_document(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_document(data) -> bytes:
+    """Serializes a transcript or output as compact JSON and zlib-compresses it."""
+    return zlib.compress(serialize_document(data))
+
+
+def decode_document(blob: Optional[bytes]):
+    return json.loads(zlib.decompress(blob)) if blob is not None else None
+
+
+def hash_transcript(transcript: list) -> str:
+    """Content hash of a transcript, used to find identical transcripts across meetings and runs."""
+    return hashlib.sha256(serialize_document(transcript)).hexdigest()
+
+# -----------------------------------------------------------------------------
+# Meeting Store
+# -----------------------------------------------------------------------------
+
+
+class MeetingStore:
+    """
+    SQLite-backed store for meeting transcripts and outputs, one row per meeting.
+    Documents are stored as compressed blobs; listing and lookups by meeting ID, time or
+    transcript hash only read the indexed metadata columns. Methods are blocking.
+    """
+
+    _METADATA_COLUMNS = "meeting_id, transcript_hash, segment_count, output IS NOT NULL AS has_output, created_at, updated_at, analysed_at"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._local = threading.local()
+
+    def initialize(self) -> None:
+        """Creates the database file and schema if they do not exist yet."""
+        with self._init_lock:
+            if self._initialized:
+                return
+            ensure_directory_exists(os.path.dirname(self.db_path) or ".")
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                with conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS meetings (
+                            meeting_id TEXT PRIMARY KEY,
+                            transcript_hash TEXT,
+                            segment_count INTEGER,
+                            transcript BLOB,
+                            output BLOB,
+                            created_at REAL NOT NULL,
+                            updated_at REAL NOT NULL,
+                            analysed_at REAL
+                        )
+                        """
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_created_at ON meetings (created_at)")
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_transcript_hash ON meetings (transcript_hash)")
+
+                    # Databases created before outputs carried their own timestamp
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(meetings)")}
+                    if "analysed_at" not in columns:
+                        conn.execute("ALTER TABLE meetings ADD COLUMN analysed_at REAL")
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_analysed_at ON meetings (analysed_at, meeting_id)")
+                    # Outputs stored before then count as analysed when last written (an index lookup once backfilled)
+                    conn.execute("UPDATE meetings SET analysed_at = updated_at WHERE analysed_at IS NULL AND output IS NOT NULL")
+
+                    # The ID in a meeting link is not always the meeting ID CircleBack returns with the transcript
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS meeting_links (
+                            link_id TEXT PRIMARY KEY,
+                            meeting_id TEXT NOT NULL,
+                            updated_at REAL NOT NULL
+                        )
+                        """
+                    )
+            finally:
+                conn.close()
+            self._initialized = True
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yields this thread's connection inside a transaction that commits on success.
+        Connections are kept open per thread: opening one per call (and checkpointing the
+        WAL when the last one closes) costs more than the writes themselves.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.initialize()
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # With WAL, NORMAL only syncs at checkpoints; a crash cannot corrupt the database
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def save_transcript(self, meeting_id: str, transcript: list) -> None:
+        self.save_many([(meeting_id, transcript, None, None)])
+
+    def save_output(self, meeting_id: str, output: Dict) -> None:
+        self.save_many([(meeting_id, None, output, None)])
+
+    def save_link(self, link_id: str, meeting_id: str) -> None:
+        """Records which meeting ID the transcript behind a link's ID was stored under."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meeting_links (link_id, meeting_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(link_id) DO UPDATE SET meeting_id = excluded.meeting_id, updated_at = excluded.updated_at",
+                (link_id, meeting_id, time.time()),
+            )
+
+    def save_many(self, records: Iterable[Tuple[str, Optional[list], Optional[Dict], Optional[float]]]) -> int:
+        """
+        Upserts (meeting_id, transcript, output, created_at) records in a single transaction.
+        A None transcript or output leaves the stored value untouched, and a None created_at
+        means now. Returns the number of records written.
+        """
+        now = time.time()
+        rows = []
+        for meeting_id, transcript, output, created_at in records:
+            transcript_hash = segment_count = transcript_blob = None
+            if transcript is not None:
+                # Serialize once for both the hash and the compressed blob
+                serialized = serialize_document(transcript)
+                transcript_hash = hashlib.sha256(serialized).hexdigest()
+                segment_count = len(transcript)
+                transcript_blob = zlib.compress(serialized)
+            output_blob = encode_document(output) if output is not None else None
+            analysed_at = now if output is not None else None
+            rows.append((meeting_id, transcript_hash, segment_count, transcript_blob, output_blob, created_at or now, now, analysed_at))
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO meetings (meeting_id, transcript_hash, segment_count, transcript, output, created_at, updated_at, analysed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (meeting_id) DO UPDATE SET
+                    transcript_hash = COALESCE(excluded.transcript_hash, transcript_hash),
+                    segment_count = COALESCE(excluded.segment_count, segment_count),
+                    transcript = COALESCE(excluded.transcript, transcript),
+                    output = COALESCE(excluded.output, output),
+                    updated_at = excluded.updated_at,
+                    analysed_at = COALESCE(excluded.analysed_at, analysed_at)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def get_transcript(self, meeting_id: str) -> Optional[list]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT transcript FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        return decode_document(row["transcript"]) if row is not None else None
+
+    def get_output(self, meeting_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT output FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        return decode_document(row["output"]) if row is not None else None
+
+    def get_analysis(self, meeting_id: str) -> Tuple[Optional[list], Optional[Dict]]:
+        """
+        Returns the stored transcript and the output analysed from it. The output is None when
+        the transcript was saved after it (a run that never finished), since they no longer match.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT transcript, output, analysed_at >= updated_at AS current FROM meetings WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()
+        if row is None:
+            return None, None
+        return decode_document(row["transcript"]), decode_document(row["output"]) if row["current"] else None
+
+    def get_linked_output_since(self, link_id: str, since: float) -> Optional[Tuple[str, Dict]]:
+        """
+        Returns (meeting_id, output) for the meeting behind a link's ID, resolved through the recorded
+        link (or the link's ID itself when none was recorded), only if it was analysed at or after `since`.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT meeting_id, output FROM meetings "
+                "WHERE meeting_id = COALESCE((SELECT meeting_id FROM meeting_links WHERE link_id = ?), ?) AND analysed_at >= ?",
+                (link_id, link_id, since),
+            ).fetchone()
+        return (row["meeting_id"], decode_document(row["output"])) if row is not None else None
+
+    def find_by_transcript_hash(self, transcript_hash: str) -> List[Dict]:
+        """Returns metadata of meetings whose stored transcript has the given hash."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {self._METADATA_COLUMNS} FROM meetings WHERE transcript_hash = ? ORDER BY updated_at DESC",
+                (transcript_hash,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_meetings(self, since: Optional[float] = None, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Lists meeting metadata, newest first, without reading any document blobs."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {self._METADATA_COLUMNS} FROM meetings WHERE created_at >= ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (since or 0, limit, offset),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_outputs(self, batch_size: int = 500) -> Iterator[Tuple[str, Dict]]:
+        """Lazily yields (meeting_id, output) for every meeting with an output, decoding one batch at a time."""
+        last_id = ""
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT meeting_id, output FROM meetings WHERE output IS NOT NULL AND meeting_id > ? ORDER BY meeting_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["meeting_id"], decode_document(row["output"])
+            last_id = rows[-1]["meeting_id"]
+
+    def iter_analysed_transcripts(self, batch_size: int = 200) -> Iterator[Tuple[str, list]]:
+        """Lazily yields (meeting_id, transcript) for every meeting that has both a transcript and an output."""
+        last_id = ""
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT meeting_id, transcript FROM meetings WHERE transcript IS NOT NULL AND output IS NOT NULL "
+                    "AND meeting_id > ? ORDER BY meeting_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["meeting_id"], decode_document(row["transcript"])
+            last_id = rows[-1]["meeting_id"]
+
+    def iter_analysed_since(self, cursor: Tuple[float, str] = (0.0, ""), batch_size: int = 500) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Lazily yields (metadata, output) for meetings analysed after `cursor`, an (analysed_at, meeting_id)
+        pair, in analysis order. Pass the last yielded pair back in to resume where a previous pass stopped.
+        """
+        analysed_at, meeting_id = cursor
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT {self._METADATA_COLUMNS}, output FROM meetings WHERE output IS NOT NULL "
+                    "AND (analysed_at > ? OR (analysed_at = ? AND meeting_id > ?)) ORDER BY analysed_at, meeting_id LIMIT ?",
+                    (analysed_at, analysed_at, meeting_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                metadata = {key: row[key] for key in row.keys() if key != "output"}
+                yield metadata, decode_document(row["output"])
+            analysed_at, meeting_id = rows[-1]["analysed_at"], rows[-1]["meeting_id"]
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+
+# Initialize the store globally
+meeting_store = MeetingStore(MEETING_DB_PATH)
+
+# -----------------------------------------------------------------------------
+# Async Helpers
+# -----------------------------------------------------------------------------
+
+
+async def save_transcript(meeting_transcript: list, meeting_id: str) -> None:
+    """Saves the meeting transcript to the store without blocking the event loop."""
+    try:
+        await asyncio.to_thread(meeting_store.save_transcript, meeting_id, meeting_transcript)
+        logger.info(f"Transcript saved successfully for meeting {meeting_id}")
+
+    except Exception as e:
+        logger.warning(f"Failed to save meeting transcript: {e}")
+
+
+async def save_link(link_id: str, meeting_id: str) -> None:
+    """Records the meeting ID behind a link's ID without blocking the event loop."""
+    try:
+        await asyncio.to_thread(meeting_store.save_link, link_id, meeting_id)
+
+    except Exception as e:
+        logger.warning(f"Failed to save meeting link: {e}")
+
+
+async def save_output(output: dict, meeting_id: str) -> None:
+    """Saves the validated output to the store without blocking the event loop."""
+    try:
+        await asyncio.to_thread(meeting_store.save_output, meeting_id, output)
+        logger.info(f"Output saved successfully for meeting {meeting_id}")
+
+    except Exception as e:
+        logger.warning(f"Failed to save output: {e}")
+
+# -----------------------------------------------------------------------------
+# Migration From meetings/<id>/ JSON Directories
+# -----------------------------------------------------------------------------
+
+
+def _read_json(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_legacy_meetings(source_dir: str) -> Iterator[Tuple[str, Optional[list], Optional[Dict], float]]:
+    """
+    Yields (meeting_id, transcript, output, created_at) for every meetings/<id>/ directory.
+    The directory mtime stands in for created_at so time-ordered queries stay meaningful.
+    """
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith("_"):
+                continue
+            transcript = _read_json(os.path.join(entry.path, "transcript.json"))
+            output = _read_json(os.path.join(entry.path, "output.json"))
+            if transcript is None and output is None:
+                continue
+            yield entry.name, transcript, output, entry.stat().st_mtime
+
+
+def migrate_legacy_meetings(store: MeetingStore, source_dir: str, batch_size: int = 500, remove: bool = False) -> int:
+    """Bulk-loads the legacy JSON tree into the store in batches. Returns the number of meetings migrated."""
+    migrated, batch, migrated_dirs = 0, [], []
+
+    def flush() -> None:
+        nonlocal migrated
+        migrated += store.save_many(batch)
+        batch.clear()
+
+    for record in iter_legacy_meetings(source_dir):
+        batch.append(record)
+        migrated_dirs.append(os.path.join(source_dir, record[0]))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    if remove:
+        for directory in migrated_dirs:
+            for filename in ("transcript.json", "output.json"):
+                if os.path.exists(os.path.join(directory, filename)):
+                    os.remove(os.path.join(directory, filename))
+            if not os.listdir(directory):
+                os.rmdir(directory)
+
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate meetings/<id>/ JSON directories into the meeting store.")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--source", default=TRANSCRIPT_FILE_PATH)
+    parser.add_argument("--db", default=MEETING_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--remove", action="store_true", help="Delete the migrated JSON files afterwards.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        sys.exit(f"Source directory {args.source} does not exist.")
+
+    started = time.perf_counter()
+    count = migrate_legacy_meetings(MeetingStore(args.db), args.source, args.batch_size, args.remove)
+    print(f"Migrated {count} meetings into {args.db} in {time.perf_counter() - started:.1f}s")
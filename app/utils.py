@@ -1,23 +1,28 @@
 # Built in modules
 import os
-import requests
 import json
 import re
-from typing import Tuple, List, Dict
-from uuid import uuid4
-from json import JSONDecodeError
+from functools import lru_cache
+from typing import Any, Iterator, List, Dict, Optional
+
+# Async HTTP client
+import httpx
 
 # Logger
 from app.logger import logger, LoggerSingleton
 
-
-# Request Exceptions
-from requests.exceptions import Timeout, HTTPError
-
+# Fixture recording
+from app.recorder import recording_transport
 
 # Custom modules
-from app.core.config import BASE_URL_TEMPLATE, TRANSCRIPT_FILE_PATH
-from app.core.errors import InvalidLinkError, TranscriptFetchError, TranscriptProcessingError
+from app.core.config import (
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    TOKENIZER_MODEL,
+    TRANSCRIPT_COMPACT_FORMAT,
+)
+from app.core.errors import InvalidLinkError
 
 # -----------------------------------------------------------------------------
 # Logger Utilities
@@ -28,11 +33,16 @@ def clean_up_logger() -> None:
     """Cleans up the logger when the application shuts down."""
     log_file = LoggerSingleton.get_log_file_path()
 
-    
-    if os.path.exists(log_file) and os.path.getsize(log_file) == 0:
+    # Records are written by a background thread, so drain it before checking the size
+    LoggerSingleton.flush()
+    if not os.path.exists(log_file):
+        # Nothing was logged, so the file was never created
+        pass
+    elif os.path.getsize(log_file) == 0:
         os.remove(log_file)
     else:
         logger.info("Application shutting down...")
+    LoggerSingleton.shutdown()
 
 
 # -----------------------------------------------------------------------------
@@ -51,30 +61,45 @@ def get_file_path(base_directory: str, filename: str, extension: str = "json") -
     return f"{os.path.join(base_directory, filename)}.{extension}"
 
 
-def save_transcript_to_file(meeting_transcript: list, file_subpath: str) -> None:
-    """Saves the meeting transcript to a JSON file."""
-    file_path = get_file_path(f"{TRANSCRIPT_FILE_PATH}/{file_subpath}", "transcript")
+def write_json_file(base_directory: str, filename: str, data: Any) -> str:
+    """Writes data to a JSON file (blocking) and returns the file path."""
+    file_path = get_file_path(base_directory, filename)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    return file_path
 
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(meeting_transcript, f, ensure_ascii=False, indent=4)
-        logger.info(f"Transcript saved successfully to {file_path}")
 
-    except Exception as e:
-        logger.warning(f"Failed to save meeting transcript to file: {e}")
+# -----------------------------------------------------------------------------
+# HTTP Client Utilities
+# -----------------------------------------------------------------------------
 
 
-def save_output_to_file(output: dict, file_subpath: str) -> None:
-    """Saves the given output dictionary to a JSON file."""
-    file_path = get_file_path(f"{TRANSCRIPT_FILE_PATH}/{file_subpath}", "output")
+_http_client: Optional[httpx.AsyncClient] = None
 
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=4)
-        logger.info(f"Output saved successfully to {file_path}")
 
-    except Exception as e:
-        logger.warning(f"Failed to save output to file: {e}")
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared keep-alive HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        # With HTTP_RECORD_DIR set, exchanges are recorded as replay fixtures
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=limits,
+            transport=recording_transport(limits=limits),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Closes the shared HTTP client when the application shuts down."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
 
 
 # -----------------------------------------------------------------------------
@@ -93,48 +118,28 @@ def extract_id(link: str) -> str:
     return match.group(1)
 
 
-def fetch_transcript(link: str) -> Tuple[str, List]:
-    """
-    Fetches and concatenates transcripts by unique segment ID across paginated API responses.
-    Returns the meeting ID and transcripts as a list.
-    """
-    transcripts = []
-    meeting_id = extract_id(link)
+# -----------------------------------------------------------------------------
+# Token Utilities
+# -----------------------------------------------------------------------------
+
 
+@lru_cache(maxsize=1)
+def get_token_encoder():
+    """Returns the tiktoken encoder for the configured model, or None if it cannot be loaded."""
     try:
-        base_url = BASE_URL_TEMPLATE.format(meeting_id=meeting_id)
-        response = requests.get(base_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        meeting_id = data.get("meetingId", str(uuid4()))
-        segments = data.get("segments", [])
-
-        if not segments:
-            raise TranscriptProcessingError("No segments found in the transcript data.")
-
-        # Process each segment to collect unique segment data
-        for segment in segments:
-            speaker = segment.get("speaker", "Unknown")
-            words = segment.get("words", [])
-            spoken_text = " ".join([word.get('text', '') for word in words])
-
-            # Store transcript by unique segment ID
-            transcripts.append({
-                "person": speaker,
-                "said": spoken_text
-            })
-
-    except Timeout:
-        raise TranscriptFetchError("The request timed out. Please try again later.")
-    except HTTPError as e:
-        raise TranscriptFetchError(f"HTTP error occurred: {e}")
-    except JSONDecodeError:
-        raise TranscriptProcessingError("Failed to parse the JSON response from the API.")
+        import tiktoken
+        return tiktoken.encoding_for_model(TOKENIZER_MODEL)
     except Exception as e:
-        raise TranscriptFetchError(f"An error occurred while fetching transcripts: {e}")
+        logger.warning(f"Tokenizer unavailable, falling back to character estimate: {e}")
+        return None
 
-    return str(meeting_id), transcripts
+
+def count_tokens(text: str) -> int:
+    """Counts prompt tokens locally, estimating 4 characters per token when tiktoken is unavailable."""
+    encoder = get_token_encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
 
 
 # -----------------------------------------------------------------------------
@@ -142,27 +147,87 @@ def fetch_transcript(link: str) -> Tuple[str, List]:
 # -----------------------------------------------------------------------------
 
 
-def format_transcript(raw_transcript: List) -> str:
-    """Formats a transcript list of dictionaries into a readable string."""
-    formatted_conversations = ""
+# Filler words dropped by the compact format (compared lowercased, without trailing punctuation)
+FILLER_WORDS = frozenset({"um", "umm", "uh", "uhh", "uhm", "erm", "hmm", "hmmm", "mhm", "mm", "mm-hmm", "uh-huh"})
+TRAILING_PUNCTUATION = ",.;:!?"
+
+
+def compact_text(text: str) -> str:
+    """Drops filler words and stutters ("the the"), collapsing whitespace, in one pass over the words."""
+    words: List[str] = []
+    previous_key = None
+    for word in text.split():
+        key = word.lower().rstrip(TRAILING_PUNCTUATION)
+        if key in FILLER_WORDS:
+            continue
+        if key == previous_key and words and words[-1][-1] not in TRAILING_PUNCTUATION:
+            # Keep the repeated word's punctuation ("right right." -> "right.")
+            words[-1] += word[len(key):]
+            continue
+        words.append(word)
+        previous_key = key
+    return " ".join(words)
+
+
+def iter_compact_turns(raw_transcript: List) -> Iterator[str]:
+    """Yields one "Speaker: text" line per run of consecutive segments by the same speaker."""
+    speaker, parts = None, []
+    for entry in raw_transcript:
+        if entry["person"] != speaker and parts:
+            yield f"{speaker}: {compact_text(' '.join(parts))}\n"
+            parts = []
+        speaker = entry["person"]
+        parts.append(entry["said"])
+    if parts:
+        yield f"{speaker}: {compact_text(' '.join(parts))}\n"
+
+
+def format_transcript(raw_transcript: List, compact: Optional[bool] = None) -> str:
+    """
+    Formats a transcript list of dictionaries into a readable string. The compact format
+    (TRANSCRIPT_COMPACT_FORMAT) merges consecutive turns by the same speaker and drops
+    filler words to save prompt tokens.
+    """
+    if compact is None:
+        compact = TRANSCRIPT_COMPACT_FORMAT
+    if compact:
+        return "".join(iter_compact_turns(raw_transcript))
+
+    # One join over the pieces; repeated += is only linear where CPython can grow the string in place
+    parts = []
     for entry in raw_transcript:
-        formatted_conversations += f"Person: {entry['person']}\nSaid: {entry['said']}\n"
-    return formatted_conversations
+        parts += ("Person: ", entry["person"], "\nSaid: ", entry["said"], "\n")
+    return "".join(parts)
+
+
+def split_transcript(raw_transcript: List, max_tokens: int) -> List[List]:
+    """
+    Splits a transcript into chunks on speaker-turn boundaries, each at most max_tokens when formatted.
+    A single turn longer than max_tokens becomes a chunk of its own.
+    """
+    chunks, current_chunk, current_tokens = [], [], 0
+
+    for entry in raw_transcript:
+        entry_tokens = count_tokens(format_transcript([entry]))
+        if current_chunk and current_tokens + entry_tokens > max_tokens:
+            chunks.append(current_chunk)
+            current_chunk, current_tokens = [], 0
+        current_chunk.append(entry)
+        current_tokens += entry_tokens
+
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
 
 
 def format_analyst_output(data: Dict[str, Dict[str, List[str]]]) -> str:
     """Formats structured analyst output with bullet points into a complete string."""
-    formatted_output = ""
+    sections = []
 
     for section, content in data.items():
-        # Capitalize the section titles and add a newline
-        formatted_output += f"{section.replace('_', ' ').title()}:\n"
-
-        # Iterate over the bullet points
-        for bullet in content.get('bullet_points', []):
-            formatted_output += f" - {bullet}\n"
-
-        formatted_output += "\n"
+        # Capitalize the section titles, then one line per bullet point
+        lines = [f"{section.replace('_', ' ').title()}:"]
+        lines.extend(f" - {bullet}" for bullet in content.get('bullet_points', []))
+        sections.append("\n".join(lines))
 
-    # Remove any trailing newlines
-    return formatted_output.strip()
+    return "\n\n".join(sections).strip()
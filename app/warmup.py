@@ -0,0 +1,94 @@
+# Built in modules
+import time
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Logger
+from app.logger import logger
+
+# Config
+from app.core.config import WARM_UP_ON_STARTUP, FEW_SHOT_EXAMPLES
+
+# Prompt Registry
+from app.ai.registry import prompt_registry
+
+# Meeting store
+from app.store import meeting_store
+
+# Utils
+from app.utils import get_token_encoder
+
+# -----------------------------------------------------------------------------
+# Warm-Up State
+# -----------------------------------------------------------------------------
+
+
+class WarmUpState:
+    """Progress of the startup warm-up, reported by /ready."""
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def report(self) -> Dict:
+        report = {"status": "ready" if self.ready else "warming_up", "steps": dict(self.steps)}
+        if self.started_at is not None and self.finished_at is not None:
+            report["warm_up_seconds"] = round(self.finished_at - self.started_at, 3)
+        if self.errors:
+            report["errors"] = dict(self.errors)
+        return report
+
+
+# Initialize the warm-up state globally
+warm_up_state = WarmUpState()
+
+# -----------------------------------------------------------------------------
+# Warm-Up
+# -----------------------------------------------------------------------------
+
+
+def warm_up_steps() -> List[Tuple[str, Callable[[], object]]]:
+    """The work deferred out of import time, in the order it is warmed."""
+    steps = [
+        # Imports llama_index and builds every routed LLM client and structured wrapper
+        ("llm_clients", prompt_registry.warm_up),
+        ("tokenizer", get_token_encoder),
+        ("meeting_store", meeting_store.initialize),
+    ]
+    if FEW_SHOT_EXAMPLES > 0:
+        from app.ai.examples import get_example_index
+
+        steps.append(("example_index", get_example_index().load))
+    return steps
+
+
+def run_warm_up(state: WarmUpState = warm_up_state) -> None:
+    """
+    Runs each warm-up step, recording how long it took. A failing step is logged and skipped:
+    everything warmed here is also built lazily on first use, so it only costs that request time.
+    """
+    state.started_at = time.perf_counter()
+    for name, step in warm_up_steps():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            state.errors[name] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Warm-up step {name} failed, it will run on first use instead: {e}")
+        state.steps[name] = round(time.perf_counter() - started, 3)
+    state.finished_at = time.perf_counter()
+    logger.info(f"Warm-up finished in {state.finished_at - state.started_at:.2f}s: {state.steps}")
+
+
+def start_warm_up(state: WarmUpState = warm_up_state) -> Optional[asyncio.Task]:
+    """Starts the warm-up in a worker thread so the server accepts connections straight away."""
+    if not WARM_UP_ON_STARTUP:
+        state.started_at = state.finished_at = time.perf_counter()
+        return None
+    return asyncio.create_task(asyncio.to_thread(run_warm_up, state))
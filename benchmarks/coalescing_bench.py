@@ -0,0 +1,139 @@
+# Built in modules
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+# Async HTTP client
+import httpx
+
+# Helpers shared with the load benchmark
+from benchmarks.load_test import start_server, wait_until_up
+
+# -----------------------------------------------------------------------------
+# Single-flight check for concurrent submissions of the same meeting
+#
+# Fires N concurrent /process-transcript/ posts for one meeting at the app
+# (one or several uvicorn workers) and counts the transcript fetches and LLM
+# calls the fake upstream received. With single-flight on, N submissions must
+# cost exactly what one does; the exit code is non-zero otherwise. By default
+# the fake returns meeting IDs that differ from the IDs in the links.
+#
+#   python -m benchmarks.coalescing_bench --submissions 20 --workers 1 4
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_app(port: int, workers: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+    )
+
+
+async def submit(client: httpx.AsyncClient, app_url: str, link: str, count: int) -> Dict:
+    """Posts the same link `count` times at once and returns the latencies and status codes."""
+    async def one() -> tuple:
+        started = time.perf_counter()
+        response = await client.post(f"{app_url}/process-transcript/", data={"link": link})
+        return time.perf_counter() - started, response.status_code
+
+    results = await asyncio.gather(*(one() for _ in range(count)))
+    latencies = sorted(latency for latency, _ in results)
+    return {"latencies": latencies, "statuses": [status for _, status in results]}
+
+
+async def run_case(args: argparse.Namespace, fake_url: str, workers: int, singleflight: bool) -> Dict:
+    data_dir = tempfile.mkdtemp()
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    app = start_app(args.app_port, workers, {
+        "CIRCLEBACK_URL_TEMPLATE": f"{fake_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{fake_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+        # Disable the result cache so only single-flight can deduplicate the concurrent runs
+        "CACHE_ENABLED": "false",
+        "SINGLEFLIGHT_ENABLED": str(singleflight).lower(),
+        "MEETING_DB_PATH": os.path.join(data_dir, "meetings.db"),
+        "JOB_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "SINGLEFLIGHT_LOCK_DIR": os.path.join(data_dir, "_locks"),
+    })
+    try:
+        await wait_until_up(f"{app_url}/")
+        tag = f"sf{int(time.time() * 1000)}w{workers}{int(singleflight)}"
+        async with httpx.AsyncClient(timeout=None) as client:
+            # One solo submission sets the cost of a single pipeline run
+            await client.get(f"{fake_url}/_stats", params={"reset": True})
+            solo = await submit(client, app_url, f"https://app.circleback.ai/view/{tag}solo", 1)
+            expected = (await client.get(f"{fake_url}/_stats", params={"reset": True})).json()
+
+            burst = await submit(client, app_url, f"https://app.circleback.ai/view/{tag}burst", args.submissions)
+            observed = (await client.get(f"{fake_url}/_stats", params={"reset": True})).json()
+    finally:
+        app.terminate()
+        app.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    latencies: List[float] = burst["latencies"]
+    return {
+        "workers": workers,
+        "singleflight": singleflight,
+        "errors": sum(1 for status in burst["statuses"] + solo["statuses"] if status != 200),
+        "fetches": observed["fetches"],
+        "llm_calls": observed["calls"],
+        "expected_fetches": expected["fetches"],
+        "expected_llm_calls": expected["calls"],
+        "p50_s": latencies[len(latencies) // 2],
+        "max_s": latencies[-1],
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = start_server("benchmarks.fakes:app", args.fake_port, {
+        "FAKE_LLM_LATENCY": str(args.llm_latency),
+        "FAKE_MEETING_ID_PREFIX": args.meeting_id_prefix,
+    })
+    failures = 0
+    try:
+        await wait_until_up(f"{fake_url}/docs")
+        print(f"{args.submissions} concurrent submissions of one meeting (one run costs the 'solo' column)")
+        print(f"{'workers':>7} {'single-flight':>13} {'errors':>6} {'fetches':>7} {'llm calls':>9} {'solo':>9} {'p50 s':>6} {'max s':>6}  check")
+        for workers in args.workers:
+            for singleflight in ([False, True] if args.compare else [True]):
+                result = await run_case(args, fake_url, workers, singleflight)
+                coalesced = (
+                    result["errors"] == 0
+                    and result["fetches"] == result["expected_fetches"]
+                    and result["llm_calls"] == result["expected_llm_calls"]
+                )
+                check = "-" if not singleflight else ("ok" if coalesced else "FAIL")
+                failures += check == "FAIL"
+                print(
+                    f"{workers:>7} {'on' if singleflight else 'off':>13} {result['errors']:>6} {result['fetches']:>7} "
+                    f"{result['llm_calls']:>9} {result['expected_fetches']:>3}/{result['expected_llm_calls']:<5} "
+                    f"{result['p50_s']:>6.2f} {result['max_s']:>6.2f}  {check}"
+                )
+    finally:
+        fake.terminate()
+        fake.wait()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks that concurrent submissions of one meeting cost one pipeline run.")
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--meeting-id-prefix", default="cb", help="Makes the fetched meeting IDs differ from the link IDs ('' to match)")
+    parser.add_argument("--compare", action="store_true", help="Also run with single-flight disabled")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,112 @@
+# Built in modules
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# -----------------------------------------------------------------------------
+# Few-shot example index benchmark
+#
+# Fills a meeting store with synthetic analysed meetings on a handful of topics,
+# builds the example index, and measures per-request retrieval latency (embedding
+# the query, vectorized top-k, reading the example outputs) and topic precision.
+#
+#   python -m benchmarks.examples_bench --meetings 10000 --k 3
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOPICS = {
+    "vendor": "vendor risk questionnaires third party due diligence onboarding suppliers contracts",
+    "audit": "audit evidence collection control testing auditors sampling walkthroughs findings",
+    "privacy": "privacy requests data mapping consent records retention deletion gdpr",
+    "security": "security incidents vulnerability scanning access reviews soc2 penetration tests",
+    "aml": "anti money laundering transaction monitoring alerts sanctions screening kyc files",
+}
+
+
+def synthetic_meeting(index: int, segments: int, rng: random.Random) -> tuple:
+    topic = list(TOPICS)[index % len(TOPICS)]
+    vocabulary = TOPICS[topic].split() + "team weeks hours spreadsheet manual process quarter budget headcount".split()
+    transcript = [
+        {"person": f"Speaker {i % 3}", "said": " ".join(rng.choice(vocabulary) for _ in range(18))}
+        for i in range(segments)
+    ]
+    output = {section: {"bullet_points": [f"{topic} work takes the team about {index % 40 + 5} hours every week today."]}
+              for section in ("business_strategies", "compliance_initiatives", "risk_and_critical_capabilities", "ExampleCompany")}
+    return f"m{index:07d}", topic, transcript, output
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        # app.logger writes logs/ relative to the working directory
+        os.chdir(workdir)
+        os.environ["FEW_SHOT_EXAMPLES"] = str(args.k)
+        os.environ["MEETING_DB_PATH"] = os.path.join(workdir, "meetings.db")
+        os.environ["EXAMPLE_INDEX_DIR"] = os.path.join(workdir, "_examples")
+        sys.path.insert(0, REPO_ROOT)
+        from app.store import meeting_store
+        from app.ai import examples
+        from app.utils import format_transcript
+
+        rng = random.Random(0)
+        meetings = [synthetic_meeting(i, args.segments, rng) for i in range(args.meetings)]
+        topics = {meeting_id: topic for meeting_id, topic, _, _ in meetings}
+        meeting_store.save_many((meeting_id, transcript, output, None) for meeting_id, _, transcript, output in meetings)
+
+        started = time.perf_counter()
+        index = examples.get_example_index()
+        indexed = index.rebuild(meeting_store)
+        build_seconds = time.perf_counter() - started
+
+        # Reload from disk as a fresh process would
+        index = examples.ExampleIndex(index.directory, index.backend)
+        started = time.perf_counter()
+        index.load()
+        load_seconds = time.perf_counter() - started
+        examples._example_index = index
+
+        queries = [synthetic_meeting(args.meetings + i, args.segments, rng) for i in range(args.queries)]
+        embed_times, search_times, select_times, hits = [], [], [], 0
+        for _, topic, transcript, _ in queries:
+            text = format_transcript(transcript)
+
+            started = time.perf_counter()
+            query = index.backend.embed([text])[0]
+            embed_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            scores = index._matrix @ query
+            # Raw top-k selection only; precision below goes through index.search
+            scores.argpartition(-args.k)
+            search_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            examples.select_examples(text)
+            select_times.append(time.perf_counter() - started)
+
+            hits += sum(topics[meeting_id] == topic for meeting_id, _ in index.search(text, args.k))
+
+        print(f"{indexed} meetings x {args.segments} segments, dim {index.backend.dim} ({index.backend.name})")
+        print(f"build {build_seconds:.1f}s, load (mmap) {load_seconds * 1000:.1f}ms, matrix {os.path.getsize(index.vectors_path) / 1e6:.1f} MB")
+        for label, values in (("embed query", embed_times), ("top-k search", search_times), ("select_examples", select_times)):
+            print(f"{label:>16}: p50 {percentile(values, 0.5) * 1000:.2f}ms  p95 {percentile(values, 0.95) * 1000:.2f}ms")
+        print(f"topic precision@{args.k}: {hits / (args.k * len(queries)):.2f}")
+        os.chdir(REPO_ROOT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Few-shot example index build time, retrieval latency and precision.")
+    parser.add_argument("--meetings", type=int, default=10000)
+    parser.add_argument("--segments", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    main(parser.parse_args())
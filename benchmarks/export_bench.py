@@ -0,0 +1,99 @@
+# Built in modules
+import os
+import shutil
+import random
+import argparse
+import tempfile
+import resource
+import multiprocessing
+from typing import Dict
+
+# Meeting store and exporter
+from app.store import MeetingStore
+from app.export import AnalysisExporter, EXPORT_EXTENSIONS, pa
+
+# -----------------------------------------------------------------------------
+# Bulk export of stored analyses
+#
+# Fills synthetic meeting stores of increasing size, then exports each one in
+# every format and reports time, throughput, file size and how much the peak
+# resident memory grew during the export. That growth should stay flat as the
+# store grows, since rows are written one batch of meetings at a time. Finally
+# adds a few new analyses and times an incremental export of just those.
+#
+#   python -m benchmarks.export_bench --sizes 1000 10000 50000
+# -----------------------------------------------------------------------------
+
+
+SECTIONS = ["business_strategy", "compliance_strategy", "risks_and_capabilities", "strengths_to_pain_points"]
+
+
+def synthetic_output(rng: random.Random, bullets: int) -> Dict:
+    return {
+        section: {"bullet_points": [" ".join(rng.choices(["revenue", "audit", "pipeline", "renewal", "vendor", "latency", "roadmap", "pricing"], k=14)) for _ in range(bullets)]}
+        for section in SECTIONS
+    }
+
+
+def fill_store(store: MeetingStore, start: int, count: int, bullets: int) -> None:
+    rng = random.Random(start)
+    for offset in range(0, count, 1000):
+        store.save_many(
+            (f"bench{start + index:07d}", [{"person": "A", "said": "hello"}], synthetic_output(rng, bullets), None)
+            for index in range(offset, min(count, offset + 1000))
+        )
+
+
+def measure(db_path: str, directory: str, file_format: str, batch_size: int, incremental: bool, results) -> None:
+    """Runs one export in a fresh process so the peak resident memory belongs to it alone."""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    summary = AnalysisExporter(MeetingStore(db_path), directory, batch_size).export(file_format, incremental)
+    summary["size"] = os.path.getsize(os.path.join(directory, summary["file"])) if summary["file"] else 0
+    # ru_maxrss is in KiB on Linux
+    summary["peak_mb"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 2**10
+    results.put(summary)
+
+
+def run(db_path: str, directory: str, file_format: str, batch_size: int, incremental: bool = False) -> Dict:
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(db_path, directory, file_format, batch_size, incremental, results))
+    process.start()
+    summary = results.get()
+    process.join()
+    return summary
+
+
+def main(args: argparse.Namespace) -> None:
+    formats = list(EXPORT_EXTENSIONS) if pa is not None else ["csv"]
+    data_dir = tempfile.mkdtemp()
+    try:
+        print(f"Export of synthetic stores ({len(SECTIONS)} sections x {args.bullets} bullets per meeting, batches of {args.batch_size} meetings)")
+        print(f"{'meetings':>8} {'format':>8} {'rows':>9} {'s':>7} {'rows/s':>9} {'file MB':>8} {'+peak MB':>8}")
+        for size in args.sizes:
+            db_path = os.path.join(data_dir, f"meetings_{size}.db")
+            store = MeetingStore(db_path)
+            fill_store(store, 0, size, args.bullets)
+            for file_format in formats:
+                summary = run(db_path, os.path.join(data_dir, f"exports_{size}"), file_format, args.batch_size)
+                print(
+                    f"{size:>8} {file_format:>8} {summary['rows']:>9} {summary['seconds']:>7.2f} {summary['rows'] / summary['seconds']:>9.0f} "
+                    f"{summary['size'] / 2**20:>8.2f} {summary['peak_mb']:>8.1f}"
+                )
+
+        # Incremental: only the meetings analysed since the last export of the largest store
+        size = args.sizes[-1]
+        db_path = os.path.join(data_dir, f"meetings_{size}.db")
+        new = max(1, size // 100)
+        fill_store(MeetingStore(db_path), size, new, args.bullets)
+        summary = run(db_path, os.path.join(data_dir, f"exports_{size}"), formats[0], args.batch_size, incremental=True)
+        print(f"Incremental {formats[0]} export after {new} new analyses in a {size + new}-meeting store: {summary['meetings']} meetings in {summary['seconds']:.3f}s")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures bulk export time, file size and peak memory by store size and format.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--bullets", type=int, default=5, help="Bullet points per section")
+    parser.add_argument("--batch-size", type=int, default=500)
+    main(parser.parse_args())
@@ -0,0 +1,214 @@
+# Built in modules
+import os
+import json
+import asyncio
+import random
+import time
+from typing import Optional
+
+# FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+
+# -----------------------------------------------------------------------------
+# Fake CircleBack + OpenAI server used by the benchmarks
+#
+# Run with:
+#   FAKE_LLM_LATENCY=2 uvicorn benchmarks.fakes:app --port 9100
+# -----------------------------------------------------------------------------
+
+
+FAKE_FETCH_LATENCY = float(os.getenv("FAKE_FETCH_LATENCY", "0.05"))
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "1.0"))
+FAKE_LLM_TTFT = float(os.getenv("FAKE_LLM_TTFT", "0.2"))
+FAKE_STREAM_CHUNKS = int(os.getenv("FAKE_STREAM_CHUNKS", "40"))
+# Drop the last streamed chunk and finish with "length", like a response cut off at max_tokens
+FAKE_STREAM_CUT_OFF = os.getenv("FAKE_STREAM_CUT_OFF", "0") == "1"
+FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS = float(os.getenv("FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS", "0"))
+FAKE_SEGMENTS = int(os.getenv("FAKE_SEGMENTS", "200"))
+FAKE_PAGE_SIZE = int(os.getenv("FAKE_PAGE_SIZE", "0"))
+FAKE_FETCH_FAILURE_RATE = float(os.getenv("FAKE_FETCH_FAILURE_RATE", "0"))
+# Returned meetingId = prefix + the ID in the link, as CircleBack's IDs need not match its links
+FAKE_MEETING_ID_PREFIX = os.getenv("FAKE_MEETING_ID_PREFIX", "")
+FAKE_FAILING_MODELS = set(filter(None, os.getenv("FAKE_FAILING_MODELS", "").split(",")))
+
+FAKE_BULLETS = [
+    "The team manually reconciles vendor compliance evidence across four separate spreadsheet trackers today.",
+    "Two analysts spend roughly twenty hours each week preparing quarterly audit evidence packages.",
+    "Regulators expect the updated control framework in place before the next March examination.",
+]
+
+FAKE_OUTPUT = {
+    "business_strategies": {"bullet_points": FAKE_BULLETS},
+    "compliance_initiatives": {"bullet_points": FAKE_BULLETS},
+    "risk_and_critical_capabilities": {"bullet_points": FAKE_BULLETS},
+    "ExampleCompany": {"bullet_points": FAKE_BULLETS},
+}
+
+app = FastAPI()
+
+# Running usage totals, read and reset by the benchmarks through /_stats
+usage_totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "fetches": 0}
+model_calls = {}
+
+# Non-streaming LLM calls in flight and the peak since the last reset
+llm_concurrency = {"in_flight": 0, "peak": 0}
+
+# Per-meeting transcript edits ({"append": n, "correct": n}), set by the benchmarks through /_edit
+transcript_edits = {}
+
+
+def fake_segments(meeting_id: str, count: int = FAKE_SEGMENTS) -> list:
+    """
+    Builds a deterministic list of CircleBack-style segments for a meeting, with any edits applied:
+    "append" extra segments at the end and "correct" rewritten segments spread over the transcript.
+    """
+    edits = transcript_edits.get(meeting_id, {})
+    total = count + edits.get("append", 0)
+    corrected = set(range(0, count, max(1, count // edits["correct"]))[:edits["correct"]]) if edits.get("correct") else set()
+    return [
+        {
+            "id": f"{meeting_id}-{i}",
+            "speaker": f"Speaker {i % 3}",
+            "words": [
+                {"text": word}
+                for word in f"meeting {meeting_id} segment {i} talks about audit evidence and vendor risk{' (corrected)' if i in corrected else ''}".split()
+            ],
+        }
+        for i in range(total)
+    ]
+
+
+@app.get("/api/meeting/view/{meeting_id}/transcript")
+async def fake_transcript(meeting_id: str, page: Optional[int] = None):
+    usage_totals["fetches"] += 1
+    await asyncio.sleep(FAKE_FETCH_LATENCY)
+    if random.random() < FAKE_FETCH_FAILURE_RATE:
+        return JSONResponse({"error": "unavailable"}, status_code=503, headers={"Retry-After": "0"})
+
+    segments = fake_segments(meeting_id)
+    if not FAKE_PAGE_SIZE:
+        return {"meetingId": FAKE_MEETING_ID_PREFIX + meeting_id, "segments": segments}
+
+    page = page or 1
+    total_pages = max(1, -(-len(segments) // FAKE_PAGE_SIZE))
+    start = (page - 1) * FAKE_PAGE_SIZE
+    return {
+        "meetingId": FAKE_MEETING_ID_PREFIX + meeting_id,
+        "page": page,
+        "totalPages": total_pages,
+        "segments": segments[start:start + FAKE_PAGE_SIZE],
+    }
+
+
+async def fake_stream(model: str, arguments: str, tool_name: str = None):
+    """Yields OpenAI-style SSE chunks, spreading the arguments over FAKE_STREAM_CHUNKS deltas."""
+    await asyncio.sleep(FAKE_LLM_TTFT)
+    step = max(1, len(arguments) // FAKE_STREAM_CHUNKS)
+    pieces = [arguments[i:i + step] for i in range(0, len(arguments), step)]
+    if FAKE_STREAM_CUT_OFF:
+        pieces = pieces[:-1]
+    delay = max(0.0, FAKE_LLM_LATENCY - FAKE_LLM_TTFT) / len(pieces)
+
+    for index, piece in enumerate(pieces):
+        if tool_name:
+            tool_call = {"index": 0, "function": {"arguments": piece}}
+            if index == 0:
+                tool_call.update({"id": "call_fake", "type": "function"})
+                tool_call["function"]["name"] = tool_name
+            delta = {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+        else:
+            delta = {"role": "assistant", "content": piece}
+
+        chunk = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(delay)
+
+    final = {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "length" if FAKE_STREAM_CUT_OFF else "tool_calls" if tool_name else "stop"}],
+    }
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def fake_chat_completions(request: Request):
+    body = await request.json()
+    if body.get("model") in FAKE_FAILING_MODELS:
+        return JSONResponse({"error": {"message": "The model is unavailable.", "type": "invalid_request_error"}}, status_code=404)
+
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in body.get("messages", []))
+    arguments = json.dumps(FAKE_OUTPUT)
+    tools = body.get("tools") or []
+
+    usage_totals["calls"] += 1
+    model_calls[body.get("model")] = model_calls.get(body.get("model"), 0) + 1
+    usage_totals["prompt_tokens"] += prompt_chars // 4
+    usage_totals["completion_tokens"] += len(arguments) // 4
+    prompt_latency = (prompt_chars / 4000) * FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS
+
+    if body.get("stream"):
+        tool_name = tools[0]["function"]["name"] if tools else None
+        await asyncio.sleep(prompt_latency)
+        return StreamingResponse(fake_stream(body.get("model", "gpt-4o"), arguments, tool_name), media_type="text/event-stream")
+
+    llm_concurrency["in_flight"] += 1
+    llm_concurrency["peak"] = max(llm_concurrency["peak"], llm_concurrency["in_flight"])
+    try:
+        await asyncio.sleep(FAKE_LLM_LATENCY + prompt_latency)
+    finally:
+        llm_concurrency["in_flight"] -= 1
+
+    if tools:
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": "call_fake",
+                "type": "function",
+                "function": {"name": tools[0]["function"]["name"], "arguments": arguments},
+            }],
+        }
+        finish_reason = "tool_calls"
+    else:
+        message = {"role": "assistant", "content": arguments}
+        finish_reason = "stop"
+
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(arguments) // 4,
+            "total_tokens": (prompt_chars + len(arguments)) // 4,
+        },
+    }
+
+
+@app.post("/_edit/{meeting_id}")
+async def fake_edit(meeting_id: str, append: int = 0, correct: int = 0):
+    transcript_edits[meeting_id] = {"append": append, "correct": correct}
+    return transcript_edits[meeting_id]
+
+
+@app.get("/_stats")
+async def fake_stats(reset: bool = False):
+    snapshot = {**usage_totals, "models": dict(model_calls), "peak_llm_concurrency": llm_concurrency["peak"]}
+    if reset:
+        usage_totals.update({key: 0 for key in usage_totals})
+        model_calls.clear()
+        llm_concurrency["peak"] = llm_concurrency["in_flight"]
+    return snapshot
@@ -0,0 +1,102 @@
+# Built in modules
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+# -----------------------------------------------------------------------------
+# Transcript formatting benchmark
+#
+# Formats synthetic transcripts of 1k / 10k / 100k segments with the plain
+# format (a single join), the same text built by repeated string concatenation
+# as before, and the compact format, reporting time, peak traced memory and
+# prompt tokens.
+#
+#   python -m benchmarks.format_bench --segments 1000 10000 100000
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILLERS = ["um,", "uh", "you know,", "so", "hmm,"]
+PHRASES = [
+    "we reconcile vendor evidence across four spreadsheets every quarter",
+    "the audit team spends about twenty hours a week on control testing",
+    "our regulators expect the new framework before the March exam",
+    "headcount is flat this year so the the backlog keeps growing",
+]
+
+
+def synthetic_transcript(segments: int, seed: int = 0) -> list:
+    """Speakers talk in runs of one to four segments, with filler words sprinkled in."""
+    rng = random.Random(seed)
+    transcript, speaker = [], 0
+    while len(transcript) < segments:
+        speaker = (speaker + rng.randint(1, 2)) % 4
+        for _ in range(rng.randint(1, 4)):
+            words = []
+            for phrase in rng.sample(PHRASES, 2):
+                if rng.random() < 0.5:
+                    words.append(rng.choice(FILLERS))
+                words.append(phrase)
+            transcript.append({"person": f"Speaker {speaker}", "said": " ".join(words) + "."})
+    return transcript[:segments]
+
+
+def concat_format_transcript(raw_transcript: list) -> str:
+    """The previous plain format: one += per segment, which only CPython's in-place resize keeps linear."""
+    formatted_conversations = ""
+    for entry in raw_transcript:
+        formatted_conversations += f"Person: {entry['person']}\nSaid: {entry['said']}\n"
+    return formatted_conversations
+
+
+def measure_time(fn, transcript: list, repeat: int) -> float:
+    """Best of repeat runs, untraced (tracemalloc slows every allocation)."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(transcript)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure_peak(fn, transcript: list) -> tuple:
+    tracemalloc.start()
+    text = fn(transcript)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, peak
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        # app.logger writes logs/ relative to the working directory
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_ROOT)
+        from app.utils import format_transcript, count_tokens
+
+        variants = (
+            ("plain", lambda transcript: format_transcript(transcript, compact=False)),
+            ("concat", concat_format_transcript),
+            ("compact", lambda transcript: format_transcript(transcript, compact=True)),
+        )
+
+        print(f"{'segments':>8} {'variant':>10} {'ms':>9} {'peak MB':>8} {'chars':>10} {'tokens':>9}")
+        for segments in args.segments:
+            transcript = synthetic_transcript(segments)
+            for label, fn in variants:
+                elapsed = measure_time(fn, transcript, args.repeat)
+                text, peak = measure_peak(fn, transcript)
+                print(f"{segments:>8} {label:>10} {elapsed * 1000:>9.1f} {peak / 1e6:>8.1f} {len(text):>10} {count_tokens(text):>9}")
+        os.chdir(REPO_ROOT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcript formatting time, peak memory and tokens.")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,299 @@
+# Built in modules
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+# Async HTTP client
+import httpx
+
+# Helpers shared with the load benchmark
+from benchmarks.load_test import start_server, wait_until_up
+
+# -----------------------------------------------------------------------------
+# Offline benchmark harness
+#
+# record: runs the app with HTTP_RECORD_DIR set and processes the given links
+#         once, capturing every CircleBack and OpenAI exchange as fixtures.
+# run:    replays the fixtures through benchmarks.replay_server (or uses the
+#         fake server), drives /process-transcript/ at each concurrency level
+#         and reports throughput, latency percentiles, app memory and mean
+#         span durations. Results are saved as JSON; --baseline compares them
+#         with an earlier run and exits non-zero on a regression.
+#
+#   python -m benchmarks.harness record --links https://app.circleback.ai/view/abc123
+#   python -m benchmarks.harness run --levels 1 4 16 --output benchmarks/results/main.json
+#   python -m benchmarks.harness run --baseline benchmarks/results/main.json
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURES_DIR = os.path.join(REPO_ROOT, "fixtures", "recorded")
+TRANSCRIPT_PATH = re.compile(r"^/api/meeting/view/([A-Za-z0-9]+)/transcript$")
+SPAN_LINE = re.compile(r'^app_span_seconds_(sum|count)\{(.*)\} (\S+)$')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def process_memory_mb(pid: int) -> Dict[str, Optional[float]]:
+    """Current and peak resident memory of a process (Linux /proc; None elsewhere)."""
+    memory = {"rss_mb": None, "peak_rss_mb": None}
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    memory["rss_mb"] = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    memory["peak_rss_mb"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return memory
+
+
+def recorded_links(fixtures_dir: str) -> List[str]:
+    """Meeting links whose CircleBack transcripts were recorded."""
+    from app.recorder import iter_fixtures
+
+    meeting_ids = []
+    for exchange in iter_fixtures(fixtures_dir):
+        match = TRANSCRIPT_PATH.match(exchange["path"])
+        if match and exchange["status"] == 200 and match.group(1) not in meeting_ids:
+            meeting_ids.append(match.group(1))
+    return [f"https://app.circleback.ai/view/{meeting_id}" for meeting_id in meeting_ids]
+
+
+def data_env(data_dir: str) -> Dict[str, str]:
+    """Keeps the app's meeting store, job queue and lock files in a scratch directory."""
+    return {
+        "MEETING_DB_PATH": os.path.join(data_dir, "meetings.db"),
+        "JOB_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "SINGLEFLIGHT_LOCK_DIR": os.path.join(data_dir, "_locks"),
+    }
+
+
+async def span_totals(client: httpx.AsyncClient, app_url: str) -> Dict[str, List[float]]:
+    """Scrapes /metrics for the cumulative [sum, count] of each pipeline span."""
+    totals: Dict[str, List[float]] = {}
+    text = (await client.get(f"{app_url}/metrics")).text
+    for line in text.splitlines():
+        match = SPAN_LINE.match(line)
+        if match:
+            span = re.search(r'span="([^"]+)"', match.group(2)).group(1)
+            entry = totals.setdefault(span, [0.0, 0.0])
+            entry[0 if match.group(1) == "sum" else 1] += float(match.group(3))
+    return totals
+
+# -----------------------------------------------------------------------------
+# Record
+# -----------------------------------------------------------------------------
+
+
+async def record(args: argparse.Namespace) -> int:
+    """Processes each link once against the real upstreams with recording on."""
+    fixtures_dir = os.path.abspath(args.fixtures)
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    data_dir = tempfile.mkdtemp()
+    app = start_server("app.api.main:app", args.app_port, {"HTTP_RECORD_DIR": fixtures_dir, "CACHE_ENABLED": "false", **data_env(data_dir)})
+    failures = 0
+    try:
+        await wait_until_up(f"{app_url}/")
+        async with httpx.AsyncClient(timeout=None) as client:
+            for link in args.links:
+                response = await client.post(f"{app_url}/process-transcript/", data={"link": link, "refresh": "true"})
+                failures += response.status_code != 200
+                print(f"{response.status_code} {link}")
+    finally:
+        app.terminate()
+        app.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+    print(f"Fixtures in {fixtures_dir}; they contain meeting content, keep them out of version control")
+    return 1 if failures else 0
+
+# -----------------------------------------------------------------------------
+# Run
+# -----------------------------------------------------------------------------
+
+
+async def run_level(client: httpx.AsyncClient, app_url: str, app_pid: int, links: List[str], concurrency: int, requests: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_request
+        while next_request < requests:
+            link = links[next_request % len(links)]
+            next_request += 1
+            started = time.perf_counter()
+            response = await client.post(f"{app_url}/process-transcript/", data={"link": link})
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != 200
+
+    spans_before = await span_totals(client, app_url)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    spans_after = await span_totals(client, app_url)
+
+    span_means = {}
+    for span, (total, count) in spans_after.items():
+        before_total, before_count = spans_before.get(span, [0.0, 0.0])
+        if count > before_count:
+            span_means[span] = round((total - before_total) / (count - before_count), 4)
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 3),
+        "p50_s": round(percentile(latencies, 0.50), 4),
+        "p95_s": round(percentile(latencies, 0.95), 4),
+        "p99_s": round(percentile(latencies, 0.99), 4),
+        **{key: round(value, 1) if value is not None else None for key, value in process_memory_mb(app_pid).items()},
+        "span_means_s": span_means,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Lists levels whose throughput dropped or whose p95 rose by more than the tolerance."""
+    regressions = []
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    for level in results["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        if level["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"c={level['concurrency']}: throughput {before['throughput_rps']:.2f} -> {level['throughput_rps']:.2f} req/s")
+        if level["p95_s"] > before["p95_s"] * (1 + tolerance):
+            regressions.append(f"c={level['concurrency']}: p95 {before['p95_s']:.2f} -> {level['p95_s']:.2f} s")
+        if level["errors"] > before["errors"]:
+            regressions.append(f"c={level['concurrency']}: errors {before['errors']} -> {level['errors']}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+
+    if args.backend == "replay":
+        fixtures_dir = os.path.abspath(args.fixtures)
+        links = args.links or recorded_links(fixtures_dir)
+        if not links:
+            print(f"No recorded transcripts in {fixtures_dir}; run `python -m benchmarks.harness record` first")
+            return 2
+        upstream = start_server("benchmarks.replay_server:app", args.upstream_port, {
+            "REPLAY_FIXTURES_DIR": fixtures_dir,
+            "REPLAY_LATENCY_SCALE": str(args.latency_scale),
+            "REPLAY_EXTRA_LATENCY": str(args.extra_latency),
+        })
+    else:
+        links = args.links or [f"https://app.circleback.ai/view/harness{i}" for i in range(8)]
+        upstream = start_server("benchmarks.fakes:app", args.upstream_port, {"FAKE_LLM_LATENCY": str(args.extra_latency)})
+
+    data_dir = tempfile.mkdtemp()
+    app = start_server("app.api.main:app", args.app_port, {
+        "CIRCLEBACK_URL_TEMPLATE": f"{upstream_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{upstream_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+        # Links repeat across requests: keep the result cache and coalescing from hiding the pipeline
+        "CACHE_ENABLED": str(args.cache).lower(),
+        "SINGLEFLIGHT_ENABLED": str(args.singleflight).lower(),
+        **data_env(data_dir),
+    })
+
+    results = {
+        "revision": git_revision(),
+        "recorded_at": time.time(),
+        "backend": args.backend,
+        "links": len(links),
+        "latency_scale": args.latency_scale,
+        "extra_latency": args.extra_latency,
+        "levels": [],
+    }
+    try:
+        await wait_until_up(f"{upstream_url}/_stats")
+        await wait_until_up(f"{app_url}/")
+        async with httpx.AsyncClient(timeout=None) as client:
+            # One untimed request per link warms connections and lazily built clients
+            for link in links:
+                await client.post(f"{app_url}/process-transcript/", data={"link": link})
+            print(f"{'conc':>4} {'reqs':>5} {'err':>4} {'req/s':>7} {'p50 s':>6} {'p95 s':>6} {'p99 s':>6} {'rss MB':>7} {'peak MB':>7}  spans (mean s)")
+            for concurrency in args.levels:
+                level = await run_level(client, app_url, app.pid, links, concurrency, max(concurrency, args.requests_per_level))
+                results["levels"].append(level)
+                spans = " ".join(f"{span}={mean:.3f}" for span, mean in sorted(level["span_means_s"].items()))
+                print(
+                    f"{level['concurrency']:>4} {level['requests']:>5} {level['errors']:>4} {level['throughput_rps']:>7.2f} "
+                    f"{level['p50_s']:>6.2f} {level['p95_s']:>6.2f} {level['p99_s']:>6.2f} "
+                    f"{level['rss_mb'] or 0:>7.1f} {level['peak_rss_mb'] or 0:>7.1f}  {spans}"
+                )
+            if args.backend == "replay":
+                print(f"replay matches: {(await client.get(f'{upstream_url}/_stats')).json()}")
+    finally:
+        for process in (app, upstream):
+            process.terminate()
+            process.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"Compared with {args.baseline} (revision {baseline.get('revision')}, tolerance {args.tolerance:.0%}): "
+              f"{'no regressions' if not regressions else 'REGRESSIONS'}")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record upstream exchanges and benchmark the app offline against them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record CircleBack and OpenAI exchanges for the given links")
+    record_parser.add_argument("--links", nargs="+", required=True)
+    record_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    record_parser.add_argument("--app-port", type=int, default=9000)
+
+    run_parser = commands.add_parser("run", help="Benchmark the app against replayed (or fake) upstreams")
+    run_parser.add_argument("--backend", choices=["replay", "fake"], default="replay")
+    run_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    run_parser.add_argument("--links", nargs="+", help="Defaults to every recorded meeting")
+    run_parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16])
+    run_parser.add_argument("--requests-per-level", type=int, default=32)
+    run_parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on recorded upstream latency")
+    run_parser.add_argument("--extra-latency", type=float, default=0.0, help="Seconds added to every upstream response")
+    run_parser.add_argument("--cache", action="store_true", help="Leave the LLM result cache on")
+    run_parser.add_argument("--singleflight", action="store_true", help="Leave request coalescing on")
+    run_parser.add_argument("--output", help="Where to save the results (default benchmarks/results/<time>-<revision>.json)")
+    run_parser.add_argument("--baseline", help="Earlier results to compare with")
+    run_parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative throughput drop / p95 rise")
+    run_parser.add_argument("--upstream-port", type=int, default=9100)
+    run_parser.add_argument("--app-port", type=int, default=9000)
+
+    args = parser.parse_args()
+    sys.exit(asyncio.run(record(args) if args.command == "record" else run(args)))
@@ -0,0 +1,109 @@
+# Built in modules
+import os
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from typing import Dict
+
+# Async HTTP client
+import httpx
+
+# Helpers shared with the load benchmark
+from benchmarks.load_test import start_server, wait_until_up
+
+# -----------------------------------------------------------------------------
+# Full vs incremental re-analysis of an updated transcript
+#
+# Each scenario analyses two identical meetings, edits both transcripts on the
+# fake upstream (segments appended and/or corrected), then re-submits one with
+# refresh (a full run) and the other normally (an incremental update when the
+# change is small enough). Reports the LLM calls, prompt tokens and latency of
+# both re-runs. Prompt latency scales with prompt size, as it does upstream.
+#
+#   python -m benchmarks.incremental_bench --segments 400
+# -----------------------------------------------------------------------------
+
+
+SCENARIOS = [
+    ("unchanged", {}),
+    ("append 2%", {"append": 0.02}),
+    ("append 10%", {"append": 0.10}),
+    ("correct 1%", {"correct": 0.01}),
+    ("append 5% + correct 2%", {"append": 0.05, "correct": 0.02}),
+    ("append 40%", {"append": 0.40}),
+]
+
+
+async def rerun(client: httpx.AsyncClient, app_url: str, fake_url: str, meeting_id: str, refresh: bool) -> Dict:
+    await client.get(f"{fake_url}/_stats", params={"reset": True})
+    started = time.perf_counter()
+    response = await client.post(
+        f"{app_url}/process-transcript/", data={"link": f"https://app.circleback.ai/view/{meeting_id}", "refresh": str(refresh).lower()}
+    )
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    stats = (await client.get(f"{fake_url}/_stats", params={"reset": True})).json()
+    return {"seconds": elapsed, "calls": stats["calls"], "prompt_tokens": stats["prompt_tokens"]}
+
+
+async def run_scenario(client: httpx.AsyncClient, app_url: str, fake_url: str, tag: str, segments: int, edits: Dict) -> Dict:
+    results = {}
+    for mode, refresh in (("full", True), ("incremental", False)):
+        meeting_id = f"{tag}{mode}"
+        await client.post(f"{app_url}/process-transcript/", data={"link": f"https://app.circleback.ai/view/{meeting_id}"})
+        await client.post(f"{fake_url}/_edit/{meeting_id}", params={name: round(share * segments) for name, share in edits.items()})
+        results[mode] = await rerun(client, app_url, fake_url, meeting_id, refresh)
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    data_dir = tempfile.mkdtemp()
+    fake = start_server("benchmarks.fakes:app", args.fake_port, {
+        "FAKE_SEGMENTS": str(args.segments),
+        "FAKE_LLM_LATENCY": str(args.llm_latency),
+        "FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS": str(args.seconds_per_1k),
+    })
+    app = start_server("app.api.main:app", args.app_port, {
+        "CIRCLEBACK_URL_TEMPLATE": f"{fake_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{fake_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+        # Without the result cache every re-run reaches the fake LLM, so the two modes compare fairly
+        "CACHE_ENABLED": "false",
+        "MEETING_DB_PATH": os.path.join(data_dir, "meetings.db"),
+        "JOB_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "SINGLEFLIGHT_LOCK_DIR": os.path.join(data_dir, "_locks"),
+    })
+    try:
+        await wait_until_up(f"{fake_url}/docs")
+        await wait_until_up(f"{app_url}/")
+        print(f"Re-analysis of a {args.segments}-segment transcript after an edit: full (refresh) vs incremental")
+        print(f"{'scenario':<24} {'full calls':>10} {'tokens':>7} {'s':>6}   {'incr calls':>10} {'tokens':>7} {'s':>6}   {'token saving':>12}")
+        async with httpx.AsyncClient(timeout=None) as client:
+            for index, (name, edits) in enumerate(SCENARIOS):
+                tag = f"inc{int(time.time())}s{index}"
+                result = await run_scenario(client, app_url, fake_url, tag, args.segments, edits)
+                full, incremental = result["full"], result["incremental"]
+                saving = 1 - incremental["prompt_tokens"] / full["prompt_tokens"] if full["prompt_tokens"] else 0.0
+                print(
+                    f"{name:<24} {full['calls']:>10} {full['prompt_tokens']:>7} {full['seconds']:>6.2f}   "
+                    f"{incremental['calls']:>10} {incremental['prompt_tokens']:>7} {incremental['seconds']:>6.2f}   {saving:>12.0%}"
+                )
+    finally:
+        for process in (app, fake):
+            process.terminate()
+            process.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares full and incremental re-analysis of edited transcripts.")
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--seconds-per-1k", type=float, default=0.2, help="Extra fake LLM latency per 1k prompt tokens")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+# Built in modules
+import os
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+from typing import List
+
+# Async HTTP client
+import httpx
+
+# -----------------------------------------------------------------------------
+# Load benchmark for /process-transcript/
+#
+# Starts the fake CircleBack/OpenAI server and the app as separate uvicorn
+# processes, then fires concurrent form posts at increasing concurrency levels.
+#
+#   python -m benchmarks.load_test --levels 1 4 16 --llm-latency 1.0
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(target: str, port: int, env: dict) -> subprocess.Popen:
+    """Starts a uvicorn server for the given app target in a subprocess."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+    )
+
+
+async def wait_until_up(url: str, timeout: float = 30.0) -> None:
+    """Polls a URL until the server answers or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start in {timeout}s")
+
+
+async def run_level(app_url: str, concurrency: int, requests_per_worker: int, run_tag: str) -> dict:
+    """Runs one concurrency level and returns throughput and latency stats."""
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(worker_id: int, client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for i in range(requests_per_worker):
+            link = f"https://app.circleback.ai/view/{run_tag}c{concurrency}w{worker_id}r{i}"
+            started = time.perf_counter()
+            response = await client.post(f"{app_url}/process-transcript/", data={"link": link})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    async with httpx.AsyncClient(timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(w, client) for w in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_s": latencies[len(latencies) // 2],
+        "max_s": latencies[-1],
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    app_url = f"http://127.0.0.1:{args.app_port}"
+
+    fake = start_server("benchmarks.fakes:app", args.fake_port, {
+        "FAKE_LLM_LATENCY": str(args.llm_latency),
+        "FAKE_FETCH_LATENCY": str(args.fetch_latency),
+    })
+    app = start_server("app.api.main:app", args.app_port, {
+        "CIRCLEBACK_URL_TEMPLATE": f"{fake_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{fake_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+    })
+
+    try:
+        await wait_until_up(f"{fake_url}/docs")
+        await wait_until_up(f"{app_url}/")
+
+        run_tag = f"bench{int(time.time())}"
+        print(f"{'concurrency':>11} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 s':>7} {'max s':>7}")
+        for level in args.levels:
+            result = await run_level(app_url, level, args.requests_per_worker, run_tag)
+            print(
+                f"{result['concurrency']:>11} {result['requests']:>8} {result['errors']:>6} "
+                f"{result['throughput_rps']:>8.2f} {result['p50_s']:>7.2f} {result['max_s']:>7.2f}"
+            )
+    finally:
+        for process in (app, fake):
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load benchmark for the transcript pipeline.")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests-per-worker", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--fetch-latency", type=float, default=0.05)
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,129 @@
+# Built in modules
+import os
+import sys
+import time
+import json
+import queue
+import logging
+import logging.handlers
+import argparse
+import tempfile
+from typing import List
+
+# -----------------------------------------------------------------------------
+# Logging overhead microbenchmark
+#
+# Simulates requests that each emit the pipeline's log lines (two of them carrying
+# full LLM outputs) separated by I/O waits, and measures the time the request
+# spends inside logging calls for the old synchronous FileHandler setup and for
+# the queue-backed backend in app/logger.py.
+#
+#   python -m benchmarks.logging_bench --requests 2000 --payload-chars 6000 [--fsync]
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DurableFileHandler(logging.FileHandler):
+    """FileHandler that fsyncs every record, standing in for slow or network-backed volumes."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        os.fsync(self.stream.fileno())
+
+
+def make_payload(chars: int) -> dict:
+    bullet = "The team manually reconciles vendor compliance evidence across spreadsheet trackers today."
+    bullets = [bullet] * max(1, chars // (len(bullet) * 4))
+    return {section: {"bullet_points": bullets} for section in ("business_strategies", "compliance_initiatives", "risk_and_critical_capabilities", "ExampleCompany")}
+
+
+def simulate_requests(logger: logging.Logger, payload: dict, requests: int, gap_seconds: float) -> List[float]:
+    """Returns, per simulated request, the seconds spent inside logging calls."""
+    overheads = []
+    for i in range(requests):
+        started = time.perf_counter()
+        logger.info(f"Fetched 200 segments across 1 page(s) for meeting bench{i}")
+        logger.info(f"Transcript saved successfully to meetings/bench{i}/transcript.json")
+        logger.info("Transcript processing started")
+        logger.info(f"Transcript processing (phase one) completed: {payload}")
+        logger.info(f"Transcript validation (phase two) completed: {payload}")
+        logger.info(f"Output saved successfully to meetings/bench{i}/output.json")
+        overheads.append(time.perf_counter() - started)
+        # Stand-in for the awaits between log lines (HTTP, LLM), when the listener thread gets to run
+        time.sleep(gap_seconds)
+    return overheads
+
+
+def sync_logger(path: str, fsync: bool) -> logging.Logger:
+    """The previous setup: a plain FileHandler written inline by the caller."""
+    logger = logging.getLogger("bench_sync")
+    logger.propagate = False
+    handler = DurableFileHandler(path) if fsync else logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def queued_logger(path: str, fsync: bool, app_logger) -> tuple:
+    """The new setup: filters + queue handler in the caller, rotating file handler on a listener thread."""
+    records = queue.Queue(-1)
+    logger = logging.getLogger("bench_queued")
+    logger.propagate = False
+    handler = app_logger.InProcessQueueHandler(records)
+    handler.addFilter(app_logger.RequestContextFilter())
+    handler.addFilter(app_logger.PayloadTruncationFilter(app_logger.LOG_MAX_MESSAGE_CHARS, app_logger.LOG_FULL_PAYLOAD_SAMPLE_RATE))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    file_handler = app_logger.build_file_handler(path)
+    if fsync:
+        emit = file_handler.emit
+        file_handler.emit = lambda record: (emit(record), os.fsync(file_handler.stream.fileno()))
+    listener = logging.handlers.QueueListener(records, file_handler)
+    listener.start()
+    return logger, listener
+
+
+def summarize(name: str, overheads: List[float]) -> str:
+    overheads = sorted(overheads)
+    mean = sum(overheads) / len(overheads)
+    p99 = overheads[int(len(overheads) * 0.99) - 1]
+    return f"{name:>10} {mean * 1e6:>12.1f} {p99 * 1e6:>12.1f}"
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        # app.logger writes logs/ relative to the working directory
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_ROOT)
+        import app.logger as app_logger
+
+        payload = make_payload(args.payload_chars)
+        gap = args.gap_ms / 1000
+        print(f"payload {len(json.dumps(payload))} chars, {args.requests} requests, fsync={args.fsync}, LOG_FORMAT={app_logger.LOG_FORMAT}")
+
+        sync_overheads = simulate_requests(sync_logger("sync.log", args.fsync), payload, args.requests, gap)
+
+        logger, listener = queued_logger("queued.log", args.fsync, app_logger)
+        queued_overheads = simulate_requests(logger, payload, args.requests, gap)
+        listener.stop()
+
+        print(f"{'backend':>10} {'mean us/req':>12} {'p99 us/req':>12}")
+        print(summarize("sync", sync_overheads))
+        print(summarize("queued", queued_overheads))
+        print(f"log size: sync {os.path.getsize('sync.log') / 1e6:.1f} MB, queued {os.path.getsize('queued.log') / 1e6:.1f} MB")
+
+        app_logger.LoggerSingleton.shutdown()
+        os.chdir(REPO_ROOT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request logging overhead before and after the queue-backed backend.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--payload-chars", type=int, default=6000)
+    parser.add_argument("--gap-ms", type=float, default=1.0)
+    parser.add_argument("--fsync", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+# Built in modules
+import os
+import time
+import asyncio
+import argparse
+
+# Async HTTP client
+import httpx
+
+# -----------------------------------------------------------------------------
+# Single-shot vs map-reduce benchmark for long transcripts
+#
+# Starts the fake server with prompt-size dependent latency and runs phase one
+# both ways over synthetic transcripts, reporting latency, calls and tokens.
+#
+#   python -m benchmarks.long_transcript --segments 2000 8000
+# -----------------------------------------------------------------------------
+
+
+FAKE_PORT = int(os.getenv("FAKE_PORT", "9101"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+
+# Point the app at the fake server before it is imported
+os.environ.setdefault("OPENAI_API_BASE", f"{FAKE_URL}/v1")
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+os.environ.setdefault("MODEL_RATE_LIMIT_PER_MINUTE", "0")
+
+from benchmarks.load_test import start_server, wait_until_up  # noqa: E402
+from app.ai.ai import call_llm, process_long_transcript  # noqa: E402
+from app.ai.prompts import AnalysisOutput  # noqa: E402
+from app.ai.registry import TRANSCRIPT_PROMPT  # noqa: E402
+from app.utils import format_transcript, count_tokens  # noqa: E402
+
+
+def synthetic_transcript(segments: int) -> list:
+    """Builds a transcript of alternating speakers with realistic turn lengths."""
+    return [
+        {
+            "person": f"Speaker {i % 4}",
+            "said": f"In segment {i} we went through how the vendor risk reviews take our team about {i % 40 + 5} hours "
+                    "every month, mostly chasing evidence across spreadsheets before the audit committee meets.",
+        }
+        for i in range(segments)
+    ]
+
+
+async def measure(label: str, coroutine, client: httpx.AsyncClient) -> dict:
+    await client.get(f"{FAKE_URL}/_stats", params={"reset": True})
+    started = time.perf_counter()
+    await coroutine
+    elapsed = time.perf_counter() - started
+    usage = (await client.get(f"{FAKE_URL}/_stats")).json()
+    return {"mode": label, "seconds": elapsed, **usage}
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake = start_server("benchmarks.fakes:app", FAKE_PORT, {
+        "FAKE_LLM_LATENCY": str(args.llm_latency),
+        "FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS": str(args.seconds_per_1k_tokens),
+    })
+    try:
+        await wait_until_up(f"{FAKE_URL}/docs")
+        print(f"{'segments':>8} {'tokens':>8} {'mode':>11} {'seconds':>8} {'calls':>5} {'prompt tok':>10} {'compl tok':>9}")
+        async with httpx.AsyncClient() as client:
+            for segments in args.segments:
+                transcript = synthetic_transcript(segments)
+                formatted = format_transcript(transcript)
+                messages = TRANSCRIPT_PROMPT.format_messages(formatted_transcript_str=formatted)
+
+                for result in (
+                    await measure("single-shot", call_llm(messages, AnalysisOutput, use_cache=False, prompt=TRANSCRIPT_PROMPT), client),
+                    await measure("map-reduce", process_long_transcript(transcript, use_cache=False), client),
+                ):
+                    print(
+                        f"{segments:>8} {count_tokens(formatted):>8} {result['mode']:>11} {result['seconds']:>8.2f} "
+                        f"{result['calls']:>5} {result['prompt_tokens']:>10} {result['completion_tokens']:>9}"
+                    )
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare single-shot and map-reduce processing of long transcripts.")
+    parser.add_argument("--segments", type=int, nargs="+", default=[2000, 8000])
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
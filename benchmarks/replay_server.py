@@ -0,0 +1,75 @@
+# Built in modules
+import os
+import asyncio
+
+# FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse, JSONResponse
+
+# Recorded fixtures
+from app.recorder import FixtureIndex, iter_fixtures
+
+# -----------------------------------------------------------------------------
+# Replay server: a local stand-in for CircleBack and OpenAI that answers with
+# exchanges recorded by the app (HTTP_RECORD_DIR).
+#
+# Point CIRCLEBACK_URL_TEMPLATE and OPENAI_API_BASE at it, like the fake server:
+#   REPLAY_FIXTURES_DIR=fixtures/recorded REPLAY_LATENCY_SCALE=1 uvicorn benchmarks.replay_server:app --port 9100
+#
+# Latency: each response waits its recorded duration times REPLAY_LATENCY_SCALE
+# plus REPLAY_EXTRA_LATENCY seconds; streamed responses spread that over their
+# events. Requests are matched on method, path and body, falling back to a
+# recording of the same shape (see app.recorder) when the prompt has changed.
+# -----------------------------------------------------------------------------
+
+
+REPLAY_FIXTURES_DIR = os.getenv("REPLAY_FIXTURES_DIR", os.path.join("fixtures", "recorded"))
+REPLAY_LATENCY_SCALE = float(os.getenv("REPLAY_LATENCY_SCALE", "1.0"))
+REPLAY_EXTRA_LATENCY = float(os.getenv("REPLAY_EXTRA_LATENCY", "0"))
+# Fraction of the recorded duration spent before the first streamed event
+REPLAY_STREAM_TTFT_FRACTION = float(os.getenv("REPLAY_STREAM_TTFT_FRACTION", "0.2"))
+
+app = FastAPI()
+fixtures = FixtureIndex(list(iter_fixtures(REPLAY_FIXTURES_DIR)))
+
+# Replay counters, read and reset by the benchmarks through /_stats
+replay_totals = {"exact": 0, "loose": 0, "miss": 0}
+
+
+def replay_delay(exchange: dict) -> float:
+    return exchange["elapsed"] * REPLAY_LATENCY_SCALE + REPLAY_EXTRA_LATENCY
+
+
+async def paced_events(body: str, delay: float):
+    """Re-streams a recorded SSE body event by event over the replay delay."""
+    events = [event + "\n\n" for event in body.split("\n\n") if event.strip()]
+    await asyncio.sleep(delay * REPLAY_STREAM_TTFT_FRACTION)
+    step = delay * (1 - REPLAY_STREAM_TTFT_FRACTION) / max(1, len(events))
+    for event in events:
+        yield event
+        await asyncio.sleep(step)
+
+
+@app.get("/_stats")
+async def replay_stats(reset: bool = False):
+    snapshot = {**replay_totals, "fixtures": len(fixtures)}
+    if reset:
+        replay_totals.update({key: 0 for key in replay_totals})
+    return snapshot
+
+
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+async def replay(request: Request, path: str):
+    exchange, kind = fixtures.match(request.method, request.url.path, request.url.query, await request.body())
+    replay_totals[kind] += 1
+    if exchange is None:
+        return JSONResponse({"error": f"No recorded exchange for {request.method} {request.url.path}"}, status_code=404)
+
+    delay = replay_delay(exchange)
+    headers = {name: value for name, value in exchange["headers"].items() if name != "content-type"}
+    media_type = exchange["headers"].get("content-type")
+    if media_type and media_type.startswith("text/event-stream"):
+        return StreamingResponse(paced_events(exchange["body"], delay), status_code=exchange["status"], headers=headers, media_type=media_type)
+
+    await asyncio.sleep(delay)
+    return Response(exchange["body"], status_code=exchange["status"], headers=headers, media_type=media_type)
@@ -0,0 +1,206 @@
+# Built in modules
+import os
+import sys
+import glob
+import time
+import shutil
+import signal
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+# Async HTTP client
+import httpx
+
+# Helpers shared with the load benchmark
+from benchmarks.load_test import start_server, wait_until_up
+
+# -----------------------------------------------------------------------------
+# Serving mode check: shared LLM limit, backpressure and graceful shutdown
+#
+# Starts `python -m app.serve` with several workers against the fake upstream
+# and checks that:
+#   - a burst of distinct meetings never has more than LLM_MAX_CONCURRENCY LLM
+#     calls in flight upstream, across all workers;
+#   - runs beyond LLM_MAX_CONCURRENCY + LLM_MAX_WAITING are answered right
+#     away with 503 and Retry-After;
+#   - on SIGTERM, requests already in flight still complete, and every worker
+#     closes its own log file with the shutdown record.
+# The exit code is non-zero if any check fails.
+#
+#   python -m benchmarks.serving_bench --workers 4 --limit 4 --burst 40
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_app(args: argparse.Namespace, fake_url: str, data_dir: str, limit: int) -> subprocess.Popen:
+    env = {
+        "CIRCLEBACK_URL_TEMPLATE": f"{fake_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{fake_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+        # Every run reaches the fake LLM, so the limit is what bounds concurrency
+        "CACHE_ENABLED": "false",
+        "LLM_MAX_CONCURRENCY": str(limit),
+        "LLM_MAX_WAITING": str(args.waiting),
+        "LLM_QUEUE_WAIT_SECONDS": str(args.queue_wait),
+        "SHUTDOWN_GRACE_SECONDS": "20",
+        # Lift the per-host and per-model rate limits so they do not pace the burst instead
+        "HOST_RATE_LIMIT_PER_SECOND": "0",
+        "MODEL_RATE_LIMIT_PER_MINUTE": "0",
+        "MEETING_DB_PATH": os.path.join(data_dir, "meetings.db"),
+        "JOB_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "SINGLEFLIGHT_LOCK_DIR": os.path.join(data_dir, "_locks"),
+        "LLM_SLOT_DIR": os.path.join(data_dir, "_slots"),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(args.workers), "--host", "127.0.0.1", "--port", str(args.app_port)],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+    )
+
+
+async def post(client: httpx.AsyncClient, app_url: str, link: str) -> Dict:
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"{app_url}/process-transcript/", data={"link": link})
+        status, retry_after = response.status_code, response.headers.get("Retry-After")
+    except httpx.TransportError:
+        status, retry_after = "conn", None
+    return {"status": status, "retry_after": retry_after, "seconds": time.perf_counter() - started}
+
+
+async def wait_until_ready(app_url: str, workers: int, timeout: float = 60.0) -> None:
+    """Waits until /ready answers 200 several times in a row, so every worker has likely finished warming up."""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    async with httpx.AsyncClient() as client:
+        while streak < workers * 3 and time.monotonic() < deadline:
+            response = await client.get(f"{app_url}/ready")
+            streak = streak + 1 if response.status_code == 200 else 0
+            await asyncio.sleep(0.05)
+
+
+def percentile(values: List[float], share: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * share))] if values else 0.0
+
+
+async def burst(args: argparse.Namespace, fake_url: str, limit: int) -> Dict:
+    """Fires a burst of distinct meetings and summarises statuses, latencies and the upstream LLM concurrency peak."""
+    data_dir = tempfile.mkdtemp()
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    app = start_app(args, fake_url, data_dir, limit)
+    try:
+        await wait_until_up(f"{app_url}/")
+        await wait_until_ready(app_url, args.workers)
+        tag = f"sv{int(time.time() * 1000)}l{limit}"
+        async with httpx.AsyncClient(timeout=None) as client:
+            await client.get(f"{fake_url}/_stats", params={"reset": True})
+            results = await asyncio.gather(*(post(client, app_url, f"https://app.circleback.ai/view/{tag}m{i}") for i in range(args.burst)))
+            stats = (await client.get(f"{fake_url}/_stats", params={"reset": True})).json()
+    finally:
+        app.send_signal(signal.SIGTERM)
+        app.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    ok = [result["seconds"] for result in results if result["status"] == 200]
+    rejected = [result for result in results if result["status"] == 503]
+    return {
+        "ok": len(ok),
+        "rejected": len(rejected),
+        "other": len(results) - len(ok) - len(rejected),
+        "retry_after": all(result["retry_after"] for result in rejected),
+        "reject_max_s": max((result["seconds"] for result in rejected), default=0.0),
+        "ok_p50_s": percentile(ok, 0.5),
+        "ok_p95_s": percentile(ok, 0.95),
+        "peak": stats["peak_llm_concurrency"],
+    }
+
+
+async def graceful_shutdown(args: argparse.Namespace, fake_url: str) -> Dict:
+    """Sends SIGTERM while requests are in flight and checks they finish and every worker closes its log."""
+    data_dir = tempfile.mkdtemp()
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    logs_before = set(glob.glob(os.path.join(REPO_ROOT, "logs", "app_*")))
+    app = start_app(args, fake_url, data_dir, 0)
+    try:
+        await wait_until_up(f"{app_url}/")
+        await wait_until_ready(app_url, args.workers)
+        tag = f"gs{int(time.time() * 1000)}"
+        async with httpx.AsyncClient(timeout=None) as client:
+            requests = [asyncio.create_task(post(client, app_url, f"https://app.circleback.ai/view/{tag}m{i}")) for i in range(args.workers * 2)]
+            # Let the requests reach the LLM stage before stopping the server
+            await asyncio.sleep(args.llm_latency / 2)
+            app.send_signal(signal.SIGTERM)
+            results = await asyncio.gather(*requests)
+        exit_code = await asyncio.to_thread(app.wait, 60)
+    finally:
+        if app.poll() is None:
+            app.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    new_logs = sorted(set(glob.glob(os.path.join(REPO_ROOT, "logs", "app_*"))) - logs_before)
+    closed = 0
+    for path in new_logs:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            closed += "Application shutting down..." in f.read()
+    return {
+        "completed": sum(1 for result in results if result["status"] == 200),
+        "requests": len(results),
+        "exit_code": exit_code,
+        "log_files": len(new_logs),
+        "closed_logs": closed,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = start_server("benchmarks.fakes:app", args.fake_port, {"FAKE_LLM_LATENCY": str(args.llm_latency)})
+    failures = 0
+    try:
+        await wait_until_up(f"{fake_url}/docs")
+        print(f"Burst of {args.burst} distinct meetings at {args.workers} workers (LLM latency {args.llm_latency}s)")
+        print(f"{'LLM limit':>9} {'200':>4} {'503':>4} {'other':>5} {'peak LLM':>8} {'503 max s':>9} {'200 p50 s':>9} {'200 p95 s':>9}  check")
+        for limit in ([0, args.limit] if args.compare else [args.limit]):
+            result = await burst(args, fake_url, limit)
+            passed = (
+                result["other"] == 0
+                and result["retry_after"]
+                and result["reject_max_s"] <= 1.0
+                and (limit == 0 or result["peak"] <= limit)
+            )
+            check = "-" if limit == 0 else ("ok" if passed else "FAIL")
+            failures += check == "FAIL"
+            print(
+                f"{limit or 'off':>9} {result['ok']:>4} {result['rejected']:>4} {result['other']:>5} {result['peak']:>8} "
+                f"{result['reject_max_s']:>9.2f} {result['ok_p50_s']:>9.2f} {result['ok_p95_s']:>9.2f}  {check}"
+            )
+
+        result = await graceful_shutdown(args, fake_url)
+        passed = result["completed"] == result["requests"] and result["exit_code"] == 0 and result["closed_logs"] == result["log_files"] == args.workers
+        failures += not passed
+        print(
+            f"SIGTERM with {result['requests']} requests in flight: {result['completed']} completed, exit code {result['exit_code']}, "
+            f"{result['closed_logs']}/{result['log_files']} worker logs closed  {'ok' if passed else 'FAIL'}"
+        )
+    finally:
+        fake.terminate()
+        fake.wait()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks the shared LLM limit, 503 backpressure and graceful shutdown of app.serve.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=4, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--waiting", type=int, default=8, help="LLM_MAX_WAITING")
+    parser.add_argument("--queue-wait", type=float, default=10.0, help="LLM_QUEUE_WAIT_SECONDS")
+    parser.add_argument("--burst", type=int, default=40)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--compare", action="store_true", help="Also run the burst without the limit")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,155 @@
+# Built in modules
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+# Async HTTP client
+import httpx
+
+# Helpers shared with the load benchmark
+from benchmarks.load_test import start_server, wait_until_up
+
+# -----------------------------------------------------------------------------
+# Cold start benchmark for the API process
+#
+# 1. Import time of app.api.main in a fresh interpreter (median of N runs), and
+#    whether llama_index was loaded by the import.
+# 2. Per boot of a uvicorn process against the fake server: time until the
+#    first HTTP response, until /ready reports warm, and until the first
+#    /process-transcript/ request completes — with and without warm-up.
+#
+#   python -m benchmarks.startup_bench --runs 5
+#   python -m benchmarks.startup_bench --repo /path/to/other/checkout   # compare a baseline
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = (
+    "import sys, time, json\n"
+    "started = time.perf_counter()\n"
+    "import app.api.main\n"
+    "print(json.dumps({'seconds': time.perf_counter() - started, 'modules': len(sys.modules),"
+    " 'llama_index': any(name.startswith('llama_index') for name in sys.modules)}))\n"
+)
+
+
+def median(values: List[float]) -> float:
+    return sorted(values)[len(values) // 2]
+
+
+def measure_import(repo: str, runs: int) -> Dict:
+    """Imports the app in fresh interpreters from an empty working directory."""
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            output = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE],
+                cwd=workdir,
+                env={**os.environ, "PYTHONPATH": repo, "OPENAI_API_KEY": "sk-fake"},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            sample = json.loads(output.strip().splitlines()[-1])
+            sample["created"] = sorted(os.listdir(workdir))
+            samples.append(sample)
+    return {
+        "import_s": median([sample["seconds"] for sample in samples]),
+        "modules": samples[-1]["modules"],
+        "llama_index": samples[-1]["llama_index"],
+        "created": samples[-1]["created"],
+    }
+
+
+async def measure_boot(repo: str, port: int, fake_url: str, warm_up: bool, run: int) -> Dict:
+    """Boots one app process and times its first responses."""
+    data_dir = tempfile.mkdtemp()
+    env = {
+        "CIRCLEBACK_URL_TEMPLATE": f"{fake_url}/api/meeting/view/{{meeting_id}}/transcript",
+        "OPENAI_API_BASE": f"{fake_url}/v1",
+        "OPENAI_API_KEY": "sk-fake",
+        "PYTHONPATH": repo,
+        "WARM_UP_ON_STARTUP": str(warm_up).lower(),
+        "MEETING_DB_PATH": os.path.join(data_dir, "meetings.db"),
+        "JOB_DB_PATH": os.path.join(data_dir, "jobs.db"),
+    }
+    app_url = f"http://127.0.0.1:{port}"
+    result = {"first_response_s": None, "ready_s": None, "first_request_s": None}
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=repo,
+        env={**os.environ, **env},
+    )
+    try:
+        async with httpx.AsyncClient(timeout=None) as client:
+            while result["ready_s"] is None:
+                try:
+                    response = await client.get(f"{app_url}/ready")
+                except httpx.TransportError:
+                    await asyncio.sleep(0.01)
+                    continue
+                if result["first_response_s"] is None:
+                    result["first_response_s"] = time.perf_counter() - started
+                # Checkouts without /ready count as ready on their first response
+                if response.status_code in (200, 404):
+                    result["ready_s"] = time.perf_counter() - started
+                else:
+                    await asyncio.sleep(0.01)
+
+            link = f"https://app.circleback.ai/view/startup{int(time.time())}r{run}{int(warm_up)}"
+            request_started = time.perf_counter()
+            response = await client.post(f"{app_url}/process-transcript/", data={"link": link})
+            result["first_request_s"] = time.perf_counter() - request_started
+            result["first_request_status"] = response.status_code
+    finally:
+        process.terminate()
+        process.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return result
+
+
+async def main(args: argparse.Namespace) -> None:
+    repo = os.path.abspath(args.repo)
+    imports = measure_import(repo, args.runs)
+    print(f"import app.api.main: {imports['import_s'] * 1000:.0f} ms (median of {args.runs}), "
+          f"{imports['modules']} modules, llama_index loaded: {imports['llama_index']}, "
+          f"created in cwd: {imports['created'] or 'nothing'}")
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = start_server("benchmarks.fakes:app", args.fake_port, {"FAKE_LLM_LATENCY": "0", "FAKE_FETCH_LATENCY": "0"})
+    results = {"import": imports, "boots": {}}
+    try:
+        await wait_until_up(f"{fake_url}/docs")
+        print(f"{'warm-up':>8} {'first resp s':>12} {'ready s':>8} {'1st request s':>13}")
+        for warm_up in (False, True):
+            boots = [await measure_boot(repo, args.app_port, fake_url, warm_up, run) for run in range(args.runs)]
+            summary = {key: median([boot[key] for boot in boots]) for key in ("first_response_s", "ready_s", "first_request_s")}
+            results["boots"]["on" if warm_up else "off"] = summary
+            print(f"{'on' if warm_up else 'off':>8} {summary['first_response_s']:>12.2f} {summary['ready_s']:>8.2f} {summary['first_request_s']:>13.2f}")
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-response of the API process.")
+    parser.add_argument("--repo", default=REPO_ROOT, help="Checkout to measure (defaults to this one)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9000)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+# Built in modules
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+# -----------------------------------------------------------------------------
+# Meeting storage benchmark
+#
+# Writes N synthetic meetings as the old meetings/<id>/ JSON directories and into
+# the SQLite meeting store, then compares write time, "latest 100" listing, single
+# reads, disk usage and migrating the JSON tree into the store.
+#
+#   python -m benchmarks.store_bench --meetings 5000 --segments 200
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_meeting(index: int, segments: int) -> tuple:
+    transcript = [
+        {"person": f"Speaker {i % 3}", "said": f"Meeting {index} segment {i} covers audit evidence, vendor risk and the Q{i % 4 + 1} control review."}
+        for i in range(segments)
+    ]
+    bullets = [f"Meeting {index} team spends about {index % 30 + 5} hours a week reconciling vendor evidence manually."] * 4
+    output = {section: {"bullet_points": bullets} for section in ("business_strategies", "compliance_initiatives", "risk_and_critical_capabilities", "ExampleCompany")}
+    return f"m{index:07d}", transcript, output
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        # app.logger writes logs/ relative to the working directory
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_ROOT)
+        from app.utils import write_json_file
+        from app.store import MeetingStore, migrate_legacy_meetings
+
+        meetings = [synthetic_meeting(i, args.segments) for i in range(args.meetings)]
+        legacy_dir = os.path.join(workdir, "legacy")
+
+        def write_legacy():
+            for meeting_id, transcript, output in meetings:
+                write_json_file(os.path.join(legacy_dir, meeting_id), "transcript", transcript)
+                write_json_file(os.path.join(legacy_dir, meeting_id), "output", output)
+
+        def write_store_per_meeting():
+            store = MeetingStore(os.path.join(workdir, "per_meeting.db"))
+            for meeting_id, transcript, output in meetings:
+                store.save_transcript(meeting_id, transcript)
+                store.save_output(meeting_id, output)
+            return store
+
+        def write_store_bulk():
+            store = MeetingStore(os.path.join(workdir, "bulk.db"))
+            store.save_many((meeting_id, transcript, output, None) for meeting_id, transcript, output in meetings)
+            return store
+
+        def list_legacy():
+            with os.scandir(legacy_dir) as entries:
+                dirs = sorted(entries, key=lambda entry: entry.stat().st_mtime, reverse=True)[:100]
+            return [entry.name for entry in dirs]
+
+        def read_legacy(meeting_id):
+            with open(os.path.join(legacy_dir, meeting_id, "output.json"), encoding="utf-8") as f:
+                return json.load(f)
+
+        legacy_write, _ = timed(write_legacy)
+        per_meeting_write, store = timed(write_store_per_meeting)
+        bulk_write, _ = timed(write_store_bulk)
+        legacy_list, _ = timed(list_legacy)
+        store_list, _ = timed(store.list_meetings)
+        probe = meetings[len(meetings) // 2][0]
+        legacy_read, _ = timed(read_legacy, probe)
+        store_read, _ = timed(store.get_output, probe)
+        migrate, migrated = timed(migrate_legacy_meetings, MeetingStore(os.path.join(workdir, "migrated.db")), legacy_dir)
+
+        print(f"{args.meetings} meetings x {args.segments} segments")
+        print(f"{'operation':<28} {'json dirs':>12} {'store':>12}")
+        print(f"{'write (per meeting)':<28} {legacy_write:>11.2f}s {per_meeting_write:>11.2f}s")
+        print(f"{'write (bulk)':<28} {'-':>12} {bulk_write:>11.2f}s")
+        print(f"{'list latest 100':<28} {legacy_list * 1000:>10.1f}ms {store_list * 1000:>10.1f}ms")
+        print(f"{'read one output':<28} {legacy_read * 1000:>10.2f}ms {store_read * 1000:>10.2f}ms")
+        print(f"{'disk usage':<28} {directory_size(legacy_dir) / 1e6:>10.1f}MB {os.path.getsize(store.db_path) / 1e6:>10.1f}MB")
+        print(f"migrated {migrated} meetings in {migrate:.2f}s")
+        os.chdir(REPO_ROOT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-meeting JSON directories with the SQLite meeting store.")
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--segments", type=int, default=200)
+    main(parser.parse_args())
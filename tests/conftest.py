@@ -0,0 +1,27 @@
+# Built in modules
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+# -----------------------------------------------------------------------------
+# Test setup
+#
+# The app keeps its stores, lock files and logs under the working directory,
+# so the tests run from a scratch directory that is removed afterwards.
+#
+#   python -m pytest
+# -----------------------------------------------------------------------------
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+scratch_dir = tempfile.mkdtemp(prefix="app-tests-")
+atexit.register(shutil.rmtree, scratch_dir, ignore_errors=True)
+os.chdir(scratch_dir)
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("FEW_SHOT_EXAMPLES", "0")
@@ -0,0 +1,118 @@
+# Built in modules
+import asyncio
+
+# Testing
+import pytest
+
+# Pipeline under test
+from app import pipeline
+from app import store
+from app.ai import ai
+from app.store import MeetingStore
+from app.singleflight import SingleFlight, StripedFileLocks
+
+# -----------------------------------------------------------------------------
+# Request coalescing
+#
+# Fetch and LLM calls are stubbed with counters. Two SingleFlight groups sharing
+# one lock directory stand in for two worker processes.
+# -----------------------------------------------------------------------------
+
+
+LINK = "https://app.circleback.ai/view/meeting42"
+BULLETS = [
+    "The team manually reconciles vendor compliance evidence across four separate spreadsheet trackers today.",
+    "Two analysts spend roughly twenty hours each week preparing quarterly audit evidence packages.",
+]
+# Passes the deterministic rules, so validation makes no LLM call of its own
+OUTPUT = {section: {"bullet_points": BULLETS} for section in ai.SECTION_NAMES}
+SEGMENTS = [{"person": "Speaker 0", "said": "we reconcile vendor evidence by hand"}]
+
+
+class Upstream:
+    """Counts fetches and LLM calls, each held open long enough for concurrent callers to overlap."""
+
+    def __init__(self):
+        self.fetches = []
+        self.llm_calls = []
+
+    async def fetch_transcript(self, link: str):
+        self.fetches.append(link)
+        await asyncio.sleep(0.05)
+        # CircleBack's meeting ID need not match the ID in the link
+        return f"cb-{pipeline.extract_id(link)}", [dict(segment) for segment in SEGMENTS]
+
+    async def call_llm(self, messages, output_cls, use_cache=True, prompt=None):
+        self.llm_calls.append(use_cache)
+        await asyncio.sleep(0.05)
+        return OUTPUT
+
+
+def worker_flights(lock_dir: str) -> SingleFlight:
+    return SingleFlight(StripedFileLocks(lock_dir, 8, 0.01), wait_seconds=5)
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path) -> Upstream:
+    stub = Upstream()
+    meeting_store = MeetingStore(str(tmp_path / "meetings.db"))
+    monkeypatch.setattr(store, "meeting_store", meeting_store)
+    monkeypatch.setattr(pipeline, "meeting_store", meeting_store)
+    monkeypatch.setattr(pipeline, "meeting_flights", worker_flights(str(tmp_path / "locks")))
+    monkeypatch.setattr(pipeline, "fetch_transcript", stub.fetch_transcript)
+    monkeypatch.setattr(ai, "call_llm", stub.call_llm)
+    return stub
+
+
+def test_concurrent_requests_share_one_run(upstream):
+    async def submit():
+        return await asyncio.gather(*(pipeline.run_pipeline(LINK) for _ in range(10)))
+
+    results = asyncio.run(submit())
+
+    assert len(upstream.fetches) == 1
+    assert len(upstream.llm_calls) == 1
+    assert all(result == ("cb-meeting42", OUTPUT) for result in results)
+
+
+def test_refresh_does_not_join_a_cached_run(upstream):
+    async def submit():
+        cached = [pipeline.run_pipeline(LINK) for _ in range(5)]
+        refreshes = [pipeline.run_pipeline(LINK, use_cache=False) for _ in range(3)]
+        return await asyncio.gather(*cached, *refreshes)
+
+    asyncio.run(submit())
+
+    # One cached run and one forced regeneration, shared by the concurrent refreshes
+    assert len(upstream.fetches) == 2
+    assert sorted(upstream.llm_calls) == [False, True]
+
+
+def test_second_worker_reuses_the_stored_result(upstream, monkeypatch, tmp_path):
+    async def submit():
+        first = asyncio.create_task(pipeline.run_pipeline(LINK))
+        await asyncio.sleep(0.01)
+        # Same lock directory, separate in-process flights: a second worker process
+        monkeypatch.setattr(pipeline, "meeting_flights", worker_flights(str(tmp_path / "locks")))
+        second = await pipeline.run_pipeline(LINK)
+        return await first, second
+
+    first, second = asyncio.run(submit())
+
+    assert len(upstream.fetches) == 1
+    assert len(upstream.llm_calls) == 1
+    assert first == second == ("cb-meeting42", OUTPUT)
+
+
+def test_refresh_on_a_second_worker_regenerates(upstream, monkeypatch, tmp_path):
+    async def submit():
+        first = asyncio.create_task(pipeline.run_pipeline(LINK))
+        await asyncio.sleep(0.01)
+        monkeypatch.setattr(pipeline, "meeting_flights", worker_flights(str(tmp_path / "locks")))
+        await pipeline.run_pipeline(LINK, use_cache=False)
+        await first
+
+    asyncio.run(submit())
+
+    assert len(upstream.fetches) == 2
+    assert sorted(upstream.llm_calls) == [False, True]